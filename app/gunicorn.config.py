@@ -1,5 +1,7 @@
 import multiprocessing
 
+# 워커당 점수 계산 풀 크기는 SCORING_WORKERS (app/utils/executor.py)
+# /stats의 executor.queue_depth, wait_ms_avg가 계속 높으면 workers 또는 SCORING_WORKERS 조정
 workers = 3
 worker_class = "uvicorn.workers.UvicornWorker"
 wsgi_app = "app.main:app"
@@ -10,4 +12,10 @@ max_requests = 100
 max_requests_jitter = 100
 
 accesslog = "app/logs/access.log"
-errorlog = "app/logs/error.log"
\ No newline at end of file
+errorlog = "app/logs/error.log"
+
+def on_starting(server):
+    # 동 점수 스냅샷을 호스트당 한 번 공유 메모리(mmap 파일)로 게시, 워커는 fork 후 복사 없이 연결
+    from app.utils.scoring_loader import USE_SHARED_SNAPSHOT, prepare_shared_score_snapshot
+    if USE_SHARED_SNAPSHOT:
+        prepare_shared_score_snapshot()
@@ -1,6 +1,10 @@
 from app.logging_config import *
 from fastapi import FastAPI
 from app.routers.recommend import router as recommend_router
+from app.utils.scoring_loader import get_score_snapshot
+from app.utils.executor import shutdown_executor
+from app.services.property_store import USE_PROPERTY_STORE, get_property_store
+from app.db.session import async_session
 
 app = FastAPI(
     title="서울시 1인가구 부동산 추천 시스템 API",
@@ -35,3 +39,19 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 app.include_router(recommend_router)
+
+@app.on_event("startup")
+async def load_score_snapshot():
+    # 동 점수 테이블을 기동 시점에 한 번 적재 (이후 파일 변경 시에만 재적재)
+    get_score_snapshot()
+
+@app.on_event("startup")
+async def load_property_store():
+    # 매물 스토어 사용 시 첫 요청 전에 적재 (실패하면 SQL 집계로 동작)
+    if USE_PROPERTY_STORE:
+        async with async_session() as db:
+            await get_property_store(db)
+
+@app.on_event("shutdown")
+async def close_scoring_executor():
+    shutdown_executor()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from app.models.user_input import UserInput
 
@@ -16,8 +16,9 @@ class DongPropertiesInput(BaseModel):
     commute_score: float
     property_ids: List[int]
     user_input: UserInput
-    page: Optional[int] = 1
-    page_size: Optional[int] = 10
+    page: int = Field(1, ge=1)
+    page_size: int = Field(10, ge=1)
+    cursor: Optional[str] = None  # 이전 응답의 next_cursor (지정 시 page 대신 사용)
 
     class Config:
             json_schema_extra  = {
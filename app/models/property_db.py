@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, BigInteger, DateTime, Boolean, Numeric, Float
+from sqlalchemy import Column, Integer, SmallInteger, String, BigInteger, DateTime, Boolean, Numeric, Float
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 from geoalchemy2 import Geometry
 
 Base = declarative_base()
@@ -61,6 +62,10 @@ class Property(Base):
     main_image_url = Column(String)
     maintenance_cost = Column(BigInteger)
     rooms_bathrooms = Column(String(50))
+    # rooms_bathrooms / direction에서 정규화 (data/migrations/003), 003 적용 전 DB에서도 조회되도록 지연 로딩
+    room_count = deferred(Column(SmallInteger))
+    bathroom_count = deferred(Column(SmallInteger))
+    direction_mask = deferred(Column(SmallInteger, default=0))  # 동=1, 서=2, 남=4, 북=8
     duplex = Column(Boolean, default=False)
     available_move_in_date = Column(String)
     parking_spaces = Column(Integer)
@@ -72,4 +77,23 @@ class Property(Base):
     main_purpose = Column(String(100))
     etc_purpose = Column(String)
     structure_code = Column(String(100))
-    approval_date = Column(DateTime)
\ No newline at end of file
+    approval_date = Column(DateTime)
+
+class PropertyFacilitySummary(Base):
+    __tablename__ = "property_facility_summary"
+
+    property_id = Column(BigInteger, primary_key=True)
+    cctv_count = Column(Integer)
+    cctv_avg_distance = Column(Float)
+    infra_count = Column(Integer)
+    infra_avg_distance = Column(Float)
+    bus_count = Column(Integer)
+    bus_avg_distance = Column(Float)
+    subway_count = Column(Integer)
+    subway_avg_distance = Column(Float)
+    refreshed_at = Column(DateTime)
+    infra_score = Column(Float)
+    security_score = Column(Float)
+    transport_score = Column(Float)
+    quiet_score = Column(Float)
+    score_version = Column(String)
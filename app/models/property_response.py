@@ -49,6 +49,7 @@ class PropertyRecommendationResponse(BaseModel):
     page: int
     page_size: int
     results: List[PropertyResult]
+    next_cursor: Optional[str] = None
 
     class Config:
         json_schema_extra = {
@@ -98,6 +99,7 @@ class PropertyRecommendationResponse(BaseModel):
                         "youth_score": 0.35,
                         "commute_score": 0.9795
                     }
-                ]
+                ],
+                "next_cursor": None
             }
         }
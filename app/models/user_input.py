@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Literal
+from pydantic import BaseModel, Field, NonNegativeFloat, field_validator
+from typing import List, Literal, Optional
 
 PriorityType = Literal["infra", "security", "transport", "quiet", "youth", "commute"]
 TranscriptionType = Literal["전세", "월세"]
@@ -34,6 +34,17 @@ class UserInput(BaseModel):
     budget: Budget
     priority: List[PriorityType]  # e.g., ["infra", "security", "transport", "quiet", "youth", "commute"]
     max_commute_min: int = Field(30, description="최대 통근 시간(분), 기본값은 30분") # e.g., 30 (minutes)
+    hourly_weights: Optional[List[NonNegativeFloat]] = Field(
+        None, min_length=24, max_length=24,
+        description="0~23시 시간대별 가중치 (주로 집에 있는 시간대에 큰 값), 지정 시 조용함 지수를 이 가중치로 다시 계산"
+    )  # e.g., [1, 1, 1, 1, 1, 1, 1, 0, 0, ..., 0, 1, 1] (24개)
+
+    @field_validator("hourly_weights")
+    @classmethod
+    def check_hourly_weights(cls, value):
+        if value is not None and sum(value) <= 0:
+            raise ValueError("hourly_weights는 하나 이상의 시간대에 0보다 큰 가중치가 필요합니다")
+        return value
     
     class Config:
             json_schema_extra  = {
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import List
+import json
 from app.db.session import get_db
 from app.models.user_input import UserInput
 from app.models.dong_input import DongPropertiesInput
-from app.services.recommender import recommend_properties, recommend_dongs
+from app.services.recommender import recommend_properties, recommend_dongs, recommend_dongs_batch, InvalidCursor
+from app.services.recommend_cache import cache_stats
+from app.services.property_store import property_store_stats
+from app.utils.executor import ExecutorBusy, DeadlineExceeded, executor_stats
 from app.models.property_db import Property
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -60,6 +66,11 @@ router = APIRouter(tags=["추천 API"])
         - (옵션) max_commute_min : 허용 가능한 최대 통근 시간 (분 단위). 
            지정되지 않을시, 기본값 30분 내의 범위에서 추천
 
+        - (옵션) hourly_weights : 0~23시 시간대별 가중치 24개 (주로 집에 있는 시간대에 큰 값)
+            지정 시, 해당 시간대의 생활인구로 quiet_score(조용함 지수)를 다시 계산
+            지정되지 않을시, 기본 조용함 지수 사용
+            예) 야간 근무자 [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0]
+
 
     ▷ 결과 데이터
     - gu : 구 이름
@@ -70,7 +81,7 @@ router = APIRouter(tags=["추천 API"])
     - commute_min : 평균 통근 시간
     - infra_score, security_score, quiet_score, youth_score, transport_score, commute_score : 지표별 점수
     - dong_list : 추천된 동(dong) 리스트
-        - property_ids : 해당 동(dong) 내 조건 충족 매물 ID 리스트
+        - property_ids : 해당 동(dong) 내 조건 충족 매물 ID 리스트 (최신 매물 순 최대 PROPERTY_IDS_PER_DONG_LIMIT개, 기본 1000)
     
     ▷ 지표 산정 방식
     - infra_score : 음식점 수를 행정동 면적으로 나눈 밀도(개/㎢) 지표 
@@ -128,7 +139,41 @@ router = APIRouter(tags=["추천 API"])
     """
 )
 async def recommend_area(user_input: UserInput, db: AsyncSession = Depends(get_db)):
-    return await recommend_dongs(user_input, db)
+    try:
+        return await recommend_dongs(user_input, db)
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
+
+@router.post(
+    "/recommend/area/batch",
+    summary="행정동 추천 (일괄)",
+    description="""
+    여러 사용자의 행정동 추천을 한 번에 계산 (배치 / 캠페인용)
+
+    ▷ 입력 데이터
+    - /recommend/area 입력(UserInput)의 리스트
+
+    ▷ 결과 데이터 (NDJSON, 한 줄에 사용자 한 명, 입력 순서)
+    - {"index": 0, "result": {"recommended_area": [...]}}  ← /recommend/area 응답과 동일
+    - {"index": 1, "error": "..."}  ← 해당 사용자만 실패한 경우
+
+    ▷ 처리 방식
+    - 사용자 × 동 통근 시간 / 종합 점수 행렬을 묶음 단위로 한 번에 계산
+    - 매물 수 집계 쿼리는 서로 다른 budget 조건마다 한 번만 실행
+    """
+)
+async def recommend_area_batch(user_inputs: List[UserInput], db: AsyncSession = Depends(get_db)):
+    # DB 집계는 응답 전에 끝내고, 스트리밍 중에는 점수 계산만 수행
+    results = await recommend_dongs_batch(user_inputs, db)
+
+    async def ndjson_lines():
+        async for item in results:
+            yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 @router.post(
@@ -149,12 +194,15 @@ async def recommend_area(user_input: UserInput, db: AsyncSession = Depends(get_d
     - 예: 총 매물이 43개이고, page_size가 10이면 → total_pages = 5 (1~5페이지 가능)
     - 이때, 전체 매물을 확인하려면 page=1부터 5까지, page_size=10으로 연속 요청하면 됩니다. 
     - 이렇게 클라이언트는 필요 시 페이지를 이동하면서 추가 매물 요청이 가능
+    - 다음 페이지는 응답의 `next_cursor`를 `cursor`로 전달해서 요청할 수도 있습니다. (마지막 페이지면 null)
+    - 같은 조건의 순위는 서버에 일정 시간 캐시되어, 이후 페이지 요청은 다시 계산하지 않습니다.
     
     ▷ 입력 데이터
     - dong, dong_code: 행정동 이름 및 코드
     - property_ids: 해당 동 내 조건 만족 매물 ID 리스트
     - user_input: 이전 사용자 설정값 (age, gender, budget, commute 등)
-    - page, page_size: 페이징 설정
+    - page, page_size: 페이징 설정 (1 이상)
+    - (옵션) cursor: 이전 응답의 next_cursor
 
     ▷ 점수 계산 방식
     - total_score = Σ (우선순위 점수 × 개인화 보정 × 우선순위 가중치) + 매물별 옵션 점수 보정
@@ -245,9 +293,20 @@ async def recommend_area(user_input: UserInput, db: AsyncSession = Depends(get_d
     """
 )
 async def recommend_property(input_data: DongPropertiesInput, db: AsyncSession = Depends(get_db)):
-    result = await recommend_properties(input_data, db)
+    try:
+        result = await recommend_properties(input_data, db)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     return {"result": result}
 
+@router.get("/stats", summary="캐시 / 실행 풀 통계", description="워커별 추천 캐시 적중률, 메모리 사용량, 점수 계산 풀 대기열 / 대기 시간, 매물 스토어 크기")
+async def stats():
+    return {**cache_stats(), "executor": executor_stats(), "property_store": property_store_stats()}
+
 @router.get("/health", summary="Health Check", description="API 상태 확인, 정상 결과 : 200 OK")
 async def health_check():
     return {"status": "ok"}
@@ -0,0 +1,142 @@
+import os
+
+from sqlalchemy import BigInteger, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.property_db import (
+    Property, PropertyCCTVMap, PropertyRestFoodPermitMap, PropertyBusStopMap, PropertySubwayMap,
+    PropertyFacilitySummary
+)
+
+# 시설 유형별 매핑 테이블 (결과 컬럼 접두어 → 모델)
+FACILITY_MAP_MODELS = {
+    "cctv": PropertyCCTVMap,
+    "infra": PropertyRestFoodPermitMap,
+    "bus": PropertyBusStopMap,
+    "subway": PropertySubwayMap,
+}
+
+# 이 개수를 넘는 ID 목록은 서버 측 커서로 나눠 받음
+STREAM_THRESHOLD = 2000
+STREAM_BATCH_SIZE = 500
+
+# property_facility_summary 사용 여부 (data/migrations/001, 002 적용 후 true로 설정)
+USE_FACILITY_SUMMARY = os.getenv("USE_FACILITY_SUMMARY", "false").lower() == "true"
+
+
+def property_ids_param(property_ids: list):
+    # ID 목록을 IN (...) 대신 배열 파라미터 하나로 바인딩
+    return bindparam("property_ids", value=list(property_ids), type_=ARRAY(BigInteger))
+
+def scoring_columns():
+    # 점수 계산에 필요한 매물 컬럼만 (좌표는 WKT 대신 float)
+    return [
+        Property.id,
+        Property.administrative_code,
+        Property.monthly_rent_cost,
+        func.ST_X(Property.location).label("lon"),
+        func.ST_Y(Property.location).label("lat"),
+    ]
+
+def build_property_facility_query(property_ids: list):
+    # 점수용 매물 컬럼 + 시설 유형별 count / avg(distance_meters)를 한 문장으로 조회
+    ids = property_ids_param(property_ids)
+
+    columns = scoring_columns()
+    aggregates = []
+    for name, model in FACILITY_MAP_MODELS.items():
+        agg = (
+            select(
+                model.property_id,
+                func.count().label("count"),
+                func.avg(model.distance_meters).label("avg_distance")
+            )
+            .where(model.property_id == any_(ids))
+            .group_by(model.property_id)
+            .cte(f"{name}_agg")
+        )
+        aggregates.append(agg)
+        columns.append(agg.c.count.label(f"{name}_count"))
+        columns.append(agg.c.avg_distance.label(f"{name}_avg_distance"))
+
+    from_clause = Property.__table__
+    for agg in aggregates:
+        from_clause = from_clause.outerjoin(agg, agg.c.property_id == Property.id)
+
+    return select(*columns).select_from(from_clause).where(Property.id == any_(ids))
+
+def build_property_summary_query(property_ids: list):
+    # 점수용 매물 컬럼 + 요약 테이블의 시설 집계 (매물당 한 행)
+    ids = property_ids_param(property_ids)
+    summary = PropertyFacilitySummary
+    columns = scoring_columns() + [summary.property_id.label("summary_id")]
+    for name in FACILITY_MAP_MODELS:
+        columns.append(getattr(summary, f"{name}_count"))
+        columns.append(getattr(summary, f"{name}_avg_distance"))
+
+    # 미리 계산된 정적 점수 (score_version이 맞을 때만 사용)
+    for name in ("infra", "security", "transport", "quiet"):
+        columns.append(getattr(summary, f"{name}_score").label(f"static_{name}_score"))
+    columns.append(summary.score_version)
+
+    return (
+        select(*columns)
+        .outerjoin(summary, summary.property_id == Property.id)
+        .where(Property.id == any_(ids))
+    )
+
+def build_query(property_ids: list):
+    if USE_FACILITY_SUMMARY:
+        return build_property_summary_query(property_ids)
+    return build_property_facility_query(property_ids)
+
+async def fill_missing_summaries(db: AsyncSession, rows: list):
+    # 요약 테이블에 아직 없는 매물은 매핑 테이블에서 직접 집계
+    if not USE_FACILITY_SUMMARY:
+        return rows
+    missing = [row.id for row in rows if row.summary_id is None]
+    if not missing:
+        return rows
+    result = await db.execute(build_property_facility_query(missing))
+    filled = {row.id: row for row in result.all()}
+    return [filled.get(row.id, row) if row.summary_id is None else row for row in rows]
+
+async def fetch_properties_with_facilities(db: AsyncSession, property_ids: list):
+    if not property_ids:
+        return []
+    result = await db.execute(build_query(property_ids))
+    return await fill_missing_summaries(db, result.all())
+
+async def stream_properties_with_facilities(db: AsyncSession, property_ids: list, batch_size: int = STREAM_BATCH_SIZE):
+    # 대량 ID 목록용: 같은 문장을 서버 측 커서로 실행해 batch_size 행씩 전달
+    if not property_ids:
+        return
+    stmt = build_query(property_ids).execution_options(yield_per=batch_size)
+    result = await db.stream(stmt)
+    async for partition in result.partitions(batch_size):
+        yield partition
+
+async def iter_properties_with_facilities(db: AsyncSession, property_ids: list):
+    # ID 개수에 따라 단일 조회 / 스트리밍 조회 중 선택해 행 묶음 단위로 전달
+    if len(property_ids) > STREAM_THRESHOLD:
+        pending = []
+        async for partition in stream_properties_with_facilities(db, property_ids):
+            complete = [row for row in partition if not USE_FACILITY_SUMMARY or row.summary_id is not None]
+            pending.extend(row for row in partition if USE_FACILITY_SUMMARY and row.summary_id is None)
+            if complete:
+                yield complete
+        # 커서를 다 읽은 뒤 요약이 없던 매물만 따로 집계
+        if pending:
+            yield await fill_missing_summaries(db, pending)
+    else:
+        rows = await fetch_properties_with_facilities(db, property_ids)
+        if rows:
+            yield rows
+
+async def fetch_properties_by_ids(db: AsyncSession, property_ids: list):
+    # 페이지에 포함된 매물만 전체 컬럼 조회 → {id: Property}
+    if not property_ids:
+        return {}
+    result = await db.execute(select(Property).where(Property.id == any_(property_ids_param(property_ids))))
+    return {prop.id: prop for prop in result.scalars().all()}
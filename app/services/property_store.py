@@ -0,0 +1,335 @@
+import asyncio
+import os
+import re
+import time
+
+import numpy as np
+from sqlalchemy import func, or_, select
+
+from app.models.property_db import Property
+from app.models.user_input import Budget
+from app.services.recommend_cache import property_table_version
+from app.utils.listing_attributes import USE_NORMALIZED_ATTRIBUTES, DIRECTION_BITS, direction_mask, room_count
+from app.utils.bitmap_index import BitmapIndex, pack_mask, popcount, positions
+
+# /recommend/area 매물 집계를 워커 메모리의 컬럼 배열로 처리할지 여부 (false면 항상 SQL)
+USE_PROPERTY_STORE = os.getenv("USE_PROPERTY_STORE", "false").lower() == "true"
+
+# 증분 갱신으로 놓칠 수 있는 변경(updated_at 없이 수정된 행)을 위해 전체 재적재하는 주기 (초)
+PROPERTY_STORE_FULL_RELOAD_SEC = float(os.getenv("PROPERTY_STORE_FULL_RELOAD_SEC", "3600"))
+
+# rooms_bathrooms 분류 (build_property_filters와 같은 의미)
+ROOM_NULL = -1     # NULL
+ROOM_OTHER = 0     # 방 개수를 알 수 없는 값 ('-/1개' 등)
+ROOM_ONE = 1       # room_count = 1 (정규화 전: '^1/')
+ROOM_TWO = 2       # room_count = 2 (정규화 전: '^2/')
+ROOM_THREE_UP = 3  # room_count 3~9 (정규화 전: '^[3-9]/', 10개 이상은 ROOM_OTHER)
+
+# 살아 있는 행 비트맵 키
+LIVE = ("live",)
+
+# 범주형 컬럼 (값 → int16 코드, NULL은 -1)
+CATEGORY_COLUMNS = ["administrative_code", "transaction_type", "property_type", "room_type"]
+
+# 범위 조건 컬럼 (NULL은 별도 valid 배열, BETWEEN / <= 비교에서 제외)
+INT_COLUMNS = ["deposit", "monthly_rent_cost", "maintenance_cost"]
+
+def room_class(rooms_bathrooms):
+    if rooms_bathrooms is None:
+        return ROOM_NULL
+    if USE_NORMALIZED_ATTRIBUTES:
+        count = room_count(rooms_bathrooms)
+        if count is None:
+            return ROOM_OTHER
+        if count in (ROOM_ONE, ROOM_TWO):
+            return count
+        return ROOM_THREE_UP if 3 <= count <= 9 else ROOM_OTHER
+    if rooms_bathrooms.startswith("1/"):
+        return ROOM_ONE
+    if rooms_bathrooms.startswith("2/"):
+        return ROOM_TWO
+    if re.match(r"[3-9]/", rooms_bathrooms):
+        return ROOM_THREE_UP
+    return ROOM_OTHER
+
+def store_columns():
+    return [
+        Property.id,
+        Property.administrative_code,
+        Property.transaction_type,
+        Property.property_type,
+        Property.room_type,
+        Property.deposit,
+        Property.monthly_rent_cost,
+        Property.maintenance_cost,
+        Property.area,
+        Property.direction,
+        Property.rooms_bathrooms,
+        Property.updated_at,
+    ]
+
+def range_mask(values, valid, bounds):
+    # build_property_filters의 범위 조건: [최소, 최대] → BETWEEN, [최대] → <=, 그 외 길이는 조건 없음
+    if len(bounds) == 2:
+        return valid & (values >= bounds[0]) & (values <= bounds[1])
+    if len(bounds) == 1:
+        return valid & (values <= bounds[0])
+    return None
+
+
+class PropertyStore:
+    # property 테이블의 필터용 컬럼만 담은 struct-of-arrays + 범주형 값별 비트맵 인덱스
+    # 행은 추가 순서대로 슬롯에 저장 (수정은 같은 슬롯 덮어쓰기, 삭제는 live 비트만 제거)
+    def __init__(self, columns: dict, categories: dict, version, watermark):
+        self.columns = columns
+        self.categories = categories  # 컬럼 → 값 목록 (코드 = 목록 내 위치)
+        self.lookups = {col: {value: code for code, value in enumerate(values)} for col, values in categories.items()}
+        self.version = version
+        self.watermark = watermark  # 적재한 행 중 가장 늦은 updated_at
+        self.loaded_at = time.monotonic()  # 마지막 전체 적재 시각
+        self.slots = {int(pid): slot for slot, pid in enumerate(columns["id"])}
+        self.max_id = int(columns["id"].max()) if len(columns["id"]) else 0
+        self.index = BitmapIndex(len(columns["id"]))
+        self.index_rows(np.arange(len(columns["id"])))
+
+    def is_current(self, version):
+        return self.version == version and time.monotonic() - self.loaded_at < PROPERTY_STORE_FULL_RELOAD_SEC
+
+    def __len__(self):
+        return len(self.slots)
+
+    def index_rows(self, rows):
+        # 슬롯들을 값별 비트맵에 추가 (범주형 코드, 방향 비트, 방 개수 분류, live)
+        c = self.columns
+        for col in CATEGORY_COLUMNS + ["room_class"]:
+            values = c[col][rows]
+            for code in np.unique(values).tolist():
+                self.index.add((col, code), rows[values == code])
+        for bit in DIRECTION_BITS.values():
+            self.index.add(("direction", bit), rows[(c["direction_mask"][rows] & bit) != 0])
+        self.index.add(LIVE, rows)
+
+    def upsert(self, delta: dict, categories: dict):
+        # delta 컬럼 배열(build_store_arrays 결과) 반영: 기존 id는 같은 슬롯 갱신, 새 id는 뒤에 추가
+        self.categories = categories
+        self.lookups = {col: {value: code for code, value in enumerate(values)} for col, values in categories.items()}
+        slots = np.array([self.slots.get(int(pid), -1) for pid in delta["id"]], dtype=np.int64)
+        exists = slots >= 0
+        if exists.any():
+            self.index.discard(slots[exists])
+            for col, values in self.columns.items():
+                values[slots[exists]] = delta[col][exists]
+
+        n = len(self.columns["id"])
+        added = int((~exists).sum())
+        if added:
+            self.columns = {
+                col: np.concatenate([values, delta[col][~exists]]) for col, values in self.columns.items()
+            }
+            slots[~exists] = np.arange(n, n + added)
+            for slot, pid in zip(slots[~exists].tolist(), delta["id"][~exists].tolist()):
+                self.slots[pid] = slot
+            self.max_id = max(self.max_id, int(delta["id"].max()))
+        self.index.resize(n + added)
+        self.index_rows(slots)
+
+    def delete(self, ids):
+        rows = np.array([self.slots.pop(int(pid)) for pid in ids if int(pid) in self.slots], dtype=np.int64)
+        self.index.discard(rows)
+
+    def codes_of(self, column, values):
+        lookup = self.lookups[column]
+        return [lookup[v] for v in values if v in lookup]
+
+    def category_bitmap(self, column, values):
+        return self.index.union((column, code) for code in self.codes_of(column, values))
+
+    def budget_bitmap(self, budget: Budget):
+        # build_property_filters와 같은 조건: 같은 항목 안의 값은 OR, 항목끼리는 AND (조건 없으면 live 전체)
+        c = self.columns
+        n_words = self.index.n_words
+        result = self.index.get(LIVE).copy()
+
+        if budget.transaction_type:
+            result &= self.category_bitmap("transaction_type", budget.transaction_type)
+        if budget.property_type:
+            result &= self.category_bitmap("property_type", budget.property_type)
+
+        # 범위 조건은 컬럼 배열로 비교한 뒤 비트맵으로 변환
+        for column, bounds in (
+            ("deposit", budget.deposit),
+            ("monthly_rent_cost", budget.monthly_rent),
+            ("maintenance_cost", budget.maintenance_cost),
+        ):
+            if bounds:
+                condition = range_mask(c[column], c[f"{column}_valid"], bounds)
+                if condition is not None:
+                    result &= pack_mask(condition, n_words)
+        if budget.area:
+            # area는 NaN이면 비교 결과가 False라 NULL 제외와 같음
+            condition = range_mask(c["area"], True, budget.area)
+            if condition is not None:
+                result &= pack_mask(condition, n_words)
+
+        if budget.direction:
+            result &= self.index.union(("direction", DIRECTION_BITS[d]) for d in budget.direction)
+
+        if budget.room_type:
+            classes = set()
+            for rt in budget.room_type:
+                if rt == "원룸":
+                    classes.add(ROOM_ONE)
+                elif rt == "투룸":
+                    classes.add(ROOM_TWO)
+                else:  # 그 외 모든 방 개수 (3 이상 혹은 NULL)
+                    classes.update((ROOM_THREE_UP, ROOM_NULL))
+            result &= self.index.union(("room_class", cls) for cls in classes)
+
+        # 층 구조 유형 (DB의 room_type 컬럼)
+        if budget.floor_type:
+            result &= self.category_bitmap("room_type", budget.floor_type)
+
+        return result
+
+    def dong_property_counts(self, budget: Budget, dong_codes: list, with_ids=True, id_limit=None):
+        # fetch_dong_property_counts와 같은 결과 (동별 매물 수, 동별 매물 ID 내림차순 최대 id_limit개)
+        # 동 비트맵과 조건 비트맵의 교집합 popcount
+        matched = self.budget_bitmap(budget)
+        codes = {}
+        count_map = {}
+        for dong_code in set(dong_codes):
+            code = self.lookups["administrative_code"].get(dong_code)
+            if code is None:
+                continue
+            count = popcount(matched & self.index.get(("administrative_code", code)))
+            if count:
+                codes[code] = dong_code
+                count_map[dong_code] = count
+
+        property_map_by_dong = {}
+        if with_ids and codes:
+            # ID 목록은 조건 비트맵을 한 번만 풀어 동 코드 → id 내림차순으로 정렬
+            rows = positions(matched, self.index.n_rows)
+            dong = self.columns["administrative_code"][rows]
+            keep = np.isin(dong, list(codes))
+            rows, dong = rows[keep], dong[keep]
+            ids = self.columns["id"][rows]
+            order = np.lexsort((-ids, dong))
+            ids, dong = ids[order], dong[order]
+            values, starts, counts = np.unique(dong, return_index=True, return_counts=True)
+            for code, start, count in zip(values.tolist(), starts.tolist(), counts.tolist()):
+                end = start + min(count, id_limit) if id_limit else start + count
+                property_map_by_dong[codes[code]] = ids[start:end].tolist()
+        return count_map, property_map_by_dong
+
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values())
+
+
+def build_store_arrays(rows, categories: dict):
+    # DB 행 → 컬럼 배열 (categories는 새 값이 나오면 뒤에 추가됨)
+    lookups = {col: {value: code for code, value in enumerate(values)} for col, values in categories.items()}
+
+    def encode(col, value):
+        if value is None:
+            return -1
+        lookup = lookups[col]
+        if value not in lookup:
+            lookup[value] = len(categories[col])
+            categories[col].append(value)
+        return lookup[value]
+
+    n = len(rows)
+    columns = {"id": np.fromiter((row.id for row in rows), dtype=np.int64, count=n)}
+    for col in CATEGORY_COLUMNS:
+        columns[col] = np.fromiter((encode(col, getattr(row, col)) for row in rows), dtype=np.int16, count=n)
+    for col in INT_COLUMNS:
+        values = [getattr(row, col) for row in rows]
+        columns[col] = np.fromiter((v if v is not None else 0 for v in values), dtype=np.int64, count=n)
+        columns[f"{col}_valid"] = np.fromiter((v is not None for v in values), dtype=bool, count=n)
+    columns["area"] = np.fromiter(
+        (float(row.area) if row.area is not None else np.nan for row in rows), dtype=np.float32, count=n
+    )
+    columns["direction_mask"] = np.fromiter((direction_mask(row.direction) for row in rows), dtype=np.uint8, count=n)
+    columns["room_class"] = np.fromiter((room_class(row.rooms_bathrooms) for row in rows), dtype=np.int8, count=n)
+    return columns
+
+def max_updated_at(rows, current=None):
+    stamps = [row.updated_at for row in rows if row.updated_at is not None]
+    if current is not None:
+        stamps.append(current)
+    return max(stamps) if stamps else None
+
+async def load_property_store(db, version):
+    result = await db.execute(select(*store_columns()).order_by(Property.id))
+    rows = result.all()
+    categories = {col: [] for col in CATEGORY_COLUMNS}
+    return PropertyStore(build_store_arrays(rows, categories), categories, version, max_updated_at(rows))
+
+async def refresh_property_store(db, store: PropertyStore, version):
+    # 마지막 적재 이후 추가(id 증가) / 수정(updated_at 증가)된 행만 다시 읽어 슬롯과 비트맵 갱신
+    # 행 수가 맞지 않으면 삭제된 id를 찾아 제거, 그래도 다르면 전체 재적재
+    condition = Property.id > store.max_id
+    if store.watermark is not None:
+        condition = or_(condition, Property.updated_at > store.watermark)
+    result = await db.execute(select(*store_columns()).where(condition).order_by(Property.id))
+    rows = result.all()
+    if rows:
+        categories = {col: list(values) for col, values in store.categories.items()}
+        store.upsert(build_store_arrays(rows, categories), categories)
+        store.watermark = max_updated_at(rows, store.watermark)
+
+    total = (await db.execute(select(func.count()).select_from(Property))).scalar()
+    if total != len(store):
+        current = set((await db.execute(select(Property.id))).scalars().all())
+        store.delete([pid for pid in store.slots if pid not in current])
+        if total != len(store):
+            return await load_property_store(db, version)
+    store.version = version
+    return store
+
+_store = None
+_store_lock = asyncio.Lock()
+
+async def get_property_store(db):
+    # property 테이블 버전이 바뀌었으면 갱신 후 반환, 사용할 수 없으면 None (SQL로 대체)
+    global _store
+    if not USE_PROPERTY_STORE:
+        return None
+    version = await property_table_version(db)
+    if version is None:
+        return None
+
+    store = _store
+    if store is not None and store.is_current(version):
+        return store
+
+    async with _store_lock:
+        store = _store
+        if store is not None and store.is_current(version):
+            return store
+        try:
+            if store is None or time.monotonic() - store.loaded_at >= PROPERTY_STORE_FULL_RELOAD_SEC:
+                store = await load_property_store(db, version)
+            else:
+                store = await refresh_property_store(db, store, version)
+        except Exception as e:
+            print(f"[매물 스토어 갱신 실패] {e}")
+            await db.rollback()
+            return None
+        _store = store
+        return store
+
+def property_store_stats():
+    store = _store
+    if store is None:
+        return {"enabled": USE_PROPERTY_STORE, "rows": 0}
+    return {
+        "enabled": USE_PROPERTY_STORE,
+        "rows": len(store),
+        "bytes": store.nbytes(),
+        "slots": len(store.columns["id"]),
+        "bitmap_index": store.index.stats(),
+        "version": store.version,
+        "age_sec": round(time.monotonic() - store.loaded_at, 1),
+    }
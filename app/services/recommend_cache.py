@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import time
+
+from sqlalchemy import text
+
+from app.models.dong_input import DongPropertiesInput
+from app.models.user_input import UserInput
+from app.utils.cache import TTLCache
+
+# /recommend/property 순위 캐시 (워커별, 0이면 사용 안 함)
+property_rank_cache = TTLCache(
+    maxsize=int(os.getenv("PROPERTY_RANK_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("PROPERTY_RANK_CACHE_TTL", "300")),
+    max_bytes=int(os.getenv("PROPERTY_RANK_CACHE_MAX_MB", "64")) * 1024 * 1024,
+)
+
+def area_result_sizeof(result):
+    # 응답 dict 크기 근사치 (JSON 직렬화 길이)
+    return len(json.dumps(result, ensure_ascii=False, default=str))
+
+# /recommend/area 응답 캐시 (워커별, 0이면 사용 안 함)
+area_cache = TTLCache(
+    maxsize=int(os.getenv("AREA_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("AREA_CACHE_TTL", "600")),
+    max_bytes=int(os.getenv("AREA_CACHE_MAX_MB", "64")) * 1024 * 1024,
+    sizeof=area_result_sizeof,
+)
+
+# 직장 좌표 양자화 자릿수 (4자리 ≈ 10m, 이 안의 요청은 같은 결과 공유)
+AREA_CACHE_LOCATION_DECIMALS = int(os.getenv("AREA_CACHE_LOCATION_DECIMALS", "4"))
+
+# property 테이블 변경 확인 주기 (초)
+PROPERTY_VERSION_CHECK_INTERVAL = float(os.getenv("PROPERTY_VERSION_CHECK_INTERVAL", "10"))
+
+# 순서와 무관한 예산 조건 (범위 조건은 [최소, 최대] 순서가 의미 있으므로 그대로)
+UNORDERED_BUDGET_FIELDS = ["transaction_type", "property_type", "room_type", "floor_type", "direction"]
+
+def digest(payload: dict):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+def property_rank_cache_key(input_data: DongPropertiesInput, property_version):
+    # 순위에 영향을 주는 입력만 정규화 (ID 순서, 예산, 페이지, cursor 무관)
+    # property 테이블이 바뀌면 (매물 가격 / 위치 변경 등) 키가 달라짐
+    user_input = input_data.user_input
+    return digest({
+        "property_version": property_version,
+        "property_ids": sorted(input_data.property_ids),
+        "dong_code": input_data.dong_code,
+        "dong_scores": [
+            input_data.infra_score, input_data.security_score, input_data.quiet_score,
+            input_data.youth_score, input_data.transport_score,
+        ],
+        "age": user_input.age,
+        "gender": user_input.gender.lower(),
+        "job_location": list(user_input.job_location),
+        "transportation": user_input.transportation[0] if user_input.transportation else "public",
+        "priority": list(user_input.priority),
+        "hourly_weights": user_input.hourly_weights,
+    })
+
+def canonical_user_input(user_input: UserInput, transport_mode: str):
+    # priority는 기본값 적용 후, transport_mode는 recommend_dongs가 실제로 쓰는 값
+    budget = user_input.budget.model_dump(mode="json")
+    for field in UNORDERED_BUDGET_FIELDS:
+        budget[field] = sorted(set(budget[field]))
+    return {
+        "age": user_input.age,
+        "gender": user_input.gender.lower(),
+        "job_location": [round(float(v), AREA_CACHE_LOCATION_DECIMALS) for v in user_input.job_location],
+        "transport_mode": transport_mode,
+        "budget": budget,
+        "priority": list(user_input.priority),
+        "max_commute_min": user_input.max_commute_min,
+        "hourly_weights": user_input.hourly_weights,
+    }
+
+def area_cache_key(user_input: UserInput, transport_mode: str, score_version: str, property_version):
+    # 동 점수 스냅샷 / property 테이블이 바뀌면 키가 달라져 이전 항목은 더 이상 조회되지 않음
+    return digest({
+        "input": canonical_user_input(user_input, transport_mode),
+        "score_version": score_version,
+        "property_version": property_version,
+    })
+
+
+# (버전, 확인 시각)
+_property_version = (None, float("-inf"))
+_version_warned = False
+
+async def property_table_version(db):
+    # 트리거가 유지하는 property_version 행(data/migrations/007_property_version.sql)을 버전으로 사용
+    # None이면 변경을 감지할 수 없으므로 호출하는 쪽은 캐시를 사용하지 않음
+    global _property_version, _version_warned
+    version, checked_at = _property_version
+    now = time.monotonic()
+    if now - checked_at < PROPERTY_VERSION_CHECK_INTERVAL:
+        return version
+    try:
+        result = await db.execute(text("""
+            SELECT version FROM property_version
+        """))
+        version = result.scalar()
+    except Exception as e:
+        # 버전 테이블 조회 실패(007 미적용 등) 시 캐시를 건너뜀 (실패한 트랜잭션은 정리, 경고는 워커당 한 번)
+        if not _version_warned:
+            print(f"[property 버전 조회 실패] 추천 캐시를 사용하지 않음: {e}")
+            _version_warned = True
+        await db.rollback()
+        version = None
+    _property_version = (version, now)
+    return version
+
+def cache_stats():
+    return {
+        "pid": os.getpid(),
+        "property_rank_cache": property_rank_cache.stats(),
+        "area_cache": area_cache.stats(),
+    }
@@ -1,20 +1,36 @@
 from app.models.user_input import UserInput, Budget
 from app.models.dong_input import DongPropertiesInput
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from app.models.property_db import Property
-from sqlalchemy import func
-from app.models.property_db import PropertyCCTVMap, PropertyRestFoodPermitMap, PropertyBusStopMap, PropertySubwayMap
-from app.utils.scoring_loader import load_score_data
+from app.services.property_query import iter_properties_with_facilities, fetch_properties_by_ids
+from app.services.property_store import get_property_store
+from app.utils.scoring_loader import get_score_snapshot
+from app.utils.quiet_profile import get_quiet_profile
+from app.utils.listing_attributes import USE_NORMALIZED_ATTRIBUTES, direction_bits
+from app.utils.commute import batch_commute_min
+from app.utils.executor import run_cpu, request_deadline, ExecutorBusy
+from app.services.recommend_cache import (
+    property_rank_cache, property_rank_cache_key, area_cache, area_cache_key, property_table_version
+)
+from app.services.scoring_engine import (
+    PROPERTY_SCORE_VERSION, static_property_score_columns, decay_scores, round_like_python,
+    weighted_total_scores, top_k_page
+)
 from decimal import Decimal
-from geopy.distance import geodesic
 from sqlalchemy import select, func, and_, or_
-from sklearn.preprocessing import MinMaxScaler
+from sqlalchemy.dialects.postgresql import array_agg, aggregate_order_by
 from collections import defaultdict
-import math
+import numpy as np
 import asyncio
+import base64
+import json
+import logging
+import os
 
-MAX_CHUNK = 100
+logger = logging.getLogger(__name__)
+
+# /recommend/area 응답에서 동별 property_ids 최대 개수 (최신 매물 순, 0이면 제한 없음)
+PROPERTY_IDS_PER_DONG_LIMIT = int(os.getenv("PROPERTY_IDS_PER_DONG_LIMIT", "1000")) or None
 
 TRANSPORT_PROFILE = {
         "car": {"speed_kmh": 25, "correction_factor": 2.5},
@@ -24,138 +40,72 @@ TRANSPORT_PROFILE = {
 def float_or_none(val):
     return float(val) if isinstance(val, Decimal) else None
 
-def chunk_list(lst, chunk_size):
-    for i in range(0, len(lst), chunk_size):
-        yield lst[i:i + chunk_size]
-
-from math import exp
+def commute_min_column(lats, lons, job_location: list, transport_profile: dict):
+    # 소수 2자리 통근 시간 배열, 계산 불가 시 NaN
+    try:
+        commute_min = batch_commute_min(lats, lons, job_location, transport_profile)
+    except Exception:
+        return np.full(len(lats), np.nan)
+    return round_like_python(commute_min, 2)
+
+def snapshot_dong_scores(scores, dong_code):
+    # /recommend/area 응답과 같은 자릿수로 반올림한 동 점수
+    row = scores.row_of(dong_code)
+    if row is None:
+        return None
+    return {
+        col: round(float(scores[col][row]), 3)
+        for col in ("infra_score", "security_score", "transport_score", "quiet_score")
+    }
 
-def decay_score(dist, decay):
-    if dist is None:
-        return 0
-    return round(1 / (1 + dist / decay), 4)
+def static_score_key_for(input_data: DongPropertiesInput):
+    # 입력 동 점수가 현재 스냅샷과 같을 때만 저장된 정적 점수를 사용할 수 있음
+    # 반환값: (동 코드, 저장된 score_version과 비교할 값) 또는 None
+    scores = get_score_snapshot()
+    expected = snapshot_dong_scores(scores, input_data.dong_code)
+    if expected is None:
+        return None
+    received = {col: getattr(input_data, col) for col in expected}
+    if received != expected:
+        return None
+    return input_data.dong_code, f"{PROPERTY_SCORE_VERSION}:{scores.version}"
 
-def adjusted_decay_score_with_weights(
-    dist, count=0, dong_score=0,
-    decay=1000, max_count=10,  # 항목별로 다르게 설정
-    base_weight=0.7, count_weight=0.1, dong_weight=0.2
-):
-    if dist is None:
-        return 0.0
-    base_score = 1 / (1 + (dist / decay) ** 1.5)
-    count_score = min(1.0, math.log1p(count) / math.log1p(max_count))
-    score = (
-        base_score * base_weight +
-        count_score * count_weight +
-        dong_score * dong_weight
-    )
-    return round(score, 4)
-
-def adjusted_quiet_score(
-    base_score: float,
-    infra_count: int = 0,
-    avg_dist: float = None,
-    count_weight: float = 0.05,
-    distance_boost_decay: float = 500,
-    max_adjust: float = 0.15
-) -> float:
-    # 기준선
-    ideal_count = 50
-    ideal_distance = 500
-
-    # 음식점 수 기반 조정: count가 적으면 보너스, 많으면 감점
-    count_diff = ideal_count - infra_count  # +일수록 보너스
-    count_adjust = count_diff * count_weight
-    count_adjust = max(-max_adjust, min(max_adjust, count_adjust))
-
-    # 거리 기반 조정: 멀수록 보너스
-    dist_adjust = 0.0
-    if avg_dist is not None:
-        dist_adjust = max_adjust * (1 - math.exp(-avg_dist / distance_boost_decay)) - 0.03
-        dist_adjust = max(-max_adjust, min(max_adjust, dist_adjust))
-
-    total_adjust = count_adjust + dist_adjust
-    final_score = base_score + total_adjust
-    return round(min(1.0, max(0.0, final_score)), 4)
-
-def parse_point_string(point_str):
-    try:
-        parts = point_str.strip().replace("POINT(", "").replace(")", "").split()
-        if len(parts) != 2:
-            return None, None
-        lon, lat = map(float, parts)
-        return lat, lon
-    except Exception as e:
-        print(f"[POINT • 파싱 실패] {e} | 원본: {point_str}")
-        return None, None
-
-def compute_commute_time_min(prop_location: str, job_location: list, transport_profile: dict):
-    try:
-        lat, lon = parse_point_string(prop_location)
-        if lat is None or lon is None:
-            return None
-        job_lat, job_lon = job_location[1], job_location[0]
-        distance_km = geodesic((lat, lon), (job_lat, job_lon)).km
-        speed_kmh = transport_profile["speed_kmh"]
-        correction = transport_profile["correction_factor"]
-        return round(distance_km * correction / speed_kmh * 60, 2)
-    except:
+def custom_quiet_column(scores, user_input: UserInput):
+    # 시간대 가중치가 있으면 시간대 프로필로 다시 계산한 quiet_score (스냅샷 행 순서)
+    # 가중치가 없거나 프로필 파일이 없으면 None → 스냅샷의 quiet_score 그대로 사용
+    if not user_input.hourly_weights:
         return None
+    profile = get_quiet_profile()
+    if profile is None:
+        return None
+    return profile.quiet_column(scores, user_input.hourly_weights)
+
+def static_scores_usable(row, dong_code, static_score_key):
+    # 다른 동 매물은 입력 동 점수가 적용되지 않으므로(0점) 직접 계산
+    if static_score_key is None or dong_code != static_score_key[0]:
+        return False
+    return getattr(row, "score_version", None) == static_score_key[1]
 
 async def recommend_properties(input_data: DongPropertiesInput, db: AsyncSession):
     property_ids = input_data.property_ids
     user_input = input_data.user_input
     page, page_size = input_data.page, input_data.page_size
+    deadline = request_deadline()
     quiet_score_map = {input_data.dong_code: input_data.quiet_score}
     youth_score_map = {input_data.dong_code: input_data.youth_score}
     security_score_map = {input_data.dong_code: input_data.security_score}
     infra_score_map = {input_data.dong_code: input_data.infra_score}
-    transport_score_map = {input_data.dong_code: input_data.transport_score}    
+    transport_score_map = {input_data.dong_code: input_data.transport_score}
+    dong_score_maps = {
+        "infra_score": infra_score_map,
+        "security_score": security_score_map,
+        "transport_score": transport_score_map,
+        "quiet_score": quiet_score_map,
+        "youth_score": youth_score_map,
+    }
 
     if not property_ids:
-        return {"total": 0, "total_pages": 0, "page": page, "page_size": page_size, "results": []}
-
-    rows = []
-    for chunk in chunk_list(property_ids, MAX_CHUNK):
-        result = await db.execute(
-            select(Property, func.ST_AsText(Property.location).label("location_wkt"))
-            .where(Property.id.in_(chunk))
-        )
-        rows.extend(result.all())
-
-    async def fetch_maps(model):
-        async def fetch_chunk(chunk):
-            result = await db.execute(
-                select(
-                    model.property_id,
-                    func.count().label("count"),
-                    func.avg(model.distance_meters).label("avg_distance")
-                ).where(model.property_id.in_(chunk)).group_by(model.property_id)
-            )
-            return result.fetchall()
-
-        tasks = [fetch_chunk(chunk) for chunk in chunk_list(property_ids, MAX_CHUNK)]
-        results = await asyncio.gather(*tasks)
-        all_rows = []
-        for res in results:
-            all_rows.extend(res)
-        return all_rows
-
-    cctv_data, infra_data, bus_data, subway_data = await asyncio.gather(
-        fetch_maps(PropertyCCTVMap),
-        fetch_maps(PropertyRestFoodPermitMap),
-        fetch_maps(PropertyBusStopMap),
-        fetch_maps(PropertySubwayMap)
-    )
-
-    cctv_map = {r.property_id: r.count for r in cctv_data}
-    cctv_dist_map = {r.property_id: float(r.avg_distance) for r in cctv_data}
-    infra_map = {r.property_id: r.count for r in infra_data}
-    infra_dist_map = {r.property_id: float(r.avg_distance) for r in infra_data}
-    bus_count_map = {r.property_id: r.count for r in bus_data}
-    bus_dist_map = {r.property_id: float(r.avg_distance) for r in bus_data}
-    subway_count_map = {r.property_id: r.count for r in subway_data}
-    subway_dist_map = {r.property_id: float(r.avg_distance) for r in subway_data}
+        return {"total": 0, "total_pages": 0, "page": page, "page_size": page_size, "results": [], "next_cursor": None}
 
     transport_mode = user_input.transportation[0] if user_input.transportation else "public"
     transport_profile = TRANSPORT_PROFILE.get(transport_mode, TRANSPORT_PROFILE["public"])
@@ -169,15 +119,7 @@ async def recommend_properties(input_data: DongPropertiesInput, db: AsyncSession
         "commute": "commute_score"
     }
 
-    if not user_input.priority:
-        age = user_input.age
-        gender = user_input.gender.lower()
-        if 0 <= age <= 34:
-            user_input.priority = ["youth", "commute", "infra"]
-        elif gender == "female":
-            user_input.priority = ["security", "quiet", "commute"]
-        else:
-            user_input.priority = ["commute", "infra", "security"]
+    resolve_priority(user_input)
 
     priority_len = len(user_input.priority)
     weights = {1: [1.0], 2: [0.6, 0.4], 3: [0.5, 0.3, 0.2]}.get(priority_len, [1.0 / priority_len] * priority_len)
@@ -200,115 +142,249 @@ async def recommend_properties(input_data: DongPropertiesInput, db: AsyncSession
         adjustments["transport_score"] += 0.1
         adjustments["infra_score"] += 0.05
 
-    recommendations = []
-    for row in rows:
-        prop = row[0]
-        location_str = row.location_wkt
-        pid = prop.id
-        dong_code = prop.administrative_code
-
-        commute_min = compute_commute_time_min(location_str, user_input.job_location, transport_profile)
-        if commute_min is None:
-            print(f"[commute 오류] 매물 ID: {pid}, location: {location_str}, job: {user_input.job_location}")
-
-        base_scores = {
-            "infra_score": adjusted_decay_score_with_weights(
-                dist=infra_dist_map.get(pid),
-                count=infra_map.get(pid, 0),
-                dong_score=infra_score_map.get(dong_code, 0),
-                max_count=200  # 음식점
-            ),
-            "security_score": adjusted_decay_score_with_weights(
-                dist=cctv_dist_map.get(pid),
-                count=cctv_map.get(pid, 0),
-                dong_score=security_score_map.get(dong_code, 0),
-                max_count=500  # CCTV
-            ),
-            "transport_score": round(
-                (
-                    adjusted_decay_score_with_weights(
-                        dist=bus_dist_map.get(pid),
-                        count=bus_count_map.get(pid, 0),
-                        dong_score=transport_score_map.get(dong_code, 0),
-                        max_count=50
-                    ) * 0.4 +
-                    adjusted_decay_score_with_weights(
-                        dist=subway_dist_map.get(pid),
-                        count=subway_count_map.get(pid, 0),
-                        dong_score=transport_score_map.get(dong_code, 0),
-                        max_count=5
-                    ) * 0.6
-                ), 4
-            ),
-            "quiet_score": adjusted_quiet_score(
-                base_score=quiet_score_map.get(dong_code, 0),
-                infra_count=infra_map.get(pid, 0),
-                avg_dist=infra_dist_map.get(pid)
-            ),
-            "youth_score": youth_score_map.get(dong_code, 0),
-            "commute_score": decay_score(commute_min * 60 if commute_min else None, 45 * 60),
-        }
-
-        total_score = 0
-        for i, key in enumerate(user_input.priority):
-            col = score_map[key]
-            base = base_scores.get(col, 0)
-            adj = adjustments.get(col, 1.0)
-            total_score += base * weights[i] * adj
-
-        rent_score = max(0, 100 - math.log(prop.monthly_rent_cost + 1, 1.07)) if prop.monthly_rent_cost else 0
-        total_score += rent_score
-
-        recommendations.append({
-            "property_id": pid,
-            "score": round(total_score, 5),
-            "commute_min": commute_min,
-            "image": prop.main_image_url,
-            "address": prop.address,
-            "deposit": prop.deposit,
-            "monthly_rent_cost": prop.monthly_rent_cost,
-            "maintenance_cost": prop.maintenance_cost,
-            "area": float_or_none(prop.area),
-            "floor": prop.floor,
-            "property_type": prop.property_type,
-            "features": prop.features,
-            "direction": prop.direction,
-            "property_number": prop.property_number,
-            "property_name": prop.property_name,
-            "transaction_type": prop.transaction_type,
-            "property_confirmation_date": str(prop.property_confirmation_date) if prop.property_confirmation_date else None,
-            "rooms_bathrooms": prop.rooms_bathrooms,
-            "duplex": prop.duplex,
-            "total_floor": prop.total_floor,
-            "room_type": prop.room_type,
-            "parking_spaces": prop.parking_spaces,
-            "elevator_count": prop.elevator_count,
-            "approval_date": str(prop.approval_date) if prop.approval_date else None,
-            "cctv_count": cctv_map.get(pid, 0),
-            "infra_count": infra_map.get(pid, 0),
-            "avg_cctv_distance": cctv_dist_map.get(pid),
-            "avg_infra_distance": infra_dist_map.get(pid),
-            "bus_count": bus_count_map.get(pid, 0),
-            "subway_count": subway_count_map.get(pid, 0),
-            "avg_bus_stop_distance": bus_dist_map.get(pid),
-            "avg_subway_distance": subway_dist_map.get(pid),
-            **base_scores,
-        })
-
-    recommendations.sort(key=lambda x: x["score"], reverse=True)
-    total = len(recommendations)
-    start = (page - 1) * page_size
+    static_score_key = static_score_key_for(input_data)
+
+    # 시간대 가중치로 다시 계산한 조용함 지수 (/recommend/area 응답과 같은 자릿수)
+    # 저장된 정적 점수는 기본 조용함 지수 기준이므로 사용하지 않음
+    scores = get_score_snapshot()
+    quiet = custom_quiet_column(scores, user_input)
+    row = scores.row_of(input_data.dong_code)
+    if quiet is not None and row is not None:
+        quiet_score_map[input_data.dong_code] = round(float(quiet[row]), 3)
+        static_score_key = None
+
+    # 같은 입력의 다음 페이지 / cursor 요청은 캐시된 순위를 잘라서 응답
+    # property 테이블 버전을 알 수 없으면 오래된 순위를 내보내지 않도록 캐시 사용 안 함
+    cache_key = None
+    if property_rank_cache.maxsize > 0:
+        property_version = await property_table_version(db)
+        if property_version is not None:
+            cache_key = property_rank_cache_key(input_data, property_version)
+    ranked = property_rank_cache.get(cache_key) if cache_key is not None else None
+    page_rows = None
+    if ranked is None:
+        # 1단계: 점수 계산용 컬럼 + 시설 집계만 조회 (대량이면 묶음 단위 스트리밍)
+        rows = []
+        async for partition in iter_properties_with_facilities(db, property_ids):
+            rows.extend(partition)
+        data = property_input_columns(rows, static_score_key)
+        del rows
+
+        # 점수는 열 단위로 한 번에 계산 (CPU 작업은 풀에서), 결과 dict는 반환할 페이지 행만 생성
+        rank = cache_key is not None or bool(input_data.cursor)
+        columns = await run_cpu(
+            score_property_columns,
+            data, user_input, transport_profile, score_map, weights, adjustments, dong_score_maps, rank,
+            deadline=deadline
+        )
+        if rank:
+            ranked = columns
+            if cache_key is not None:
+                property_rank_cache.set(cache_key, ranked)
+        else:
+            # 캐시를 끈 경우 전체 정렬 없이 요청 페이지만 선택
+            ranked = columns
+            page_rows = top_k_page(columns["score"], (page - 1) * page_size, page_size)
+
+    total = len(ranked["property_id"])
+    if page_rows is None:
+        start = cursor_start(ranked, input_data.cursor) if input_data.cursor else (page - 1) * page_size
+        page_rows = np.arange(start, min(start + page_size, total))
+        page = start // page_size + 1
+        has_next = start + page_size < total
+    else:
+        has_next = page * page_size < total
+
+    # 2단계: 반환할 페이지 매물만 전체 컬럼 조회
+    page_ids = [int(ranked["property_id"][i]) for i in page_rows]
+    props = await fetch_properties_by_ids(db, page_ids)
 
     return {
         "total": total,
         "total_pages": (total + page_size - 1) // page_size,
         "page": page,
         "page_size": page_size,
-        "results": recommendations[start:start + page_size]
+        "results": [
+            property_result(props[pid], ranked, i, youth_score_map)
+            for pid, i in zip(page_ids, page_rows) if pid in props
+        ],
+        "next_cursor": encode_cursor(ranked, page_rows[-1]) if has_next and len(page_rows) else None,
+    }
+
+def row_column(rows, attr, fill=np.nan):
+    return np.array([
+        fill if getattr(row, attr) is None else float(getattr(row, attr)) for row in rows
+    ], dtype=np.float64)
+
+def property_input_columns(rows, static_score_key=None):
+    # 조회 행 → 점수 계산 입력 열 (NumPy 배열만 담아 스레드 / 프로세스 풀로 전달)
+    dong_codes = [row.administrative_code for row in rows]
+    data = {
+        "property_id": np.array([row.id for row in rows], dtype=np.int64),
+        "administrative_code": np.array(dong_codes, dtype=object),
+        "monthly_rent_cost": np.array([row.monthly_rent_cost or 0 for row in rows], dtype=np.float64),
+        "lon": row_column(rows, "lon"),
+        "lat": row_column(rows, "lat"),
+    }
+    for name in ("infra", "cctv", "bus", "subway"):
+        data[f"{name}_count"] = row_column(rows, f"{name}_count", 0)
+        data[f"{name}_avg_distance"] = row_column(rows, f"{name}_avg_distance")
+
+    # 미리 계산된 정적 점수가 유효한 행 표시 (나머지는 NaN)
+    stored = np.array([static_scores_usable(row, code, static_score_key) for row, code in zip(rows, dong_codes)], dtype=bool)
+    data["stored"] = stored
+    for col in ("infra_score", "security_score", "transport_score", "quiet_score"):
+        values = np.full(len(rows), np.nan)
+        for i in np.flatnonzero(stored):
+            values[i] = getattr(rows[i], f"static_{col}")
+        data[f"static_{col}"] = values
+    return data
+
+def score_property_columns(
+    data, user_input, transport_profile, score_map, weights, adjustments, dong_score_maps, rank=False
+):
+    # 입력 열 → 점수 열 (commute_min, 항목별 점수, score), 결측값은 NaN
+    # rank=True면 점수 내림차순으로 재배열해서 반환
+    commute_min = commute_min_column(data["lat"], data["lon"], user_input.job_location, transport_profile)
+
+    # 실행기 워커에서 요청마다 호출되므로 실패 건은 호출당 한 줄로 요약
+    failed = np.flatnonzero(np.isnan(commute_min))
+    if len(failed):
+        logger.warning(
+            "[commute 오류] %d건 (예: 매물 ID %s, location: (%s, %s)), job: %s", len(failed),
+            data["property_id"][failed[0]], data["lon"][failed[0]], data["lat"][failed[0]], user_input.job_location
+        )
+
+    dong_codes = data["administrative_code"]
+
+    def dong_column(col):
+        score_map = dong_score_maps[col]
+        return np.array([score_map.get(code, 0) for code in dong_codes], dtype=np.float64)
+
+    facilities = {}
+    for name in ("infra", "cctv", "bus", "subway"):
+        facilities[f"{name}_count"] = data[f"{name}_count"]
+        facilities[f"{name}_avg_distance"] = data[f"{name}_avg_distance"]
+
+    static_scores = static_property_score_columns(
+        facilities["infra_count"], facilities["infra_avg_distance"],
+        facilities["cctv_count"], facilities["cctv_avg_distance"],
+        facilities["bus_count"], facilities["bus_avg_distance"],
+        facilities["subway_count"], facilities["subway_avg_distance"],
+        infra_dong_score=dong_column("infra_score"),
+        security_dong_score=dong_column("security_score"),
+        transport_dong_score=dong_column("transport_score"),
+        quiet_dong_score=dong_column("quiet_score"),
+    )
+
+    # 미리 계산된 정적 점수가 유효한 행은 저장값 사용
+    stored = data["stored"]
+    if stored.any():
+        for col in static_scores:
+            static_scores[col][stored] = data[f"static_{col}"][stored]
+
+    # commute_min이 없거나 0이면 0점 (decay_score와 동일)
+    commute_score = decay_scores(np.where(commute_min == 0, np.nan, commute_min) * 60, 45 * 60)
+
+    base_scores = {
+        **static_scores,
+        "youth_score": dong_column("youth_score"),
+        "commute_score": commute_score,
+    }
+    score = weighted_total_scores(
+        base_scores, [score_map[key] for key in user_input.priority], weights, adjustments, data["monthly_rent_cost"]
+    )
+    columns = {
+        "property_id": data["property_id"],
+        **{col: values.astype(np.int64) if col.endswith("_count") else values for col, values in facilities.items()},
+        **base_scores,
+        "commute_min": commute_min,
+        "score": score,
+    }
+    return rank_property_columns(columns) if rank else columns
+
+def rank_property_columns(columns):
+    # 점수 내림차순(동점은 조회 순서)으로 모든 열 재배열
+    order = np.argsort(-columns["score"], kind="stable")
+    return {col: values[order] for col, values in columns.items()}
+
+def encode_cursor(ranked, i):
+    # 마지막으로 반환한 매물의 (점수, ID)
+    raw = f"{float(ranked['score'][i])!r}:{int(ranked['property_id'][i])}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+class InvalidCursor(Exception):
+    pass
+
+def decode_cursor(cursor: str):
+    try:
+        score, pid = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(score), int(pid)
+    except Exception:
+        raise InvalidCursor(f"잘못된 cursor: {cursor}")
+
+def cursor_start(ranked, cursor: str):
+    score, pid = decode_cursor(cursor)
+    found = np.flatnonzero(ranked["property_id"] == pid)
+    if len(found):
+        return int(found[0]) + 1
+    # 재계산으로 해당 매물이 빠졌으면 점수 기준으로 이어서
+    return int(np.searchsorted(-ranked["score"], -score, side="right"))
+
+def property_result(prop, columns, i, youth_score_map):
+    # prop: 전체 컬럼 Property, columns: 점수 / 시설 집계 열
+    commute_min = None if np.isnan(columns["commute_min"][i]) else float(columns["commute_min"][i])
+
+    def dist(col):
+        value = columns[col][i]
+        return None if np.isnan(value) else float(value)
+
+    return {
+        "property_id": prop.id,
+        "score": float(columns["score"][i]),
+        "commute_min": commute_min,
+        "image": prop.main_image_url,
+        "address": prop.address,
+        "deposit": prop.deposit,
+        "monthly_rent_cost": prop.monthly_rent_cost,
+        "maintenance_cost": prop.maintenance_cost,
+        "area": float_or_none(prop.area),
+        "floor": prop.floor,
+        "property_type": prop.property_type,
+        "features": prop.features,
+        "direction": prop.direction,
+        "property_number": prop.property_number,
+        "property_name": prop.property_name,
+        "transaction_type": prop.transaction_type,
+        "property_confirmation_date": str(prop.property_confirmation_date) if prop.property_confirmation_date else None,
+        "rooms_bathrooms": prop.rooms_bathrooms,
+        "duplex": prop.duplex,
+        "total_floor": prop.total_floor,
+        "room_type": prop.room_type,
+        "parking_spaces": prop.parking_spaces,
+        "elevator_count": prop.elevator_count,
+        "approval_date": str(prop.approval_date) if prop.approval_date else None,
+        "cctv_count": int(columns["cctv_count"][i]),
+        "infra_count": int(columns["infra_count"][i]),
+        "avg_cctv_distance": dist("cctv_avg_distance"),
+        "avg_infra_distance": dist("infra_avg_distance"),
+        "bus_count": int(columns["bus_count"][i]),
+        "subway_count": int(columns["subway_count"][i]),
+        "avg_bus_stop_distance": dist("bus_avg_distance"),
+        "avg_subway_distance": dist("subway_avg_distance"),
+        "infra_score": float(columns["infra_score"][i]),
+        "security_score": float(columns["security_score"][i]),
+        "transport_score": float(columns["transport_score"][i]),
+        "quiet_score": float(columns["quiet_score"][i]),
+        "youth_score": youth_score_map.get(prop.administrative_code, 0),
+        "commute_score": float(columns["commute_score"][i]) if commute_min else 0,
     }
 
 
-def build_property_filters(budget: Budget):
+def build_property_filters(budget: Budget, normalized=None):
+    # normalized: 정규화 컬럼(room_count, direction_mask) 사용 여부, None이면 USE_NORMALIZED_ATTRIBUTES
+    if normalized is None:
+        normalized = USE_NORMALIZED_ATTRIBUTES
     filters = []
 
     # 거래 유형
@@ -347,12 +423,27 @@ def build_property_filters(budget: Budget):
         elif len(budget.area) == 1:
             filters.append(Property.area <= budget.area[0])
 
-    # 방향 (문자열 포함 여부)
+    # 방향
     if budget.direction:
-        filters.append(or_(*[Property.direction.contains(d) for d in budget.direction]))
+        if normalized:
+            # 선택한 방향 비트 중 하나라도 포함
+            filters.append(Property.direction_mask.op("&")(direction_bits(budget.direction)) != 0)
+        else:
+            # 문자열 포함 여부
+            filters.append(or_(*[Property.direction.contains(d) for d in budget.direction]))
 
     # 방 유형
-    if budget.room_type:
+    if budget.room_type and normalized:
+        room_conditions = []
+        for rt in budget.room_type:
+            if rt == "원룸":
+                room_conditions.append(Property.room_count == 1)
+            elif rt == "투룸":
+                room_conditions.append(Property.room_count == 2)
+            else:  # 그 외 모든 방 개수 (3~9개 혹은 방/욕실 정보 없음, 정규화 전 '^[3-9]/'와 같은 의미)
+                room_conditions.append(or_(Property.room_count.between(3, 9), Property.rooms_bathrooms == None))
+        filters.append(or_(*room_conditions))
+    elif budget.room_type:
             room_conditions = []
             for rt in budget.room_type:
                 if rt == "원룸":
@@ -379,68 +470,183 @@ def build_property_filters(budget: Budget):
 
     return filters
 
-async def recommend_dongs(user_input: UserInput, db):
-    df = load_score_data()
+async def fetch_dong_property_counts(db, budget: Budget, dong_codes: list, with_ids=True, id_limit=None):
+    # 동별 조건 충족 매물 수와 매물 ID 목록 (메모리 매물 스토어 사용 가능하면 배열 마스크, 아니면 SQL)
+    # id_limit 지정 시 동마다 최신 매물 ID를 최대 id_limit개까지만 반환
+    if not dong_codes:
+        return {}, {}
+    if id_limit is None:
+        id_limit = PROPERTY_IDS_PER_DONG_LIMIT
+
+    store = await get_property_store(db)
+    if store is not None:
+        return store.dong_property_counts(budget, dong_codes, with_ids, id_limit)
+    return await sql_dong_property_counts(db, budget, dong_codes, with_ids, id_limit)
+
+def build_dong_property_count_query(budget: Budget, dong_codes: list, with_ids=True, id_limit=None, normalized=None):
+    columns = [Property.administrative_code, func.count().label("count")]
+    if with_ids:
+        ids = array_agg(aggregate_order_by(Property.id, Property.id.desc()))
+        columns.append((ids[1:id_limit] if id_limit else ids).label("ids"))
+
+    filters = build_property_filters(budget, normalized)
+    filters.append(Property.administrative_code.in_(dong_codes))
+    return select(*columns).where(and_(*filters)).group_by(Property.administrative_code)
+
+async def sql_dong_property_counts(db, budget: Budget, dong_codes: list, with_ids=True, id_limit=None):
+    # 동별 조건 충족 매물 수와 매물 ID 목록을 GROUP BY로 한 번에 집계
+    if not dong_codes:
+        return {}, {}
+
+    result = await db.execute(build_dong_property_count_query(budget, dong_codes, with_ids, id_limit))
+
+    count_map = {}
+    property_map_by_dong = {}
+    for row in result.all():
+        count_map[row.administrative_code] = row.count
+        if with_ids:
+            property_map_by_dong[row.administrative_code] = list(row.ids)
+    return count_map, property_map_by_dong
+
+def min_max_scale(values):
+    # sklearn MinMaxScaler와 동일한 방식의 [0, 1] 정규화
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return values
+    data_min = values.min()
+    data_range = values.max() - data_min
+    if data_range < 10 * np.finfo(np.float64).eps:
+        data_range = 1.0
+    scale = 1.0 / data_range
+    return values * scale + (-data_min * scale)
+
+def resolve_priority(user_input: UserInput):
+    # 우선순위 미입력 시 나이 / 성별 기반 기본값 설정
+    if not user_input.priority:
+        age = user_input.age
+        gender = user_input.gender.lower()
+        if 0 <= age <= 34:
+            user_input.priority = ["youth", "commute", "infra"]
+        elif gender == "female":
+            user_input.priority = ["security", "quiet", "commute"]
+        else:
+            user_input.priority = ["commute", "infra", "security"]
+    return user_input.priority
 
-    TRANSPORT_PROFILE = {
-        "자가용": {"speed_kmh": 25, "correction_factor": 2.5},
-        "대중교통": {"speed_kmh": 15, "correction_factor": 3},  # 환승 고려
-    }
+DONG_SCORE_MAP = {
+    "infra": "infra_score",
+    "security": "security_score",
+    "transport": "transport_score",
+    "quiet": "quiet_score",
+    "youth": "youth_score",
+    "commute": "commute_score"
+}
 
-    # 1. 직장 기준 통근 시간 계산 (km / 25km/h * 60분)
+# 스냅샷에 저장된 동 지표 (commute_score는 요청마다 계산)
+DONG_SCORE_COLUMNS = ["infra_score", "security_score", "transport_score", "quiet_score", "youth_score"]
+
+# 최대 통근 시간 필터 여유 비율
+COMMUTE_MARGIN_FACTOR = 1.2
+
+# /recommend/area/batch에서 한 번에 점수 행렬을 만드는 사용자 수
+AREA_BATCH_CHUNK_SIZE = int(os.getenv("AREA_BATCH_CHUNK_SIZE", "1000"))
+
+AREA_TRANSPORT_PROFILE = {
+    "자가용": {"speed_kmh": 25, "correction_factor": 2.5},
+    "대중교통": {"speed_kmh": 15, "correction_factor": 3},  # 환승 고려
+}
+
+def area_transport_mode(user_input: UserInput):
     mode = "자가용"
     if "대중교통" in user_input.transportation:
         mode = "대중교통"
-    
+
     # 교통수단 2개 이상 선택 시, 자가용으로 재설정
     if len(user_input.transportation) > 1:
         mode = "자가용"
+    return mode
+
+async def recommend_dongs(user_input: UserInput, db):
+    scores = get_score_snapshot()
+    resolve_priority(user_input)
+
+    # 같은 정규화 입력 + 같은 동 점수 / property 테이블 버전이면 캐시된 응답 사용
+    mode = area_transport_mode(user_input)
+    cache_key = None
+    if area_cache.maxsize > 0:
+        property_version = await property_table_version(db)
+        if property_version is not None:
+            cache_key = area_cache_key(user_input, mode, scores.version, property_version)
+            cached = area_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+    result = await compute_recommended_dongs(user_input, db, scores, mode)
+    if cache_key is not None:
+        area_cache.set(cache_key, result)
+    return result
+
+async def compute_recommended_dongs(user_input: UserInput, db, scores, mode):
+    # CPU 단계(점수 계산, 구별 묶기)는 풀에서, DB 집계는 이벤트 루프에서
+    deadline = request_deadline()
+    rows, commute_min, dong_scores, total_score = await run_cpu(
+        score_dongs, scores, user_input, mode, deadline=deadline
+    )
+
+    # 5. 매물 조건 필터링 및 count (통근 필터를 통과한 동만 DB에서 집계)
+    dong_codes = scores["EMD_CD"][rows]
+    count_map, property_map_by_dong = await fetch_dong_property_counts(
+        db, user_input.budget, dong_codes.tolist()
+    )
+
+    # 6. 매물 수 매핑
+    property_count = np.array([count_map.get(code, 0) for code in dong_codes], dtype=np.int64)
 
-    profile = TRANSPORT_PROFILE.get(mode, TRANSPORT_PROFILE["자가용"])
-    speed_kmh = profile["speed_kmh"]
-    correction = profile["correction_factor"]
-
-    # 2. 통근 시간 계산
-    user_lon, user_lat = user_input.job_location
-    df["commute_min"] = df.apply(
-        lambda row: geodesic(
-            (row["centroid_lat"], row["centroid_lon"]),
-            (user_lat, user_lon)
-        ).km * correction / speed_kmh * 60,
-        axis=1
+    recommended_area = await run_cpu(
+        group_dongs_by_gu,
+        scores, rows, dong_codes, total_score, commute_min, property_count, dong_scores, property_map_by_dong,
+        deadline=deadline
     )
+    return {"recommended_area": recommended_area}
 
-    # 2. 통근 시간 필터링 (1.2배 여유 허용)
-    MARGIN_FACTOR = 1.2
-    commute_threshold = user_input.max_commute_min * MARGIN_FACTOR
-    filtered = df[df["commute_min"] <= commute_threshold].copy()
+def score_dongs(scores, user_input: UserInput, mode):
+    # 통근 필터를 통과한 동의 (행 인덱스, 통근 시간, 지표 점수, 종합 점수)
+    # 1. 직장 기준 통근 시간 계산 (km / 25km/h * 60분)
+    profile = AREA_TRANSPORT_PROFILE.get(mode, AREA_TRANSPORT_PROFILE["자가용"])
+
+    # 2. 통근 시간 계산 및 필터링 (1.2배 여유 허용)
+    # 경계 박스로 후보를 먼저 거른 뒤 거리 일괄 계산
+    commute_threshold = user_input.max_commute_min * COMMUTE_MARGIN_FACTOR
+    rows, commute_min = commute_min_within(
+        scores["centroid_lat"],
+        scores["centroid_lon"],
+        user_input.job_location,
+        profile,
+        commute_threshold
+    )
 
     # 3. commute_score (낮을수록 좋음)
-    scaler = MinMaxScaler()
-    filtered["norm_commute"] = scaler.fit_transform(filtered[["commute_min"]])
-    filtered["commute_score"] = 1 - filtered["norm_commute"]
+    commute_score = 1 - min_max_scale(commute_min)
 
     # 4. 우선순위 가중치 반영
-    score_map = {
-        "infra": "infra_score",
-        "security": "security_score",
-        "transport": "transport_score",
-        "quiet": "quiet_score",
-        "youth": "youth_score",
-        "commute": "commute_score"
-    }
-    
-    # 기본값 설정
-    if not user_input.priority:
-        age = user_input.age
-        gender = user_input.gender.lower()
-        if 0 <= age <= 34:
-            user_input.priority = ["youth", "commute", "infra"]
-        elif gender == "female":
-            user_input.priority = ["security", "quiet", "commute"]
-        else:
-            user_input.priority = ["commute", "infra", "security"]
-    
+    # 후보 동의 지표 점수 (스냅샷 배열에서 행 선택, 원본은 수정하지 않음)
+    dong_scores = {col: scores[col][rows] for col in DONG_SCORE_COLUMNS}
+    dong_scores["commute_score"] = commute_score
+    quiet = custom_quiet_column(scores, user_input)
+    if quiet is not None:
+        dong_scores["quiet_score"] = quiet[rows]
+
+    adjusted_weights = dong_priority_weights(user_input)
+
+    total_score = np.zeros(len(rows))
+    for key in user_input.priority:
+        col = DONG_SCORE_MAP[key]
+        total_score = total_score + dong_scores[col] * adjusted_weights[col]
+
+    return rows, commute_min, dong_scores, total_score
+
+def dong_priority_weights(user_input: UserInput):
+    # 항목별 (우선순위 가중치 × 개인화 보정), 같은 항목이 반복되면 마지막 값 사용
     # 우선순위 가중치 설정
     priority_len = len(user_input.priority)
     if priority_len == 1:
@@ -449,7 +655,7 @@ async def recommend_dongs(user_input: UserInput, db):
         weights = [0.6, 0.4]
     elif priority_len >= 3:
         weights = [0.5, 0.3, 0.2][:priority_len]
-        
+
     # 사용자 특성 기반 보정 인자 설정
     adjustments = {
         "security_score": 1.0,
@@ -472,90 +678,215 @@ async def recommend_dongs(user_input: UserInput, db):
         adjustments["transport_score"] += 0.1
         adjustments["infra_score"] += 0.05
 
+    adjusted_weights = {}
     for i, key in enumerate(user_input.priority):
-        col = score_map[key]
-        adjusted_weight = weights[i] * adjustments.get(col, 1.0)
-        filtered[f"w_{col}"] = filtered[col] * adjusted_weight
+        col = DONG_SCORE_MAP[key]
+        adjusted_weights[col] = weights[i] * adjustments.get(col, 1.0)
+    return adjusted_weights
+
+def dong_commute_matrix(scores, user_inputs: list, modes: list):
+    # 사용자 N명 × 동 D개 통근 시간(분) 행렬과 통근 필터 마스크
+    profiles = [AREA_TRANSPORT_PROFILE.get(mode, AREA_TRANSPORT_PROFILE["자가용"]) for mode in modes]
+    job_lon = np.array([[u.job_location[0]] for u in user_inputs], dtype=np.float64)
+    job_lat = np.array([[u.job_location[1]] for u in user_inputs], dtype=np.float64)
+    correction = np.array([[p["correction_factor"]] for p in profiles], dtype=np.float64)
+    speed_kmh = np.array([[p["speed_kmh"]] for p in profiles], dtype=np.float64)
+    threshold = np.array([[u.max_commute_min * COMMUTE_MARGIN_FACTOR] for u in user_inputs], dtype=np.float64)
+
+    dist = distance_km(scores["centroid_lat"], scores["centroid_lon"], job_lat, job_lon)
+    commute_min = dist * correction / speed_kmh * 60
+    return commute_min, commute_min <= threshold
+
+def score_dongs_batch(scores, user_inputs: list, modes: list):
+    # score_dongs를 N명에 대해 행렬로 한 번에 계산 → 사용자별 (행 인덱스, 통근 시간, 지표 점수, 종합 점수)
+    # 우선순위 설정이 잘못된 사용자는 예외 객체
+    n = len(user_inputs)
+    commute_min, mask = dong_commute_matrix(scores, user_inputs, modes)
+
+    # 행별 min-max 정규화 (min_max_scale과 같은 연산 순서, 통근 필터 통과한 동 기준)
+    with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        data_min = np.where(mask, commute_min, np.inf).min(axis=1, keepdims=True)
+        data_range = np.where(mask, commute_min, -np.inf).max(axis=1, keepdims=True) - data_min
+        data_range = np.where(data_range < 10 * np.finfo(np.float64).eps, 1.0, data_range)
+        scale = 1.0 / data_range
+        commute_score = 1 - (commute_min * scale + (-data_min * scale))
+
+    # 우선순위 k번째 항목의 (지표 인덱스, 보정 가중치) → 종합 점수 행렬
+    columns = DONG_SCORE_COLUMNS + ["commute_score"]
+    static = np.stack([scores[col] for col in DONG_SCORE_COLUMNS])
+
+    # 시간대 가중치를 준 사용자의 quiet_score는 (D × 24) @ (24 × M) 행렬곱 한 번으로 계산
+    quiet_index = DONG_SCORE_COLUMNS.index("quiet_score")
+    quiet = None
+    custom = [i for i, u in enumerate(user_inputs) if u.hourly_weights]
+    profile = get_quiet_profile() if custom else None
+    if profile is not None:
+        quiet = np.tile(scores["quiet_score"], (n, 1))
+        quiet[custom] = profile.quiet_column(scores, [user_inputs[i].hourly_weights for i in custom]).T
+
+    plans = []
+    for u in user_inputs:
+        try:
+            adjusted_weights = dong_priority_weights(u)
+            plans.append([(columns.index(DONG_SCORE_MAP[key]), adjusted_weights[DONG_SCORE_MAP[key]]) for key in u.priority])
+        except Exception as e:
+            plans.append(e)
+
+    total_score = np.zeros(commute_min.shape)
+    for k in range(max((len(p) for p in plans if isinstance(p, list)), default=0)):
+        active = np.array([isinstance(p, list) and k < len(p) for p in plans])
+        col_index = np.array([p[k][0] if active[i] else 0 for i, p in enumerate(plans)])
+        weight = np.array([p[k][1] if active[i] else 0.0 for i, p in enumerate(plans)])
+        values = np.where(
+            (col_index == len(DONG_SCORE_COLUMNS))[:, None],
+            commute_score,
+            static[np.minimum(col_index, len(DONG_SCORE_COLUMNS) - 1)]
+        )
+        if quiet is not None:
+            values = np.where((col_index == quiet_index)[:, None], quiet, values)
+        total_score = np.where(active[:, None], total_score + values * weight[:, None], total_score)
+
+    results = []
+    for i in range(n):
+        if isinstance(plans[i], Exception):
+            results.append(plans[i])
+            continue
+        rows = np.flatnonzero(mask[i])
+        dong_scores = {col: scores[col][rows] for col in DONG_SCORE_COLUMNS}
+        dong_scores["commute_score"] = commute_score[i, rows]
+        if quiet is not None:
+            dong_scores["quiet_score"] = quiet[i, rows]
+        results.append((rows, commute_min[i, rows], dong_scores, total_score[i, rows]))
+    return results
+
+def recommend_dongs_chunk(scores, user_inputs: list, modes: list, budget_keys: list, counts_by_budget: dict):
+    # 사용자 묶음의 /recommend/area 결과 (입력 순서), 실패한 사용자는 {"error": ...}
+    results = []
+    for scored, budget_key in zip(score_dongs_batch(scores, user_inputs, modes), budget_keys):
+        if isinstance(scored, Exception):
+            results.append({"error": f"{type(scored).__name__}: {scored}"})
+            continue
+        rows, commute_min, dong_scores, total_score = scored
+        dong_codes = scores["EMD_CD"][rows]
+        count_map, property_map_by_dong = counts_by_budget[budget_key]
+        property_count = np.array([count_map.get(code, 0) for code in dong_codes], dtype=np.int64)
+        results.append({"result": {"recommended_area": group_dongs_by_gu(
+            scores, rows, dong_codes, total_score, commute_min, property_count, dong_scores, property_map_by_dong
+        )}})
+    return results
+
+def budget_cache_key(budget: Budget):
+    return json.dumps(budget.model_dump(mode="json"), sort_keys=True, ensure_ascii=False)
+
+async def run_batch_cpu(fn, *args):
+    # 배치 작업은 대화형 요청에 양보: 풀이 가득 차 있으면 잠시 후 재시도
+    while True:
+        try:
+            return await run_cpu(fn, *args)
+        except ExecutorBusy:
+            await asyncio.sleep(0.05)
+
+async def recommend_dongs_batch(user_inputs: list, db):
+    # N명의 동 추천: DB 집계(예산 조건별 한 번)는 여기서 끝내고, 결과는 묶음 단위로 계산하며 하나씩 내보내는 제너레이터 반환
+    scores = get_score_snapshot()
+    modes = []
+    for user_input in user_inputs:
+        resolve_priority(user_input)
+        modes.append(area_transport_mode(user_input))
+    budget_keys = [budget_cache_key(u.budget) for u in user_inputs]
+
+    # 1. 예산 조건별로 통근 필터를 통과한 동 코드 합집합
+    budgets = {}
+    reachable = {}
+    for start in range(0, len(user_inputs), AREA_BATCH_CHUNK_SIZE):
+        end = start + AREA_BATCH_CHUNK_SIZE
+        _, mask = await run_batch_cpu(dong_commute_matrix, scores, user_inputs[start:end], modes[start:end])
+        by_budget = defaultdict(list)
+        for offset, key in enumerate(budget_keys[start:end]):
+            by_budget[key].append(offset)
+            budgets.setdefault(key, user_inputs[start + offset].budget)
+        for key, offsets in by_budget.items():
+            union = mask[offsets].any(axis=0)
+            reachable[key] = reachable[key] | union if key in reachable else union
+
+    # 2. 예산 조건마다 매물 집계 쿼리 한 번
+    counts_by_budget = {}
+    for key, budget in budgets.items():
+        counts_by_budget[key] = await fetch_dong_property_counts(
+            db, budget, scores["EMD_CD"][reachable[key]].tolist()
+        )
 
-    score_cols = [f"w_{score_map[p]}" for p in user_input.priority]
-    filtered["total_score"] = filtered[score_cols].sum(axis=1)
-    
-    
+    async def results():
+        for start in range(0, len(user_inputs), AREA_BATCH_CHUNK_SIZE):
+            end = start + AREA_BATCH_CHUNK_SIZE
+            keys = budget_keys[start:end]
+            chunk = await run_batch_cpu(
+                recommend_dongs_chunk, scores, user_inputs[start:end], modes[start:end], keys,
+                {key: counts_by_budget[key] for key in set(keys)}
+            )
+            for offset, item in enumerate(chunk):
+                yield {"index": start + offset, **item}
 
-    # 5. 매물 조건 필터링 및 count
-    filters = build_property_filters(user_input.budget)
-    
-    stmt = select(Property.id, Property.administrative_code).where(and_(*filters))
-    result = await db.execute(stmt)
-    property_rows = result.all()
+    return results()
 
-    count_map = defaultdict(int)
-    property_map_by_dong = defaultdict(list)
-    for prop_id, admin_code in property_rows:
-        count_map[admin_code] += 1
-        property_map_by_dong[admin_code].append(prop_id)
+def group_dongs_by_gu(scores, rows, dong_codes, total_score, commute_min, property_count, dong_scores, property_map_by_dong):
+    # 매물 수, 종합 점수 내림차순 정렬 후 구 단위로 묶기
+    order = np.lexsort((-total_score, -property_count))
+    gu_names = scores["gu"][rows]
+    gu_codes = scores["gu_code"][rows]
+    dong_names = scores["EMD_NM"][rows]
 
-    # 6. 매물 수 매핑
-    filtered["property_count"] = filtered["EMD_CD"].map(lambda code: count_map.get(code, 0))
+    members_by_gu = defaultdict(list)
+    for i in order:
+        if gu_names[i]:
+            members_by_gu[gu_names[i]].append(i)
 
     grouped_result = []
-
-    filtered_sorted = filtered.sort_values(
-        by=["property_count", "total_score"], ascending=[False, False]
-    )[
-        [
-            "gu", "gu_code", "EMD_NM", "EMD_CD", "total_score", "commute_min", "property_count",
-            "infra_score", "security_score", "quiet_score", "youth_score",
-            "transport_score", "commute_score"
-        ]
-    ]
-
-    for gu, group in filtered_sorted.groupby("gu"):
-        total_property_count = int(group["property_count"].sum())
+    for gu in sorted(members_by_gu):
+        members = np.array(members_by_gu[gu])
+        total_property_count = int(property_count[members].sum())
         if total_property_count == 0:
             continue
 
-        dong_list = group.sort_values(
-            by=["total_score","property_count","commute_min"], ascending=[False, False, True]
-        ).apply(lambda row: {
-            "dong": row["EMD_NM"],
-            "dong_code": row["EMD_CD"],
-            "total_score": round(row["total_score"], 3),
-            "property_count": int(row["property_count"]),
-            "commute_min": round(row["commute_min"], 2),
-            "infra_score": round(row["infra_score"], 3),
-            "security_score": round(row["security_score"], 3),
-            "quiet_score": round(row["quiet_score"], 3),
-            "youth_score": round(row["youth_score"], 3),
-            "transport_score": round(row["transport_score"], 3),
-            "commute_score": round(row["commute_score"], 3),
-            "property_ids": property_map_by_dong.get(row["EMD_CD"], []),
-        }, axis=1).tolist()
+        # 동 정렬: 종합 점수 내림차순 → 매물 수 내림차순 → 통근 시간 오름차순
+        dong_order = members[np.lexsort((
+            commute_min[members], -property_count[members], -total_score[members]
+        ))]
+
+        dong_list = [{
+            "dong": dong_names[i],
+            "dong_code": dong_codes[i],
+            "total_score": round(float(total_score[i]), 3),
+            "property_count": int(property_count[i]),
+            "commute_min": round(float(commute_min[i]), 2),
+            "infra_score": round(float(dong_scores["infra_score"][i]), 3),
+            "security_score": round(float(dong_scores["security_score"][i]), 3),
+            "quiet_score": round(float(dong_scores["quiet_score"][i]), 3),
+            "youth_score": round(float(dong_scores["youth_score"][i]), 3),
+            "transport_score": round(float(dong_scores["transport_score"][i]), 3),
+            "commute_score": round(float(dong_scores["commute_score"][i]), 3),
+            "property_ids": property_map_by_dong.get(dong_codes[i], []),
+        } for i in dong_order]
 
         grouped_result.append({
             "gu": str(gu),
-            "gu_code": str(group["gu_code"].iloc[0]),
-            "avg_total_score": float(round(group["total_score"].mean(), 3)),
+            "gu_code": str(gu_codes[members[0]]),
+            "avg_total_score": float(round(total_score[members].mean(), 3)),
             "total_property_count": int(total_property_count),
             "avg_scores": {
-                "infra_score": float(round(group["infra_score"].mean(), 3)),
-                "security_score": float(round(group["security_score"].mean(), 3)),
-                "quiet_score": float(round(group["quiet_score"].mean(), 3)),
-                "youth_score": float(round(group["youth_score"].mean(), 3)),
-                "transport_score": float(round(group["transport_score"].mean(), 3)),
-                "commute_score": float(round(group["commute_score"].mean(), 3)),
+                "infra_score": float(round(dong_scores["infra_score"][members].mean(), 3)),
+                "security_score": float(round(dong_scores["security_score"][members].mean(), 3)),
+                "quiet_score": float(round(dong_scores["quiet_score"][members].mean(), 3)),
+                "youth_score": float(round(dong_scores["youth_score"][members].mean(), 3)),
+                "transport_score": float(round(dong_scores["transport_score"][members].mean(), 3)),
+                "commute_score": float(round(dong_scores["commute_score"][members].mean(), 3)),
             },
             "dong_list": dong_list
         })
-        
-        grouped_result = sorted(
-            grouped_result,
-            key=lambda x: (x["avg_total_score"], x["total_property_count"]),
-            reverse=True
-        )
-
-
-    return {
-        "recommended_area": grouped_result
-    }
 
+    # 구 정렬: 평균 종합 점수 → 총 매물 수 (내림차순)
+    return sorted(
+        grouped_result,
+        key=lambda x: (x["avg_total_score"], x["total_property_count"]),
+        reverse=True
+    )
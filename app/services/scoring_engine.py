@@ -0,0 +1,229 @@
+import math
+
+import numpy as np
+
+# 벡터 계산 결과가 반올림 경계(.5)에서 이 거리 안이면 Python 스칼라 계산으로 다시 확인
+ROUND_TIE_GUARD = 1e-6
+
+RENT_LOG_BASE = math.log(1.07)
+
+def decay_score(dist, decay):
+    if dist is None:
+        return 0
+    return round(1 / (1 + dist / decay), 4)
+
+def adjusted_decay_score_with_weights(
+    dist, count=0, dong_score=0,
+    decay=1000, max_count=10,  # 항목별로 다르게 설정
+    base_weight=0.7, count_weight=0.1, dong_weight=0.2
+):
+    if dist is None:
+        return 0.0
+    base_score = 1 / (1 + (dist / decay) ** 1.5)
+    count_score = min(1.0, math.log1p(count) / math.log1p(max_count))
+    score = (
+        base_score * base_weight +
+        count_score * count_weight +
+        dong_score * dong_weight
+    )
+    return round(score, 4)
+
+def adjusted_quiet_score(
+    base_score: float,
+    infra_count: int = 0,
+    avg_dist: float = None,
+    count_weight: float = 0.05,
+    distance_boost_decay: float = 500,
+    max_adjust: float = 0.15
+) -> float:
+    # 기준선
+    ideal_count = 50
+    ideal_distance = 500
+
+    # 음식점 수 기반 조정: count가 적으면 보너스, 많으면 감점
+    count_diff = ideal_count - infra_count  # +일수록 보너스
+    count_adjust = count_diff * count_weight
+    count_adjust = max(-max_adjust, min(max_adjust, count_adjust))
+
+    # 거리 기반 조정: 멀수록 보너스
+    dist_adjust = 0.0
+    if avg_dist is not None:
+        dist_adjust = max_adjust * (1 - math.exp(-avg_dist / distance_boost_decay)) - 0.03
+        dist_adjust = max(-max_adjust, min(max_adjust, dist_adjust))
+
+    total_adjust = count_adjust + dist_adjust
+    final_score = base_score + total_adjust
+    return round(min(1.0, max(0.0, final_score)), 4)
+
+def rent_score(monthly_rent_cost):
+    return max(0, 100 - math.log(monthly_rent_cost + 1, 1.07)) if monthly_rent_cost else 0
+
+# 정적 점수 공식 버전 (공식 변경 시 올리고 data/facility_summary.py --rescore 실행)
+PROPERTY_SCORE_VERSION = 1
+
+def static_property_scores(
+    infra_count, infra_dist, cctv_count, cctv_dist,
+    bus_count, bus_dist, subway_count, subway_dist,
+    infra_dong_score=0, security_dong_score=0, transport_dong_score=0, quiet_dong_score=0
+):
+    # 사용자 입력과 무관한 매물 점수 (시설 집계 + 동 점수만 사용)
+    return {
+        "infra_score": adjusted_decay_score_with_weights(
+            dist=infra_dist,
+            count=infra_count,
+            dong_score=infra_dong_score,
+            max_count=200  # 음식점
+        ),
+        "security_score": adjusted_decay_score_with_weights(
+            dist=cctv_dist,
+            count=cctv_count,
+            dong_score=security_dong_score,
+            max_count=500  # CCTV
+        ),
+        "transport_score": round(
+            (
+                adjusted_decay_score_with_weights(
+                    dist=bus_dist,
+                    count=bus_count,
+                    dong_score=transport_dong_score,
+                    max_count=50
+                ) * 0.4 +
+                adjusted_decay_score_with_weights(
+                    dist=subway_dist,
+                    count=subway_count,
+                    dong_score=transport_dong_score,
+                    max_count=5
+                ) * 0.6
+            ), 4
+        ),
+        "quiet_score": adjusted_quiet_score(
+            base_score=quiet_dong_score,
+            infra_count=infra_count,
+            avg_dist=infra_dist
+        ),
+    }
+
+
+# ---- 배열 버전 (위 함수들과 같은 결과, 결측값은 NaN) ----
+
+def _scalar(values, i):
+    value = float(values[i])
+    return None if math.isnan(value) else value
+
+def round_like_python(values, ndigits, exact=None):
+    # np.round는 .5 경계에서 Python round와 다를 수 있고, SIMD exp/log1p는 libm과 1ulp 차이가 날 수 있음
+    # → 경계 근처 원소만 exact(i)(스칼라 원본 계산)로 다시 계산
+    values = np.asarray(values, dtype=np.float64)
+    out = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    suspect = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < ROUND_TIE_GUARD)
+    for i in suspect:
+        out[i] = exact(i) if exact is not None else round(float(values[i]), ndigits)
+    return out
+
+def decay_scores(dist, decay):
+    dist = np.asarray(dist, dtype=np.float64)
+    valid = ~np.isnan(dist)
+    raw = 1 / (1 + dist / decay)
+    out = round_like_python(raw, 4, lambda i: decay_score(_scalar(dist, i), decay))
+    out[~valid] = 0.0
+    return out
+
+def adjusted_decay_scores_with_weights(
+    dist, count, dong_score,
+    decay=1000, max_count=10,
+    base_weight=0.7, count_weight=0.1, dong_weight=0.2
+):
+    dist = np.asarray(dist, dtype=np.float64)
+    count = np.asarray(count, dtype=np.float64)
+    dong_score = np.broadcast_to(np.asarray(dong_score, dtype=np.float64), dist.shape)
+    valid = ~np.isnan(dist)
+
+    base_score = 1 / (1 + (dist / decay) ** 1.5)
+    count_score = np.minimum(1.0, np.log1p(count) / math.log1p(max_count))
+    score = (
+        base_score * base_weight +
+        count_score * count_weight +
+        dong_score * dong_weight
+    )
+    out = round_like_python(score, 4, lambda i: adjusted_decay_score_with_weights(
+        _scalar(dist, i), float(count[i]), float(dong_score[i]),
+        decay, max_count, base_weight, count_weight, dong_weight
+    ))
+    out[~valid] = 0.0
+    return out
+
+def adjusted_quiet_scores(
+    base_score, infra_count, avg_dist,
+    count_weight=0.05, distance_boost_decay=500, max_adjust=0.15
+):
+    avg_dist = np.asarray(avg_dist, dtype=np.float64)
+    infra_count = np.asarray(infra_count, dtype=np.float64)
+    base_score = np.broadcast_to(np.asarray(base_score, dtype=np.float64), avg_dist.shape)
+
+    count_adjust = np.clip((50 - infra_count) * count_weight, -max_adjust, max_adjust)
+    dist_adjust = max_adjust * (1 - np.exp(-avg_dist / distance_boost_decay)) - 0.03
+    dist_adjust = np.clip(dist_adjust, -max_adjust, max_adjust)
+    dist_adjust[np.isnan(avg_dist)] = 0.0
+
+    final_score = base_score + (count_adjust + dist_adjust)
+    return round_like_python(np.clip(final_score, 0.0, 1.0), 4, lambda i: adjusted_quiet_score(
+        float(base_score[i]), float(infra_count[i]), _scalar(avg_dist, i),
+        count_weight, distance_boost_decay, max_adjust
+    ))
+
+def rent_scores(monthly_rent_cost):
+    # 월세 0 / 미입력(NaN 또는 0으로 전달) → 0점
+    rent = np.nan_to_num(np.asarray(monthly_rent_cost, dtype=np.float64), nan=0.0)
+    out = np.maximum(0.0, 100 - np.log(rent + 1) / RENT_LOG_BASE)
+    out[rent == 0] = 0.0
+    return out
+
+def static_property_score_columns(
+    infra_count, infra_dist, cctv_count, cctv_dist,
+    bus_count, bus_dist, subway_count, subway_dist,
+    infra_dong_score=0, security_dong_score=0, transport_dong_score=0, quiet_dong_score=0
+):
+    # static_property_scores의 배열 버전 (동 점수는 스칼라 또는 행별 배열)
+    transport = (
+        adjusted_decay_scores_with_weights(bus_dist, bus_count, transport_dong_score, max_count=50) * 0.4 +
+        adjusted_decay_scores_with_weights(subway_dist, subway_count, transport_dong_score, max_count=5) * 0.6
+    )
+    return {
+        "infra_score": adjusted_decay_scores_with_weights(infra_dist, infra_count, infra_dong_score, max_count=200),
+        "security_score": adjusted_decay_scores_with_weights(cctv_dist, cctv_count, security_dong_score, max_count=500),
+        "transport_score": round_like_python(transport, 4),
+        "quiet_score": adjusted_quiet_scores(quiet_dong_score, infra_count, infra_dist),
+    }
+
+def weighted_total_scores(base_scores: dict, columns: list, weights: list, adjustments: dict, monthly_rent_cost):
+    # 우선순위 순서대로 base * weight * adj를 더한 뒤 월세 점수 합산, 소수 5자리 반올림
+    rent = np.nan_to_num(np.asarray(monthly_rent_cost, dtype=np.float64), nan=0.0)
+    total = np.zeros(len(rent))
+    for i, col in enumerate(columns):
+        total = total + base_scores[col] * weights[i] * adjustments.get(col, 1.0)
+    total = total + rent_scores(rent)
+
+    def exact(i):
+        score = 0
+        for j, col in enumerate(columns):
+            score += float(base_scores[col][i]) * weights[j] * adjustments.get(col, 1.0)
+        return round(score + rent_score(float(rent[i])), 5)
+
+    return round_like_python(total, 5, exact)
+
+def top_k_page(scores, start: int, size: int):
+    # 점수 내림차순(동점은 입력 순서) 정렬 후 [start, start + size) 구간의 인덱스
+    # 전체 정렬 대신 argpartition으로 상위 start + size개 후보만 정렬
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(scores)
+    end = min(start + size, n)
+    if start >= end:
+        return np.empty(0, dtype=np.intp)
+    if end < n:
+        kth = np.argpartition(-scores, end - 1)[end - 1]
+        candidates = np.flatnonzero(scores >= scores[kth])
+    else:
+        candidates = np.arange(n)
+    order = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return order[start:end]
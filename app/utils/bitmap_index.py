@@ -0,0 +1,102 @@
+import numpy as np
+
+# 64비트 워드 단위 압축 비트맵 (행 위치 i → 워드 i // 64의 i % 64번째 비트)
+
+if hasattr(np, "bitwise_count"):
+    def _word_popcount(words):
+        return np.bitwise_count(words)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _word_popcount(words):
+        return _BYTE_POPCOUNT[words.view(np.uint8)]
+
+def word_count(n_rows: int):
+    return (n_rows + 63) // 64
+
+def pack_mask(mask, n_words: int):
+    # 불리언 배열 → 워드 배열 (길이가 모자라면 0으로 채움)
+    packed = np.packbits(np.asarray(mask, dtype=bool), bitorder="little")
+    out = np.zeros(n_words * 8, dtype=np.uint8)
+    out[:len(packed)] = packed
+    return out.view(np.uint64)
+
+def popcount(words):
+    return int(_word_popcount(words).sum(dtype=np.int64))
+
+def positions(words, n_rows: int):
+    # 켜진 비트의 행 위치 (오름차순)
+    bits = np.unpackbits(words.view(np.uint8), bitorder="little", count=n_rows)
+    return np.flatnonzero(bits)
+
+
+class BitmapIndex:
+    # 키(예: ("transaction_type", 코드))마다 행 위치 비트맵 하나
+    def __init__(self, n_rows: int = 0):
+        self.n_rows = n_rows
+        self.n_words = word_count(n_rows)
+        self.bitmaps = {}
+
+    def __contains__(self, key):
+        return key in self.bitmaps
+
+    def keys(self):
+        return self.bitmaps.keys()
+
+    def resize(self, n_rows: int):
+        # 행 추가 시 모든 비트맵 길이를 늘림 (여유분을 두어 매번 복사하지 않음)
+        self.n_rows = max(self.n_rows, n_rows)
+        needed = word_count(self.n_rows)
+        if needed <= self.n_words:
+            return
+        self.n_words = max(needed, self.n_words * 2)
+        for key, words in self.bitmaps.items():
+            grown = np.zeros(self.n_words, dtype=np.uint64)
+            grown[:len(words)] = words
+            self.bitmaps[key] = grown
+
+    def get(self, key):
+        words = self.bitmaps.get(key)
+        return words if words is not None else np.zeros(self.n_words, dtype=np.uint64)
+
+    def add(self, key, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+        self.resize(int(rows.max()) + 1)
+        words = self.bitmaps.get(key)
+        if words is None:
+            words = self.bitmaps[key] = np.zeros(self.n_words, dtype=np.uint64)
+        np.bitwise_or.at(words, rows >> 6, np.left_shift(np.uint64(1), (rows & 63).astype(np.uint64)))
+
+    def discard(self, rows):
+        # 모든 비트맵에서 해당 행 비트 제거 (삭제 / 값 변경 전)
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+        clear = np.full(self.n_words, np.iinfo(np.uint64).max, dtype=np.uint64)
+        np.bitwise_and.at(clear, rows >> 6, ~np.left_shift(np.uint64(1), (rows & 63).astype(np.uint64)))
+        for words in self.bitmaps.values():
+            words &= clear
+
+    def union(self, keys):
+        out = np.zeros(self.n_words, dtype=np.uint64)
+        for key in keys:
+            words = self.bitmaps.get(key)
+            if words is not None:
+                out |= words
+        return out
+
+    def full(self):
+        # 전체 행 비트맵 (n_rows 이후 여유 비트는 0)
+        return pack_mask(np.ones(self.n_rows, dtype=bool), self.n_words)
+
+    def nbytes(self):
+        return sum(words.nbytes for words in self.bitmaps.values())
+
+    def stats(self):
+        return {
+            "rows": self.n_rows,
+            "bitmaps": len(self.bitmaps),
+            "bytes": self.nbytes(),
+        }
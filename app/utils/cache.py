@@ -0,0 +1,83 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def default_sizeof(value):
+    # numpy 배열 dict는 nbytes 합, 그 외는 sys.getsizeof (얕은 크기)
+    if isinstance(value, dict):
+        return sum(getattr(v, "nbytes", sys.getsizeof(v)) for v in value.values())
+    return getattr(value, "nbytes", sys.getsizeof(value))
+
+
+class TTLCache:
+    # TTL + LRU 캐시 (항목 수 / 메모리 상한 중 먼저 넘는 쪽 기준으로 오래 안 쓴 항목부터 제거)
+    def __init__(self, maxsize=256, ttl=300, max_bytes=None, sizeof=default_sizeof):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._items = OrderedDict()  # key → (만료 시각, 값, 크기)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            if item[0] <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (time.monotonic() + self.ttl, value, size)
+            self._bytes += size
+            while len(self._items) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._items)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, _, size = self._items.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "maxsize": self.maxsize,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / requests, 4) if requests else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
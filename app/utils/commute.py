@@ -0,0 +1,83 @@
+import numpy as np
+
+# WGS84 타원체 상수
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+# 경계 박스 사전 필터 여유 비율 (근사 오차 흡수용)
+BBOX_MARGIN = 1.01
+
+
+def _radii_of_curvature_km(lat_rad):
+    # 위도별 자오선 곡률반경(M), 묘유선 곡률반경(N)
+    sin2 = np.sin(lat_rad) ** 2
+    w = np.sqrt(1 - WGS84_E2 * sin2)
+    m = WGS84_A * (1 - WGS84_E2) / w ** 3 / 1000
+    n = WGS84_A / w / 1000
+    return m, n
+
+
+def distance_km(lats, lons, ref_lat, ref_lon):
+    # 기준점(ref)과 각 좌표 사이 거리를 한 번에 계산 (단위: km)
+    # 중간 위도의 타원체 곡률반경을 쓰는 평면 근사로, 서울 범위(수십 km)에서는
+    # geodesic 대비 상대오차 0.001% 이내
+    lats = np.radians(np.asarray(lats, dtype=np.float64))
+    lons = np.radians(np.asarray(lons, dtype=np.float64))
+    ref_lat = np.radians(ref_lat)
+    ref_lon = np.radians(ref_lon)
+
+    mid_lat = (lats + ref_lat) / 2
+    m, n = _radii_of_curvature_km(mid_lat)
+    dy = m * (lats - ref_lat)
+    dx = n * np.cos(mid_lat) * (lons - ref_lon)
+    return np.hypot(dx, dy)
+
+
+def bounding_box_mask(lats, lons, ref_lat, ref_lon, radius_km):
+    # 반경(radius_km)을 감싸는 위경도 박스 밖의 좌표를 거리 계산 전에 제외
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    m, n = _radii_of_curvature_km(np.radians(ref_lat))
+    radius_km = radius_km * BBOX_MARGIN
+    dlat = np.degrees(radius_km / m)
+    dlon = np.degrees(radius_km / (n * np.cos(np.radians(ref_lat))))
+    return (
+        (np.abs(lats - ref_lat) <= dlat) &
+        (np.abs(lons - ref_lon) <= dlon)
+    )
+
+
+def to_commute_min(dist_km, transport_profile: dict):
+    # 거리(km) → 통근 시간(분), 교통수단별 속도 및 보정계수 적용
+    speed_kmh = transport_profile["speed_kmh"]
+    correction = transport_profile["correction_factor"]
+    return dist_km * correction / speed_kmh * 60
+
+
+def max_distance_km(max_commute_min: float, transport_profile: dict):
+    # 최대 통근 시간(분) → 도달 가능한 최대 거리(km)
+    speed_kmh = transport_profile["speed_kmh"]
+    correction = transport_profile["correction_factor"]
+    return max_commute_min / 60 * speed_kmh / correction
+
+
+def batch_commute_min(lats, lons, job_location: list, transport_profile: dict):
+    # 전체 좌표의 통근 시간(분) 배열, 좌표가 없는 행은 NaN
+    job_lon, job_lat = job_location[0], job_location[1]
+    dist = distance_km(lats, lons, job_lat, job_lon)
+    return to_commute_min(dist, transport_profile)
+
+
+def commute_min_within(lats, lons, job_location: list, transport_profile: dict, max_commute_min: float):
+    # 최대 통근 시간 이내인 행의 (인덱스, 통근 시간) 반환, 인덱스는 원래 순서 유지
+    job_lon, job_lat = job_location[0], job_location[1]
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+
+    radius_km = max_distance_km(max_commute_min, transport_profile)
+    candidates = np.flatnonzero(bounding_box_mask(lats, lons, job_lat, job_lon, radius_km))
+
+    commute_min = batch_commute_min(lats[candidates], lons[candidates], job_location, transport_profile)
+    within = commute_min <= max_commute_min
+    return candidates[within], commute_min[within]
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# 점수 계산(CPU) 단계 실행 방식: thread / process / inline(이벤트 루프에서 바로 실행)
+SCORING_EXECUTOR = os.getenv("SCORING_EXECUTOR", "thread").lower()
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "2"))
+
+# 대기 + 실행 중 작업이 이 개수 이상이면 바로 거절 (503)
+SCORING_QUEUE_LIMIT = int(os.getenv("SCORING_QUEUE_LIMIT", "32"))
+
+# 요청당 CPU 단계 전체 제한 시간 (초, 504)
+SCORING_DEADLINE_SEC = float(os.getenv("SCORING_DEADLINE_SEC", "10"))
+
+
+class ExecutorBusy(Exception):
+    pass
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "in_flight": 0,  # 풀에 제출됐지만 아직 끝나지 않은 작업 (대기 + 실행 중)
+    "max_in_flight": 0,
+    "submitted": 0,
+    "completed": 0,
+    "rejected": 0,
+    "timeouts": 0,
+    "wait_ms_total": 0.0,
+    "wait_ms_max": 0.0,
+    "run_ms_total": 0.0,
+}
+
+def get_executor():
+    # gunicorn fork 이후 워커 프로세스에서 처음 쓸 때 생성
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if SCORING_EXECUTOR == "process":
+                    _executor = ProcessPoolExecutor(max_workers=SCORING_WORKERS)
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=SCORING_WORKERS, thread_name_prefix="scoring")
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def request_deadline():
+    return time.monotonic() + SCORING_DEADLINE_SEC
+
+def _timed_call(fn, args, kwargs):
+    # 풀 안에서 실행: (시작 시각, 실행 시간, 결과) 반환 (monotonic은 같은 호스트 프로세스 간 비교 가능)
+    started = time.monotonic()
+    result = fn(*args, **kwargs)
+    return started, time.monotonic() - started, result
+
+def _update(**changes):
+    with _stats_lock:
+        for key, value in changes.items():
+            _stats[key] += value
+        _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+
+async def run_cpu(fn, *args, deadline=None, **kwargs):
+    # CPU 작업을 풀에서 실행하고 이벤트 루프는 다른 요청을 처리
+    if deadline is not None and time.monotonic() >= deadline:
+        _update(timeouts=1)
+        raise DeadlineExceeded(f"{fn.__name__}: 제한 시간 초과")
+    if SCORING_EXECUTOR == "inline":
+        return fn(*args, **kwargs)
+
+    with _stats_lock:
+        if _stats["in_flight"] >= SCORING_QUEUE_LIMIT:
+            _stats["rejected"] += 1
+            raise ExecutorBusy(f"점수 계산 대기열 초과 ({SCORING_QUEUE_LIMIT})")
+        _stats["in_flight"] += 1
+        _stats["submitted"] += 1
+        _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+
+    submitted = time.monotonic()
+    future = get_executor().submit(_timed_call, fn, args, kwargs)
+
+    def on_done(f):
+        # 시간 초과로 응답을 포기한 작업도 끝날 때까지 자리를 차지함
+        if f.cancelled() or f.exception() is not None:
+            _update(in_flight=-1)
+            return
+        started, elapsed, _ = f.result()
+        wait_ms = max(0.0, (started - submitted) * 1000)
+        with _stats_lock:
+            _stats["in_flight"] -= 1
+            _stats["completed"] += 1
+            _stats["wait_ms_total"] += wait_ms
+            _stats["wait_ms_max"] = max(_stats["wait_ms_max"], wait_ms)
+            _stats["run_ms_total"] += elapsed * 1000
+
+    future.add_done_callback(on_done)
+
+    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+    try:
+        _, _, result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        _update(timeouts=1)
+        raise DeadlineExceeded(f"{fn.__name__}: 제한 시간 초과")
+    return result
+
+def executor_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    completed = stats["completed"]
+    return {
+        "mode": SCORING_EXECUTOR,
+        "workers": SCORING_WORKERS,
+        "queue_limit": SCORING_QUEUE_LIMIT,
+        "deadline_sec": SCORING_DEADLINE_SEC,
+        "queue_depth": max(0, stats["in_flight"] - SCORING_WORKERS),
+        "in_flight": stats["in_flight"],
+        "max_in_flight": stats["max_in_flight"],
+        "submitted": stats["submitted"],
+        "completed": completed,
+        "rejected": stats["rejected"],
+        "timeouts": stats["timeouts"],
+        "wait_ms_avg": round(stats["wait_ms_total"] / completed, 3) if completed else 0.0,
+        "wait_ms_max": round(stats["wait_ms_max"], 3),
+        "run_ms_avg": round(stats["run_ms_total"] / completed, 3) if completed else 0.0,
+    }
@@ -0,0 +1,38 @@
+import os
+import re
+
+# 매물 속성 정규화 (data/migrations/003의 트리거 / 백필과 같은 규칙)
+
+# 방 개수 / 방향 조건에 정규화 컬럼 사용 여부 (data/migrations/003 적용 후 true로 설정)
+USE_NORMALIZED_ATTRIBUTES = os.getenv("USE_NORMALIZED_ATTRIBUTES", "false").lower() == "true"
+
+# 방향 문자 → 비트 (direction_mask 컬럼)
+DIRECTION_BITS = {"동": 1, "서": 2, "남": 4, "북": 8}
+
+# '1/1개' → 방 1, 욕실 1 / '1/-개' → 방 1, 욕실 NULL / 형식이 다르면 NULL
+ROOM_COUNT_PATTERN = re.compile(r"(\d{1,4})/")
+BATHROOM_COUNT_PATTERN = re.compile(r"\d+/(\d{1,4})")
+
+def direction_mask(direction):
+    # '남동향' → 남 | 동 = 5, NULL / 빈 문자열 → 0
+    if not direction:
+        return 0
+    mask = 0
+    for ch, bit in DIRECTION_BITS.items():
+        if ch in direction:
+            mask |= bit
+    return mask
+
+def direction_bits(directions: list):
+    mask = 0
+    for d in directions:
+        mask |= DIRECTION_BITS[d]
+    return mask
+
+def room_count(rooms_bathrooms):
+    match = ROOM_COUNT_PATTERN.match(rooms_bathrooms) if rooms_bathrooms else None
+    return int(match.group(1)) if match else None
+
+def bathroom_count(rooms_bathrooms):
+    match = BATHROOM_COUNT_PATTERN.match(rooms_bathrooms) if rooms_bathrooms else None
+    return int(match.group(1)) if match else None
@@ -0,0 +1,107 @@
+import os
+import threading
+
+import numpy as np
+
+from app.utils.score_artifacts import artifact_signature_path, artifact_version, read_artifact
+
+# youth_quiet_score.py가 저장하는 동별 시간대(0~23시) 생활인구 프로필 (.npy 묶음)
+#   EMD_CD (D,), count / mean / m2 (D, 24) float32: 시간대별 관측 수, 평균, 편차제곱합
+#   area_m2 (D,), hour_weights (24,): 기본 시간대 가중치 (TIME_WEIGHTS)
+QUIET_PROFILE_PATH = os.getenv("QUIET_PROFILE_PATH", "data/scoring/score/dong_hourly_population.npy")
+HOURS = 24
+
+def min_max_columns(values):
+    # MinMaxScaler와 같은 연산 (NaN 무시, 열마다, 범위가 0이면 배율 1)
+    data_min = np.nanmin(values, axis=0)
+    data_range = np.nanmax(values, axis=0) - data_min
+    data_range = np.where(data_range < 10 * np.finfo(np.float64).eps, 1.0, data_range)
+    scale = 1.0 / data_range
+    return values * scale + (-data_min * scale)
+
+
+class QuietProfile:
+    # 시간대 가중치 벡터(또는 사용자별 행렬)로 모든 동의 조용함 지수를 한 번에 계산
+    def __init__(self, columns: dict, version: str):
+        count = np.asarray(columns["count"], dtype=np.float64)
+        mean = np.asarray(columns["mean"], dtype=np.float64)
+        self.codes = columns["EMD_CD"]
+        self.count = count
+        self.count_mean = count * mean
+        self.count_mean_sq = count * mean * mean
+        self.m2 = np.asarray(columns["m2"], dtype=np.float64)
+        self.area_m2 = np.asarray(columns["area_m2"], dtype=np.float64)
+        self.default_weights = np.asarray(columns["hour_weights"], dtype=np.float64)
+        self.version = version
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def moments(self, weights):
+        # weights (24,) → (D,), (N, 24) → (D, N): 시간대 가중 평균 / 표준편차
+        # Σ w_h (M2_h + n_h (m_h - 평균)²) / Σ w_h n_h = (Σ w_h M2_h + Σ w_h n_h m_h²) / Σ w_h n_h - 평균²
+        w = np.asarray(weights, dtype=np.float64).T
+        weight_sum = self.count @ w
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (self.count_mean @ w) / weight_sum
+            var = (self.m2 @ w + self.count_mean_sq @ w) / weight_sum - mean ** 2
+        return mean, np.sqrt(np.maximum(var, 0.0))
+
+    def quiet_scores(self, weights):
+        # youth_quiet_score.py와 같은 식: 밀도 / 원시값 혼합 → MinMax → 1 - (0.6 * 표준편차 + 0.4 * 평균)
+        # 가중치 합이 0인 동(선택한 시간대에 관측 없음)은 NaN
+        mean, std = self.moments(weights)
+        area_m2 = self.area_m2 if mean.ndim == 1 else self.area_m2[:, None]
+        std_mix = 0.6 * (std / area_m2) + 0.4 * std
+        mean_mix = 0.6 * (mean / area_m2) + 0.4 * mean
+        alpha, beta = 0.6, 0.4
+        quiet = 1 - (alpha * min_max_columns(std_mix) + beta * min_max_columns(mean_mix))
+        return np.round(quiet, 4)
+
+    def rows_for(self, scores):
+        # 동 점수 스냅샷 행 ↔ 프로필 행 (스냅샷 버전별로 한 번만 계산)
+        rows = self._rows.get(scores.version)
+        if rows is None:
+            pairs = [(scores.row_of(str(code)), i) for i, code in enumerate(self.codes)]
+            pairs = [(row, i) for row, i in pairs if row is not None]
+            rows = (
+                np.array([row for row, _ in pairs], dtype=np.int64),
+                np.array([i for _, i in pairs], dtype=np.int64),
+            )
+            self._rows = {scores.version: rows}
+        return rows
+
+    def quiet_column(self, scores, weights):
+        # 스냅샷 행 순서의 조용함 지수 (프로필이 없거나 계산되지 않는 동은 emd_with_all_scores와 같이 0)
+        snapshot_rows, profile_rows = self.rows_for(scores)
+        quiet = np.nan_to_num(self.quiet_scores(weights), nan=0.0)
+        out = np.zeros((len(scores),) + quiet.shape[1:])
+        out[snapshot_rows] = quiet[profile_rows]
+        return out
+
+
+_state = None
+_load_lock = threading.Lock()
+
+def get_quiet_profile(path=QUIET_PROFILE_PATH):
+    # 프로필 파일이 없으면 None (기본 quiet_score 사용), 파일이 바뀌면 다시 적재
+    global _state
+    try:
+        stat = os.stat(artifact_signature_path(path))
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    state = _state
+    if state is not None and state[1] == signature:
+        return state[0]
+
+    with _load_lock:
+        state = _state
+        if state is None or state[1] != signature:
+            try:
+                profile = QuietProfile(read_artifact(path), artifact_version(path))
+            except (OSError, ValueError, KeyError):
+                return state[0] if state is not None else None
+            _state = state = (profile, signature)
+    return state[0]
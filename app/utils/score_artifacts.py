@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = feather = None
+
+# 점수 표를 타입이 고정된 바이너리 컬럼 형식으로 저장 / 적재 (CSV / JSON 텍스트 파싱 없음)
+#   .npy     : 디렉토리 하나에 컬럼별 .npy + meta.json (numpy만 필요, mmap으로 연결)
+#   .arrow   : Arrow IPC(Feather v2, 비압축) 파일 (pyarrow 필요, mmap으로 연결)
+#   .parquet : 압축 컬럼 파일 (pyarrow 필요, 적재 시 디코딩)
+ARTIFACT_FORMATS = (".npy", ".arrow", ".parquet")
+MMAP_FORMATS = (".npy", ".arrow")
+SCORE_ARTIFACT_FORMAT = os.getenv("SCORE_ARTIFACT_FORMAT", ".npy")
+
+def artifact_format(path: str):
+    return os.path.splitext(path.rstrip("/"))[1]
+
+def is_artifact(path: str):
+    return artifact_format(path) in ARTIFACT_FORMATS
+
+def is_mmap_artifact(path: str):
+    return artifact_format(path) in MMAP_FORMATS
+
+def artifact_path(base: str, fmt: str = None):
+    # "data/scoring/score/emd_with_all_scores" → 확장자를 붙인 산출물 경로
+    return base + (fmt or SCORE_ARTIFACT_FORMAT)
+
+def _require_pyarrow(fmt):
+    if feather is None:
+        raise ImportError(f"{fmt} 점수 산출물에는 pyarrow가 필요합니다 (.npy 형식은 numpy만 사용)")
+
+def column_arrays(df: pd.DataFrame):
+    # 문자열 컬럼은 고정 길이 유니코드 배열(결측은 ""), 나머지는 원래 숫자 dtype 그대로
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            columns[col] = values.to_numpy()
+        else:
+            columns[col] = values.fillna("").astype(str).to_numpy(dtype=str)
+    return columns
+
+def content_version(columns: dict):
+    digest = hashlib.sha1()
+    for col, values in columns.items():
+        values = np.ascontiguousarray(values)
+        digest.update(f"{col}:{values.dtype.str}:{values.shape}".encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+def _replace_dir(staging, path):
+    # 기존 디렉토리를 치우고 새 디렉토리로 교체 (읽는 쪽은 meta.json 시그니처 변화로 감지)
+    if os.path.isdir(path):
+        retired = tempfile.mkdtemp(prefix=".retired-", dir=os.path.dirname(path) or ".")
+        os.rename(path, os.path.join(retired, "old"))
+        os.rename(staging, path)
+        shutil.rmtree(retired, ignore_errors=True)
+    else:
+        os.rename(staging, path)
+
+def write_arrays(columns: dict, path: str, version: str = None, meta: dict = None):
+    # .npy 묶음으로 배열 dict 저장 (2차원 배열 / 길이가 다른 배열도 가능), meta는 meta.json에 추가로 기록
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+    version = version or content_version(columns)
+    staging = tempfile.mkdtemp(prefix=".artifact-", dir=parent)
+    for col, values in columns.items():
+        np.save(os.path.join(staging, f"{col}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+    rows = len(next(iter(columns.values()))) if columns else 0
+    with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({**(meta or {}), "version": version, "rows": rows, "columns": list(columns)}, f, ensure_ascii=False)
+    _replace_dir(staging, path)
+    return version
+
+def write_artifact(df: pd.DataFrame, path: str, meta: dict = None):
+    # 형식은 확장자로 결정, 반환값은 내용 버전(해시), meta는 .npy 형식만 기록
+    fmt = artifact_format(path)
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+    columns = column_arrays(df)
+    version = content_version(columns)
+
+    if fmt == ".npy":
+        write_arrays(columns, path, version, meta)
+    elif fmt in (".arrow", ".parquet"):
+        _require_pyarrow(fmt)
+        typed = pd.DataFrame(columns)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if fmt == ".arrow":
+            feather.write_feather(typed, tmp_path, compression="uncompressed")
+        else:
+            typed.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    else:
+        raise ValueError(f"지원하지 않는 점수 산출물 형식: {path}")
+    return version
+
+def read_artifact(path: str):
+    # 컬럼 dict (.npy / .arrow는 읽기 전용 mmap, 숫자 컬럼은 복사 없음)
+    fmt = artifact_format(path)
+    if fmt == ".npy":
+        meta = read_artifact_meta(path)
+        return {
+            col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode="r", allow_pickle=False)
+            for col in meta["columns"]
+        }
+    if fmt == ".arrow":
+        _require_pyarrow(fmt)
+        table = feather.read_table(path, memory_map=True)
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name)
+            values = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                columns[name] = values.to_numpy(zero_copy_only=False).astype(str)
+            else:
+                columns[name] = values.to_numpy(zero_copy_only=False)
+        return columns
+    if fmt == ".parquet":
+        _require_pyarrow(fmt)
+        return column_arrays(pd.read_parquet(path))
+    raise ValueError(f"지원하지 않는 점수 산출물 형식: {path}")
+
+def read_artifact_frame(path: str):
+    return pd.DataFrame(read_artifact(path))
+
+def read_artifact_meta(path: str):
+    with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+def artifact_signature_path(path: str):
+    # 변경 감지용 파일 (.npy 묶음은 교체 시마다 새로 쓰이는 meta.json)
+    return os.path.join(path, "meta.json") if artifact_format(path) == ".npy" else path
+
+def file_version(path: str):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def artifact_version(path: str):
+    if artifact_format(path) == ".npy":
+        return read_artifact_meta(path)["version"]
+    return file_version(path)
+
+def artifact_is_current(path: str, source: str):
+    # 원본(CSV)에서 만든 산출물이 원본보다 오래됐거나 기록된 원본 해시가 다르면 False (원본을 직접 고친 경우)
+    if not os.path.exists(path):
+        return False
+    if not os.path.exists(source):
+        return True
+    if os.stat(artifact_signature_path(path)).st_mtime_ns < os.stat(source).st_mtime_ns:
+        return False
+    if artifact_format(path) == ".npy":
+        return read_artifact_meta(path).get("source_version") == file_version(source)
+    return True
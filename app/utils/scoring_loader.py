@@ -1,4 +1,171 @@
+import os
+import threading
+import time
+
+import numpy as np
 import pandas as pd
 
+from app.utils.score_artifacts import (
+    artifact_is_current, artifact_path, artifact_signature_path, artifact_version, file_version, is_artifact,
+    is_mmap_artifact, read_artifact
+)
+from app.utils.shared_arrays import attach_arrays, publish_arrays, read_shared_meta
+
+SCORE_CSV_PATH = "data/scoring/score/emd_with_all_scores.csv"
+SCORE_ARTIFACT_PATH = artifact_path("data/scoring/score/emd_with_all_scores")
+
+def default_score_data_path():
+    # 바이너리 컬럼 산출물(fetch_score / pipeline이 생성, 저장소에는 없음)이 CSV로 만든 최신 결과면 우선 사용
+    # 없거나 CSV보다 오래됐거나 CSV 해시가 다르면(CSV를 직접 고친 경우) CSV
+    if artifact_is_current(SCORE_ARTIFACT_PATH, SCORE_CSV_PATH):
+        return SCORE_ARTIFACT_PATH
+    if os.path.exists(SCORE_ARTIFACT_PATH):
+        print(f"[점수 산출물] {SCORE_ARTIFACT_PATH}가 {SCORE_CSV_PATH}와 다르므로 CSV 사용 (fetch_score로 재생성)")
+    return SCORE_CSV_PATH
+
+SCORE_DATA_PATH = os.getenv("SCORE_DATA_PATH") or default_score_data_path()
+
+# 동 점수 스냅샷을 워커 간 공유 mmap 배열로 사용할지 여부
+USE_SHARED_SNAPSHOT = os.getenv("USE_SHARED_SNAPSHOT", "true").lower() == "true"
+SHARED_SNAPSHOT_NAME = "dong_scores"
+
+# 파일 변경 여부 확인 주기 (초)
+RELOAD_CHECK_INTERVAL = float(os.getenv("SCORE_RELOAD_CHECK_INTERVAL", "5"))
+
+TEXT_COLUMNS = ["EMD_CD", "gu", "gu_code", "EMD_NM"]
+NUMERIC_COLUMNS = [
+    "area_m2", "centroid_lon", "centroid_lat",
+    "infra_score", "security_score", "transport_score", "quiet_score", "youth_score"
+]
+
+def numeric_columns(df: pd.DataFrame):
+    # 고정 컬럼 + density_score에 새로 등록된 시설 밀도 지수(*_score)
+    return NUMERIC_COLUMNS + [col for col in df.columns if col.endswith("_score") and col not in NUMERIC_COLUMNS]
+
 def load_score_data():
-    return pd.read_csv("data/scoring/score/emd_with_all_scores.csv", dtype={"EMD_CD": str})
\ No newline at end of file
+    return pd.read_csv(SCORE_CSV_PATH, dtype={"EMD_CD": str})
+
+
+class ScoreSnapshot:
+    # 동 점수 테이블의 읽기 전용 스냅샷 (컬럼별 NumPy 배열 + EMD_CD → 행 인덱스)
+    def __init__(self, columns: dict, version: str):
+        for values in columns.values():
+            values.setflags(write=False)
+        self.columns = columns
+        self.version = version
+        self.codes = columns["EMD_CD"]
+        self.index = {code: i for i, code in enumerate(self.codes)}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def row_of(self, dong_code: str):
+        return self.index.get(dong_code)
+
+
+def _file_signature(path):
+    stat = os.stat(artifact_signature_path(path) if is_artifact(path) else path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _file_hash(path):
+    if is_artifact(path):
+        return artifact_version(path)
+    return file_version(path)
+
+def read_score_snapshot(path=SCORE_DATA_PATH, version=None):
+    if is_artifact(path):
+        # 바이너리 산출물은 파싱 없이 컬럼 배열 그대로 (.npy / .arrow는 mmap)
+        columns = read_artifact(path)
+        return ScoreSnapshot(columns, version or _file_hash(path))
+    df = pd.read_csv(path, dtype={col: str for col in TEXT_COLUMNS})
+    columns = {col: df[col].fillna("").to_numpy(dtype=object) for col in TEXT_COLUMNS}
+    columns.update({col: df[col].to_numpy(dtype=np.float64) for col in numeric_columns(df)})
+    return ScoreSnapshot(columns, version or _file_hash(path))
+
+def publish_score_snapshot(snapshot: ScoreSnapshot, path=SCORE_DATA_PATH, signature=None):
+    # 텍스트 컬럼은 고정 길이 유니코드 배열로 바꿔 mmap 가능한 .npy로 게시
+    columns = {
+        col: values.astype(str) if col in TEXT_COLUMNS else values
+        for col, values in snapshot.columns.items()
+    }
+    meta = {"source": os.path.abspath(path), "signature": list(signature or _file_signature(path))}
+    publish_arrays(SHARED_SNAPSHOT_NAME, snapshot.version, columns, meta)
+
+def attach_score_snapshot(path=SCORE_DATA_PATH, signature=None, version=None):
+    # 게시된 스냅샷이 같은 파일(시그니처 또는 내용 해시 일치)이면 mmap으로 연결, 아니면 None
+    meta = read_shared_meta(SHARED_SNAPSHOT_NAME)
+    if meta is None or meta.get("source") != os.path.abspath(path):
+        return None
+    if not (
+        (signature is not None and tuple(meta.get("signature", ())) == tuple(signature)) or
+        (version is not None and meta["version"] == version)
+    ):
+        return None
+    columns, meta = attach_arrays(SHARED_SNAPSHOT_NAME, meta=meta)
+    if columns is None:
+        return None
+    return ScoreSnapshot(columns, meta["version"])
+
+def _publishes_shared_copy(path):
+    # .npy / .arrow 산출물은 원본 파일을 바로 mmap하므로 공유 메모리에 따로 게시하지 않음
+    return USE_SHARED_SNAPSHOT and not is_mmap_artifact(path)
+
+def prepare_shared_score_snapshot(path=SCORE_DATA_PATH):
+    # gunicorn 마스터에서 워커 fork 전에 한 번 게시 (워커는 기동 시 연결만 함)
+    if not _publishes_shared_copy(path):
+        return
+    signature = _file_signature(path)
+    if attach_score_snapshot(path, signature=signature) is None:
+        publish_score_snapshot(read_score_snapshot(path), path, signature)
+
+
+# (스냅샷, 파일 시그니처, 마지막 확인 시각) 튜플을 통째로 교체해 원자적으로 갱신
+_state = None
+_reload_lock = threading.Lock()
+
+def get_score_snapshot(path=SCORE_DATA_PATH) -> ScoreSnapshot:
+    state = _state
+    now = time.monotonic()
+    if state is not None and now - state[2] < RELOAD_CHECK_INTERVAL:
+        return state[0]
+
+    with _reload_lock:
+        return _refresh_snapshot(path, now)
+
+def _refresh_snapshot(path, now):
+    global _state
+    state = _state
+    if state is not None and now - state[2] < RELOAD_CHECK_INTERVAL:
+        return state[0]
+
+    try:
+        signature = _file_signature(path)
+    except FileNotFoundError:
+        # 산출물 디렉토리를 교체하는 순간이면 기존 스냅샷으로 응답
+        if state is not None:
+            return state[0]
+        raise
+    if state is not None and state[1] == signature:
+        _state = (state[0], signature, now)
+        return state[0]
+
+    # 다른 워커(또는 마스터)가 이미 게시한 스냅샷이면 파일을 다시 읽지 않고 연결
+    shared = _publishes_shared_copy(path)
+    snapshot = attach_score_snapshot(path, signature=signature) if shared else None
+    if snapshot is None:
+        # mtime이 바뀌어도 내용이 같으면 기존 스냅샷 유지
+        version = _file_hash(path)
+        if state is not None and state[0].version == version:
+            snapshot = state[0]
+        elif shared:
+            snapshot = attach_score_snapshot(path, version=version)
+            if snapshot is None:
+                publish_score_snapshot(read_score_snapshot(path, version), path, signature)
+                snapshot = attach_score_snapshot(path, version=version) or read_score_snapshot(path, version)
+        else:
+            snapshot = read_score_snapshot(path, version)
+    _state = (snapshot, signature, now)
+    return snapshot
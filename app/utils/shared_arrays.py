@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# 워커 간 공유 배열 저장 위치 (/dev/shm이 있으면 메모리 기반 파일시스템 사용)
+SHARED_ARRAY_DIR = os.getenv(
+    "SHARED_ARRAY_DIR",
+    "/dev/shm/pnusw19" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "pnusw19")
+)
+
+# 배열 묶음 하나 = 디렉토리 하나 ({name}-{version}/컬럼.npy + meta.json)
+# {name}.current 파일이 현재 버전 디렉토리를 가리킴 (교체는 os.replace로 원자적)
+
+def _current_pointer(name, directory):
+    return os.path.join(directory, f"{name}.current")
+
+def publish_arrays(name: str, version: str, columns: dict, meta: dict = None, directory=SHARED_ARRAY_DIR):
+    # 컬럼별 .npy 파일로 기록 후 현재 버전으로 지정, 이전 버전 디렉토리는 삭제
+    # (이미 mmap으로 열고 있는 워커는 삭제 후에도 기존 매핑을 계속 사용 가능)
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, f"{name}-{version}")
+    if not os.path.isdir(target):
+        staging = tempfile.mkdtemp(prefix=f".{name}-", dir=directory)
+        for col, values in columns.items():
+            np.save(os.path.join(staging, f"{col}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({**(meta or {}), "version": version, "columns": list(columns)}, f, ensure_ascii=False)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # 다른 프로세스가 같은 버전을 먼저 게시함
+            shutil.rmtree(staging, ignore_errors=True)
+
+    pointer = _current_pointer(name, directory)
+    staging_pointer = f"{pointer}.{os.getpid()}"
+    with open(staging_pointer, "w", encoding="utf-8") as f:
+        f.write(os.path.basename(target))
+    os.replace(staging_pointer, pointer)
+
+    for entry in os.listdir(directory):
+        if entry.startswith(f"{name}-") and entry != os.path.basename(target):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    return target
+
+def read_shared_meta(name: str, directory=SHARED_ARRAY_DIR):
+    # 현재 게시된 버전의 meta.json (없으면 None)
+    try:
+        with open(_current_pointer(name, directory), encoding="utf-8") as f:
+            target = os.path.join(directory, f.read().strip())
+        with open(os.path.join(target, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    meta["path"] = target
+    return meta
+
+def attach_arrays(name: str, directory=SHARED_ARRAY_DIR, meta: dict = None):
+    # 현재 버전 배열을 읽기 전용 mmap으로 연결 (복사 없음, 페이지 캐시를 워커끼리 공유)
+    # 반환: (컬럼 dict, meta) 또는 게시된 것이 없으면 (None, None)
+    meta = meta or read_shared_meta(name, directory)
+    if meta is None:
+        return None, None
+    try:
+        columns = {
+            col: np.load(os.path.join(meta["path"], f"{col}.npy"), mmap_mode="r", allow_pickle=False)
+            for col in meta["columns"]
+        }
+    except (OSError, ValueError):
+        # 읽는 도중 새 버전으로 교체되어 디렉토리가 삭제된 경우
+        return None, None
+    return columns, meta
@@ -1,6 +1,8 @@
+import argparse
 import asyncio
 import asyncpg
 import json
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 import os
@@ -8,6 +10,25 @@ from tqdm.asyncio import tqdm
 
 load_dotenv()
 
+# 한 번에 임시 테이블로 COPY하는 매물 수 (파일 크기와 무관하게 메모리 사용량 일정)
+BATCH_SIZE = int(os.getenv("PROPERTY_LOAD_BATCH_SIZE", "5000"))
+
+# 중복 매물 판단 기준 (data/migrations/006의 property_number UNIQUE 인덱스)
+# 구 단위 파티션(optional/property_partition_by_gu.sql) 적용 후에는 "property_number, administrative_code"
+PROPERTY_CONFLICT_TARGET = os.getenv("PROPERTY_CONFLICT_TARGET", "property_number")
+
+# insert_property_row의 값 순서와 같은 컬럼 목록 (location은 WKT 문자열로 받아 변환)
+PROPERTY_COLUMNS = [
+    "monthly_rent_cost", "deposit", "area", "floor", "total_floor", "room_type",
+    "property_type", "features", "direction", "location", "description",
+    "agent_name", "agent_office", "agent_phone", "agent_address", "agent_registration_no",
+    "property_number", "administrative_code", "property_name", "transaction_type",
+    "confirmation_type", "supply_area", "property_confirmation_date",
+    "main_image_url", "maintenance_cost", "rooms_bathrooms", "duplex",
+    "available_move_in_date"
+]
+STAGING_COLUMNS = ["id"] + ["location_wkt" if col == "location" else col for col in PROPERTY_COLUMNS]
+
 def safe_get(d, key, default=None):
     return d.get(key) if d.get(key) not in [None, ""] else default
 
@@ -17,29 +38,8 @@ def safe_date(date_str):
     except:
         return None
 
-async def insert_property_row(conn, prop):
-    query = """
-    INSERT INTO property (
-        monthly_rent_cost, deposit, area, floor, total_floor, room_type,
-        property_type, features, direction, location, description,
-        agent_name, agent_office, agent_phone, agent_address, agent_registration_no,
-        property_number, administrative_code, property_name, transaction_type,
-        confirmation_type, supply_area, property_confirmation_date,
-        main_image_url, maintenance_cost, rooms_bathrooms, duplex,
-        available_move_in_date
-    ) VALUES (
-        $1, $2, $3, $4, $5, $6,
-        $7, $8, $9, ST_GeomFromText($10, 4326), $11,
-        $12, $13, $14, $15, $16,
-        $17, $18, $19, $20,
-        $21, $22, $23,
-        $24, $25, $26, $27,
-        $28
-    ) ON CONFLICT (property_number) DO NOTHING
-    RETURNING id;
-    """
-
-    values = (
+def property_values(prop):
+    return (
         safe_get(prop, "monthly_rent_cost", 0),
         safe_get(prop, "deposit", 0),
         safe_get(prop, "area"),
@@ -70,76 +70,212 @@ async def insert_property_row(conn, prop):
         safe_get(prop, "available_move_in_date")
     )
 
-    row = await conn.fetchrow(query, *values)
+def tag_names(tags):
+    return [t.strip() for t in tags.split(",") if t.strip()] if tags else []
+
+def photo_rows(photos):
+    # (image_url, image_type, order), 첫 번째 사진이 대표 이미지
+    return [
+        (photo_url, "main" if idx == 0 else "sub", idx + 1)
+        for idx, photo_url in enumerate(photos or []) if photo_url
+    ]
+
+async def insert_property_row(conn, prop):
+    # 충돌 대상을 지정해야 중복 매물만 건너뛰고 다른 제약 위반은 예외로 드러남
+    query = f"""
+    INSERT INTO property (
+        monthly_rent_cost, deposit, area, floor, total_floor, room_type,
+        property_type, features, direction, location, description,
+        agent_name, agent_office, agent_phone, agent_address, agent_registration_no,
+        property_number, administrative_code, property_name, transaction_type,
+        confirmation_type, supply_area, property_confirmation_date,
+        main_image_url, maintenance_cost, rooms_bathrooms, duplex,
+        available_move_in_date
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6,
+        $7, $8, $9, ST_GeomFromText($10, 4326), $11,
+        $12, $13, $14, $15, $16,
+        $17, $18, $19, $20,
+        $21, $22, $23,
+        $24, $25, $26, $27,
+        $28
+    ) ON CONFLICT ({PROPERTY_CONFLICT_TARGET}) DO NOTHING
+    RETURNING id;
+    """
+
+    row = await conn.fetchrow(query, *property_values(prop))
     return row["id"] if row else None
 
 async def insert_tags_and_photos(conn, property_id, tags, photos):
-    if tags:
-        for tag in [t.strip() for t in tags.split(",") if t.strip()]:
-            await conn.execute(
-                "INSERT INTO property_tag (property_id, name) VALUES ($1, $2);", property_id, tag
-            )
-    if photos:
-        for idx, photo_url in enumerate(photos):
-            if not photo_url:
+    for tag in tag_names(tags):
+        await conn.execute(
+            "INSERT INTO property_tag (property_id, name) VALUES ($1, $2);", property_id, tag
+        )
+    for photo_url, image_type, order in photo_rows(photos):
+        await conn.execute(
+            """
+            INSERT INTO property_photo (property_id, image_url, image_type, "order")
+            VALUES ($1, $2, $3, $4);
+            """, property_id, photo_url, image_type, order
+        )
+
+async def process_single_property(conn, prop):
+    # 묶음 적재가 실패했을 때 어떤 매물이 문제인지 찾기 위한 한 건씩 적재
+    try:
+        async with conn.transaction():
+            property_id = await insert_property_row(conn, prop)
+            if property_id:
+                await insert_tags_and_photos(conn, property_id, prop.get("tags", ""), prop.get("photo", []))
+                return "success"
+            return "skipped"
+    except Exception as e:
+        print(f"⚠️ [삽입 실패] property_number={prop.get('property_number')} → {e}")
+        return "fail"
+
+def iter_batches(file_path, max_lines=None, batch_size=BATCH_SIZE):
+    # JSONL을 한 줄씩 읽어 batch_size개씩 묶어서 반환 (파일 전체를 메모리에 올리지 않음)
+    batch = []
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if max_lines is not None and line_no >= max_lines:
+                break
+            line = line.strip()
+            if not line:
                 continue
-            image_type = "main" if idx == 0 else "sub"
-            order = idx + 1
-            await conn.execute(
-                """
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+async def check_conflict_target(conn):
+    # ON CONFLICT 대상과 정확히 같은 컬럼의 UNIQUE 인덱스가 없으면 모든 묶음이 실패하므로 시작 전에 중단
+    columns = sorted(col.strip() for col in PROPERTY_CONFLICT_TARGET.split(","))
+    exists = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_index i
+            WHERE i.indrelid = 'property'::regclass AND i.indisunique AND i.indpred IS NULL
+                AND (
+                    SELECT array_agg(a.attname::text ORDER BY a.attname::text)
+                    FROM pg_attribute a
+                    WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+                ) = $1::text[]
+        );
+    """, columns)
+    if not exists:
+        raise RuntimeError(
+            f"property ({', '.join(columns)})에 UNIQUE 인덱스가 없습니다. "
+            "python -m data.migrations.migrate로 006_property_number_unique.sql을 적용하거나 "
+            "PROPERTY_CONFLICT_TARGET을 실제 UNIQUE 제약 컬럼으로 설정하세요."
+        )
+
+async def create_staging_tables(conn):
+    # 커밋할 때마다 비워지는 임시 테이블 (타입은 실제 테이블과 동일, 제약 조건 없음)
+    select_cols = ", ".join(
+        "ST_AsText(location) AS location_wkt" if col == "location" else col for col in PROPERTY_COLUMNS
+    )
+    await conn.execute(f"""
+        CREATE TEMP TABLE property_staging ON COMMIT DELETE ROWS AS
+            SELECT id, {select_cols} FROM property WITH NO DATA;
+        CREATE TEMP TABLE property_tag_staging ON COMMIT DELETE ROWS AS
+            SELECT property_id, name FROM property_tag WITH NO DATA;
+        CREATE TEMP TABLE property_photo_staging ON COMMIT DELETE ROWS AS
+            SELECT property_id, image_url, image_type, "order" FROM property_photo WITH NO DATA;
+    """)
+
+async def load_batch(conn, batch):
+    # 묶음 하나를 한 트랜잭션으로 적재, 반환값은 새로 들어간 매물 수 (나머지는 중복 스킵)
+    # id는 미리 발급해 두고 태그 / 사진 행에 같은 id를 넣어 COPY → 새로 들어간 매물의 태그 / 사진만 복사
+    async with conn.transaction():
+        ids = [row[0] for row in await conn.fetch(
+            "SELECT nextval(pg_get_serial_sequence('property', 'id')) FROM generate_series(1, $1);", len(batch)
+        )]
+        await conn.copy_records_to_table(
+            "property_staging", columns=STAGING_COLUMNS,
+            records=[(property_id, *property_values(prop)) for property_id, prop in zip(ids, batch)],
+        )
+        await conn.copy_records_to_table(
+            "property_tag_staging", columns=["property_id", "name"],
+            records=[
+                (property_id, tag)
+                for property_id, prop in zip(ids, batch) for tag in tag_names(prop.get("tags", ""))
+            ],
+        )
+        await conn.copy_records_to_table(
+            "property_photo_staging", columns=["property_id", "image_url", "image_type", "order"],
+            records=[
+                (property_id, *photo)
+                for property_id, prop in zip(ids, batch) for photo in photo_rows(prop.get("photo", []))
+            ],
+        )
+
+        insert_cols = ", ".join(["id"] + PROPERTY_COLUMNS)
+        select_cols = ", ".join(
+            "ST_GeomFromText(location_wkt, 4326)" if col == "location_wkt" else col for col in STAGING_COLUMNS
+        )
+        # 파일 순서(id 순)대로 넣어 같은 묶음 안의 중복은 먼저 나온 매물이 남음
+        return await conn.fetchval(f"""
+            WITH inserted AS (
+                INSERT INTO property ({insert_cols})
+                SELECT {select_cols} FROM property_staging ORDER BY id
+                ON CONFLICT ({PROPERTY_CONFLICT_TARGET}) DO NOTHING
+                RETURNING id
+            ), tags AS (
+                INSERT INTO property_tag (property_id, name)
+                SELECT t.property_id, t.name FROM property_tag_staging t JOIN inserted i ON i.id = t.property_id
+            ), photos AS (
                 INSERT INTO property_photo (property_id, image_url, image_type, "order")
-                VALUES ($1, $2, $3, $4);
-                """, property_id, photo_url, image_type, order
+                SELECT p.property_id, p.image_url, p.image_type, p."order"
+                FROM property_photo_staging p JOIN inserted i ON i.id = p.property_id
             )
+            SELECT count(*) FROM inserted;
+        """)
 
-async def process_single_property(pool, prop, sem, progress):
-    async with sem:
-        async with pool.acquire() as conn:
-            try:
-                property_id = await insert_property_row(conn, prop)
-                if property_id:
-                    await insert_tags_and_photos(conn, property_id, prop.get("tags", ""), prop.get("photo", []))
-                    status = "success"
-                else:
-                    status = "skipped"
-            except Exception as e:
-                print(f"⚠️ [삽입 실패] property_number={prop.get('property_number')} → {e}")
-                status = "fail"
-            progress.update(1)
-            return status
-
-async def load_jsonl_to_postgres(file_path, max_lines=None, concurrency=10):
-    pool = await asyncpg.create_pool(
+async def load_jsonl_to_postgres(file_path, max_lines=None, batch_size=BATCH_SIZE):
+    conn = await asyncpg.connect(
         host=os.getenv("DB_HOST"),
         database=os.getenv("DB_NAME"),
         user=os.getenv("DB_USER"),
         password=os.getenv("DB_PASSWORD"),
-        min_size=5,
-        max_size=concurrency
     )
+    counts = {"success": 0, "fail": 0, "skipped": 0}
+    started = time.perf_counter()
+    progress = tqdm(desc="📦 매물 일괄 적재 중", unit="건")
+    try:
+        await check_conflict_target(conn)
+        await create_staging_tables(conn)
+        for batch in iter_batches(file_path, max_lines, batch_size):
+            try:
+                inserted = await load_batch(conn, batch)
+                counts["success"] += inserted
+                counts["skipped"] += len(batch) - inserted
+            except Exception as e:
+                # 묶음 전체가 롤백되므로 한 건씩 다시 적재하며 실패한 매물만 골라냄
+                print(f"⚠️ [묶음 적재 실패] {len(batch)}건 → 한 건씩 재시도: {e}")
+                for prop in batch:
+                    counts[await process_single_property(conn, prop)] += 1
+            progress.update(len(batch))
+    finally:
+        progress.close()
+        await conn.close()
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = list(f)
-        if max_lines is not None:
-            lines = lines[:max_lines]
-        props = [json.loads(line.strip()) for line in lines]
-
-    sem = asyncio.Semaphore(concurrency)
-    progress = tqdm(total=len(props), desc="📦 비동기 매물 적재 중", unit="건")
-    tasks = [process_single_property(pool, prop, sem, progress) for prop in props]
-    results = await asyncio.gather(*tasks)
-
-    await pool.close()
-    progress.close()
-
-    success_count = results.count("success")
-    fail_count = results.count("fail")
-    skipped_count = results.count("skipped")
-    print(f"\n✅ 전체 데이터 적재 완료.")
-    print(f"   - 총 성공: {success_count}건")
-    print(f"   - 총 실패: {fail_count}건")
-    print(f"   - 중복 스킵: {skipped_count}건")
-
-# 실행
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ 전체 데이터 적재 완료. ({total}건, {elapsed:.1f}초, {total / elapsed:,.0f}건/초)")
+    print(f"   - 총 성공: {counts['success']}건")
+    print(f"   - 총 실패: {counts['fail']}건")
+    print(f"   - 중복 스킵: {counts['skipped']}건")
+    return counts
+
+# 실행 (프로젝트 루트에서)
+#   python -m data.db_data_loader                                  → progress.jsonl 전체 적재
+#   python -m data.db_data_loader --file x.jsonl --max-lines 1000  → 앞 1000줄만
+#   python -m data.db_data_loader --batch-size 20000               → 묶음 크기 변경
 if __name__ == "__main__":
-    asyncio.run(load_jsonl_to_postgres("data/property_crawler/progress.jsonl"))
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="data/property_crawler/progress.jsonl")
+    parser.add_argument("--max-lines", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(load_jsonl_to_postgres(args.file, args.max_lines, args.batch_size))
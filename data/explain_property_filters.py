@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import text
+
+from app.db.session import async_session
+from app.models.user_input import Budget
+from app.services.recommender import build_dong_property_count_query
+from app.utils.scoring_loader import read_score_snapshot
+
+# /recommend/area 매물 집계 쿼리의 실행 계획 비교: 정규식 / LIKE 조건 vs 정규화 컬럼 (data/migrations/003)
+# 사용: python -m data.explain_property_filters [--runs 5] [--plan]
+
+BENCHMARK_BUDGETS = {
+    "원룸 월세 남향": Budget(transaction_type=["월세"], room_type=["원룸"], direction=["남"]),
+    "투룸 전세": Budget(transaction_type=["전세"], room_type=["투룸"], direction=[]),
+    "쓰리룸 이상": Budget(room_type=["쓰리룸"], direction=[]),
+    "원룸 오피스텔 동/남향": Budget(
+        transaction_type=["월세"], property_type=["오피스텔"], room_type=["원룸"], direction=["동", "남"]
+    ),
+}
+
+def plan_nodes(plan, depth=0):
+    # 실행 계획 트리 → "노드 유형 (인덱스명)" 목록
+    label = plan["Node Type"]
+    if "Index Name" in plan:
+        label += f" ({plan['Index Name']})"
+    nodes = [("  " * depth) + label]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child, depth + 1))
+    return nodes
+
+async def explain(db, stmt):
+    compiled = stmt.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    result = await db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}"))
+    raw = result.scalar()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]
+
+async def main(runs, show_plan):
+    dong_codes = read_score_snapshot()["EMD_CD"].tolist()
+    async with async_session() as db:
+        for name, budget in BENCHMARK_BUDGETS.items():
+            print(f"\n=== {name} ===")
+            for normalized in (False, True):
+                stmt = build_dong_property_count_query(budget, dong_codes, normalized=normalized)
+                timings = []
+                for _ in range(runs):
+                    result = await explain(db, stmt)
+                    timings.append(result["Execution Time"])
+                label = "정규화 컬럼" if normalized else "정규식 / LIKE"
+                timings.sort()
+                print(f"[{label}] 중앙값 {timings[len(timings) // 2]:.2f}ms, 최소 {timings[0]:.2f}ms")
+                if show_plan:
+                    print("\n".join(plan_nodes(result["Plan"])))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--plan", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.plan))
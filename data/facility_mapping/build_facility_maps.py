@@ -0,0 +1,166 @@
+import argparse
+import asyncio
+import asyncpg
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from dotenv import load_dotenv
+from scipy.spatial import cKDTree
+
+from app.utils.commute import _radii_of_curvature_km, distance_km
+
+load_dotenv()
+
+# 매물-주변 시설(1km 이내, 기본값은 기존 스케줄러와 같은 ±0.01도 상자 안) 매핑 일괄 생성
+# 매물 / 시설 좌표를 한 번씩만 읽어 KD-tree로 쌍을 찾고, COPY로 매핑 테이블에 적재
+# (기존 FacilityMappingScheduler의 매물별 ST_DWithin 조인을 대체)
+
+# 매핑 유형 → (매핑 테이블, 시설 id 컬럼, 시설 테이블)
+FACILITY_MAPS = {
+    "cctv": ("property_cctv_map", "cctv_id", "cctv"),
+    "infra": ("property_rest_food_permit_map", "rest_food_permit_id", "rest_food_permit"),
+    "bus": ("property_bus_stop_map", "bus_stop_id", "bus_stop"),
+    "subway": ("property_subway_map", "subway_id", "subway"),
+}
+
+# ST_DWithin(geography, 1000)과 같은 기준 (경계 포함)
+MAPPING_RADIUS_M = 1000
+
+# 기존 스케줄러(server/.../*Repository.java)의 `시설 && ST_Expand(매물, 0.01)` 조건: 경도 / 위도 차이가 모두 0.01도 이내
+# 서울 위도에서 경도 0.01도 ≈ 880m라 동서 방향은 1km가 아닌 약 880m까지만 매핑됨 → 기존 매물의 시설 개수를 유지하기 위해 같은 상자 적용
+# 0이면 상자 조건 없이 실제 1km 반경 (기존 매핑과 개수가 달라지므로 --full로 전체 재계산 후 python -m data.facility_summary --rescore)
+MAPPING_BOX_DEG = float(os.getenv("FACILITY_MAP_BOX_DEG", "0.01"))
+
+# 평면 투영 오차를 흡수하기 위한 후보 검색 반경 여유 비율 (최종 판정은 타원체 거리)
+SEARCH_MARGIN = 1.02
+
+CHUNK_SIZE = 2000
+
+def project_m(lons, lats, origin):
+    # origin(경도, 위도) 기준 타원체 곡률반경 평면 투영 (단위: m), 서울 범위에서 거리 비율 오차 1% 미만
+    lon0, lat0 = origin
+    lat_rad = np.radians(lats)
+    m0, _ = _radii_of_curvature_km(np.radians(lat0))
+    _, n = _radii_of_curvature_km(lat_rad)
+    x = n * 1000 * np.cos(lat_rad) * np.radians(lons - lon0)
+    y = m0 * 1000 * np.radians(lats - lat0)
+    return np.column_stack([x, y])
+
+_facility = {}
+
+def init_worker(facility_ids, facility_lons, facility_lats, origin):
+    # 워커 프로세스마다 시설 트리를 한 번만 생성
+    _facility["ids"] = facility_ids
+    _facility["lons"] = facility_lons
+    _facility["lats"] = facility_lats
+    _facility["origin"] = origin
+    _facility["tree"] = cKDTree(project_m(facility_lons, facility_lats, origin))
+
+def map_chunk(property_ids, property_lons, property_lats, radius_m=MAPPING_RADIUS_M, box_deg=MAPPING_BOX_DEG):
+    # 매물 묶음의 (매물 id, 시설 id, 거리 m) 배열
+    tree = cKDTree(project_m(property_lons, property_lats, _facility["origin"]))
+    pairs = tree.sparse_distance_matrix(_facility["tree"], radius_m * SEARCH_MARGIN, output_type="ndarray")
+    i, j = pairs["i"], pairs["j"]
+    dist_m = distance_km(property_lats[i], property_lons[i], _facility["lats"][j], _facility["lons"][j]) * 1000
+    within = dist_m <= radius_m
+    if box_deg:
+        within &= np.abs(_facility["lons"][j] - property_lons[i]) <= box_deg
+        within &= np.abs(_facility["lats"][j] - property_lats[i]) <= box_deg
+    return property_ids[i[within]], _facility["ids"][j[within]], dist_m[within]
+
+async def fetch_points(conn, query):
+    rows = await conn.fetch(query)
+    ids = np.array([r["id"] for r in rows], dtype=np.int64)
+    lons = np.array([r["lon"] for r in rows], dtype=np.float64)
+    lats = np.array([r["lat"] for r in rows], dtype=np.float64)
+    return ids, lons, lats
+
+def property_query(map_table, full):
+    # full이 아니면 아직 매핑이 하나도 없는 매물만 (스케줄러와 같은 대상)
+    query = "SELECT p.id, ST_X(p.location) AS lon, ST_Y(p.location) AS lat FROM property p WHERE p.location IS NOT NULL"
+    if not full:
+        query += f" AND NOT EXISTS (SELECT 1 FROM {map_table} m WHERE m.property_id = p.id)"
+    return query
+
+async def build_facility_map(conn, kind, full=False, workers=None, chunk_size=CHUNK_SIZE):
+    map_table, facility_column, facility_table = FACILITY_MAPS[kind]
+    started = time.perf_counter()
+    property_ids, property_lons, property_lats = await fetch_points(conn, property_query(map_table, full))
+    facility_ids, facility_lons, facility_lats = await fetch_points(conn, f"""
+        SELECT id, ST_X(location) AS lon, ST_Y(location) AS lat FROM {facility_table} WHERE location IS NOT NULL
+    """)
+    if len(property_ids) == 0 or len(facility_ids) == 0:
+        print(f"[{kind}] 대상 매물 {len(property_ids)}건, 시설 {len(facility_ids)}건 → 건너뜀")
+        return 0
+    origin = (float(np.median(property_lons)), float(np.median(property_lats)))
+
+    # 대상 매물의 기존 매핑을 지우고 새로 적재 (한 트랜잭션, 재실행해도 결과 동일)
+    pair_count = 0
+    async with conn.transaction():
+        await conn.execute(f"""
+            CREATE TEMP TABLE facility_map_staging (
+                property_id BIGINT, facility_id BIGINT, distance_meters DOUBLE PRECISION
+            ) ON COMMIT DROP
+        """)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker,
+            initargs=(facility_ids, facility_lons, facility_lats, origin)
+        ) as pool:
+            loop = asyncio.get_running_loop()
+            futures = [
+                loop.run_in_executor(
+                    pool, map_chunk,
+                    property_ids[s:s + chunk_size], property_lons[s:s + chunk_size], property_lats[s:s + chunk_size]
+                )
+                for s in range(0, len(property_ids), chunk_size)
+            ]
+            for future in asyncio.as_completed(futures):
+                pids, fids, dists = await future
+                if len(pids):
+                    await conn.copy_records_to_table(
+                        "facility_map_staging",
+                        records=zip(pids.tolist(), fids.tolist(), dists.tolist()),
+                    )
+                    pair_count += len(pids)
+
+        await conn.execute(f"DELETE FROM {map_table} WHERE property_id = ANY($1::bigint[])", property_ids.tolist())
+        await conn.execute(f"""
+            INSERT INTO {map_table} (property_id, {facility_column}, distance_meters)
+            SELECT property_id, facility_id, distance_meters FROM facility_map_staging
+            ON CONFLICT DO NOTHING
+        """)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ [{kind}] 매물 {len(property_ids)}건 × 시설 {len(facility_ids)}건 → {pair_count}쌍 "
+        f"({elapsed:.1f}초, {pair_count / elapsed:,.0f}쌍/초)"
+    )
+    return pair_count
+
+async def main(kinds, full=False, workers=None, chunk_size=CHUNK_SIZE):
+    conn = await asyncpg.connect(
+        host=os.getenv("DB_HOST"),
+        database=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+    )
+    try:
+        for kind in kinds:
+            await build_facility_map(conn, kind, full, workers, chunk_size)
+    finally:
+        await conn.close()
+
+# 실행 (프로젝트 루트에서, 이후 python -m data.facility_summary로 요약 갱신)
+#   python -m data.facility_mapping.build_facility_maps              → 매핑이 없는 매물만
+#   python -m data.facility_mapping.build_facility_maps --full       → 전체 매물 재계산
+#   python -m data.facility_mapping.build_facility_maps --kind cctv  → 특정 유형만
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kind", choices=list(FACILITY_MAPS), action="append")
+    parser.add_argument("--full", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.kind or list(FACILITY_MAPS), args.full, args.workers, args.chunk_size))
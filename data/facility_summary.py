@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import asyncpg
+import os
+import time
+from dotenv import load_dotenv
+
+from app.services.recommender import snapshot_dong_scores
+from app.services.scoring_engine import PROPERTY_SCORE_VERSION, static_property_scores
+from app.utils.scoring_loader import read_score_snapshot
+
+load_dotenv()
+
+# 시설 유형별 매핑 테이블 (요약 컬럼 접두어 → 테이블명)
+FACILITY_MAP_TABLES = {
+    "cctv": "property_cctv_map",
+    "infra": "property_rest_food_permit_map",
+    "bus": "property_bus_stop_map",
+    "subway": "property_subway_map",
+}
+
+def build_refresh_query():
+    # 변경 목록에서 batch 크기만큼 꺼내 해당 매물만 다시 집계 후 upsert
+    agg_ctes = []
+    columns = []
+    joins = []
+    updates = []
+    for name, table in FACILITY_MAP_TABLES.items():
+        agg_ctes.append(f"""
+        {name}_agg AS (
+            SELECT property_id, count(*) AS cnt, avg(distance_meters) AS avg_dist
+            FROM {table}
+            WHERE property_id IN (SELECT property_id FROM targets)
+            GROUP BY property_id
+        )""")
+        columns.append(f"COALESCE({name}_agg.cnt, 0), {name}_agg.avg_dist")
+        joins.append(f"LEFT JOIN {name}_agg ON {name}_agg.property_id = targets.property_id")
+        updates.append(f"{name}_count = EXCLUDED.{name}_count, {name}_avg_distance = EXCLUDED.{name}_avg_distance")
+
+    return f"""
+    WITH picked AS (
+        DELETE FROM property_facility_summary_dirty
+        WHERE property_id IN (
+            SELECT property_id FROM property_facility_summary_dirty
+            LIMIT $1 FOR UPDATE SKIP LOCKED
+        )
+        RETURNING property_id
+    ),
+    targets AS (
+        SELECT p.id AS property_id FROM property p JOIN picked ON picked.property_id = p.id
+    ),{",".join(agg_ctes)}
+    INSERT INTO property_facility_summary (
+        property_id,
+        {", ".join(f"{name}_count, {name}_avg_distance" for name in FACILITY_MAP_TABLES)},
+        refreshed_at
+    )
+    SELECT targets.property_id, {", ".join(columns)}, now()
+    FROM targets
+    {" ".join(joins)}
+    ON CONFLICT (property_id) DO UPDATE SET
+        {", ".join(updates)},
+        refreshed_at = EXCLUDED.refreshed_at,
+        score_version = NULL
+    """
+
+async def refresh_facility_summary(conn, batch_size=5000):
+    # 변경 목록이 빌 때까지 batch 단위로 갱신, 갱신한 매물 수 반환
+    query = build_refresh_query()
+    total = 0
+    while True:
+        async with conn.transaction():
+            status = await conn.execute(query, batch_size)
+            remaining = await conn.fetchval("SELECT EXISTS (SELECT 1 FROM property_facility_summary_dirty);")
+        total += int(status.split()[-1])
+        if not remaining:
+            return total
+
+async def refresh_static_scores(conn, batch_size=5000):
+    # score_version이 현재 값과 다른 매물(시설 집계 변경, 공식/동 점수 변경)만 정적 점수 재계산
+    scores = read_score_snapshot()
+    score_version = f"{PROPERTY_SCORE_VERSION}:{scores.version}"
+    dong_scores = {}
+    total = 0
+    while True:
+        rows = await conn.fetch("""
+            SELECT s.property_id, p.administrative_code,
+                   s.infra_count, s.infra_avg_distance, s.cctv_count, s.cctv_avg_distance,
+                   s.bus_count, s.bus_avg_distance, s.subway_count, s.subway_avg_distance
+            FROM property_facility_summary s
+            JOIN property p ON p.id = s.property_id
+            WHERE s.score_version IS DISTINCT FROM $1
+            LIMIT $2;
+        """, score_version, batch_size)
+        if not rows:
+            return total
+
+        ids, infra, security, transport, quiet = [], [], [], [], []
+        for r in rows:
+            code = r["administrative_code"]
+            if code not in dong_scores:
+                dong_scores[code] = snapshot_dong_scores(scores, code) or {}
+            dong = dong_scores[code]
+            static = static_property_scores(
+                r["infra_count"], r["infra_avg_distance"], r["cctv_count"], r["cctv_avg_distance"],
+                r["bus_count"], r["bus_avg_distance"], r["subway_count"], r["subway_avg_distance"],
+                infra_dong_score=dong.get("infra_score", 0),
+                security_dong_score=dong.get("security_score", 0),
+                transport_dong_score=dong.get("transport_score", 0),
+                quiet_dong_score=dong.get("quiet_score", 0),
+            )
+            ids.append(r["property_id"])
+            infra.append(static["infra_score"])
+            security.append(static["security_score"])
+            transport.append(static["transport_score"])
+            quiet.append(static["quiet_score"])
+
+        await conn.execute("""
+            UPDATE property_facility_summary s
+            SET infra_score = v.infra_score,
+                security_score = v.security_score,
+                transport_score = v.transport_score,
+                quiet_score = v.quiet_score,
+                score_version = $6
+            FROM unnest($1::bigint[], $2::float8[], $3::float8[], $4::float8[], $5::float8[])
+                AS v(property_id, infra_score, security_score, transport_score, quiet_score)
+            WHERE s.property_id = v.property_id;
+        """, ids, infra, security, transport, quiet, score_version)
+        total += len(ids)
+
+async def invalidate_static_scores(conn):
+    # 점수 공식 변경 시 전체 재계산 (backfill)
+    await conn.execute("UPDATE property_facility_summary SET score_version = NULL;")
+
+async def mark_all_dirty(conn):
+    # 전체 재구축: 모든 매물을 변경 목록에 등록
+    await conn.execute("""
+        INSERT INTO property_facility_summary_dirty (property_id)
+        SELECT id FROM property
+        ON CONFLICT DO NOTHING;
+    """)
+
+async def main(full=False, rescore=False, batch_size=5000):
+    conn = await asyncpg.connect(
+        host=os.getenv("DB_HOST"),
+        database=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+    )
+    try:
+        if full:
+            await mark_all_dirty(conn)
+        if rescore:
+            await invalidate_static_scores(conn)
+        started = time.perf_counter()
+        refreshed = await refresh_facility_summary(conn, batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"✅ 시설 요약 갱신 완료: {refreshed}건 ({elapsed:.1f}초)")
+
+        started = time.perf_counter()
+        rescored = await refresh_static_scores(conn, batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"✅ 정적 점수 갱신 완료: {rescored}건 ({elapsed:.1f}초)")
+    finally:
+        await conn.close()
+
+# 실행 (마이그레이션 001, 002 적용 후, 프로젝트 루트에서)
+#   python -m data.facility_summary            → 마지막 실행 이후 변경된 매물만 갱신
+#   python -m data.facility_summary --full     → 전체 재구축
+#   python -m data.facility_summary --rescore  → 점수 공식 변경 후 정적 점수 전체 재계산
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true")
+    parser.add_argument("--rescore", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(full=args.full, rescore=args.rescore, batch_size=args.batch_size))
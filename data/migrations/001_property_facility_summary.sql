@@ -0,0 +1,80 @@
+-- 매물별 주변 시설 요약 (시설 유형별 개수 / 평균 거리)
+CREATE TABLE IF NOT EXISTS property_facility_summary (
+    property_id BIGINT PRIMARY KEY REFERENCES property(id) ON DELETE CASCADE,
+    cctv_count INTEGER NOT NULL DEFAULT 0,
+    cctv_avg_distance DOUBLE PRECISION,
+    infra_count INTEGER NOT NULL DEFAULT 0,
+    infra_avg_distance DOUBLE PRECISION,
+    bus_count INTEGER NOT NULL DEFAULT 0,
+    bus_avg_distance DOUBLE PRECISION,
+    subway_count INTEGER NOT NULL DEFAULT 0,
+    subway_avg_distance DOUBLE PRECISION,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- 마지막 갱신 이후 변경된 매물 목록 (갱신 시 비워짐)
+CREATE TABLE IF NOT EXISTS property_facility_summary_dirty (
+    property_id BIGINT PRIMARY KEY
+);
+
+CREATE OR REPLACE FUNCTION mark_facility_summary_dirty_new_rows() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO property_facility_summary_dirty (property_id)
+    SELECT DISTINCT property_id FROM new_rows
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION mark_facility_summary_dirty_old_rows() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO property_facility_summary_dirty (property_id)
+    SELECT DISTINCT property_id FROM old_rows
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION mark_facility_summary_dirty_property() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO property_facility_summary_dirty (property_id)
+    VALUES (NEW.id)
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 매핑 테이블 변경 시 (문장 단위 트리거, 대량 적재에도 한 번만 실행)
+DO $$
+DECLARE
+    map_table TEXT;
+BEGIN
+    FOREACH map_table IN ARRAY ARRAY[
+        'property_cctv_map', 'property_rest_food_permit_map', 'property_bus_stop_map', 'property_subway_map'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', map_table || '_summary_ins', map_table);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION mark_facility_summary_dirty_new_rows()',
+            map_table || '_summary_ins', map_table
+        );
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', map_table || '_summary_del', map_table);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION mark_facility_summary_dirty_old_rows()',
+            map_table || '_summary_del', map_table
+        );
+    END LOOP;
+END;
+$$;
+
+-- 신규 매물 / 위치 변경 매물
+DROP TRIGGER IF EXISTS property_summary_dirty ON property;
+CREATE TRIGGER property_summary_dirty
+    AFTER INSERT OR UPDATE OF location ON property
+    FOR EACH ROW EXECUTE FUNCTION mark_facility_summary_dirty_property();
+
+-- 최초 구축: 전체 매물을 갱신 대상으로 등록
+INSERT INTO property_facility_summary_dirty (property_id)
+SELECT id FROM property
+ON CONFLICT DO NOTHING;
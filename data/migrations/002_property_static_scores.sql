@@ -0,0 +1,8 @@
+-- 사용자와 무관한 매물별 정적 점수 (시설 집계 + 동 점수 기반)
+-- score_version: "<점수 공식 버전>:<동 점수 스냅샷 해시>", 시설 집계가 바뀌면 NULL로 초기화
+ALTER TABLE property_facility_summary
+    ADD COLUMN IF NOT EXISTS infra_score DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS security_score DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS transport_score DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS quiet_score DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS score_version TEXT;
@@ -0,0 +1,50 @@
+-- 방 / 욕실 개수, 방향을 정수 컬럼으로 정규화 (정규식 / LIKE 대신 인덱스 가능한 비교)
+-- 규칙은 app/utils/listing_attributes.py와 동일
+ALTER TABLE property
+    ADD COLUMN IF NOT EXISTS room_count SMALLINT,
+    ADD COLUMN IF NOT EXISTS bathroom_count SMALLINT,
+    ADD COLUMN IF NOT EXISTS direction_mask SMALLINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION property_direction_mask(direction TEXT) RETURNS SMALLINT AS $$
+    SELECT (
+        CASE WHEN direction LIKE '%동%' THEN 1 ELSE 0 END |
+        CASE WHEN direction LIKE '%서%' THEN 2 ELSE 0 END |
+        CASE WHEN direction LIKE '%남%' THEN 4 ELSE 0 END |
+        CASE WHEN direction LIKE '%북%' THEN 8 ELSE 0 END
+    )::SMALLINT;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 적재 시점 정규화: 어떤 경로로 insert / update 되어도 컬럼이 원본과 맞도록 유지
+CREATE OR REPLACE FUNCTION normalize_property_attributes() RETURNS trigger AS $$
+BEGIN
+    NEW.room_count := substring(NEW.rooms_bathrooms FROM '^(\d{1,4})/')::SMALLINT;
+    NEW.bathroom_count := substring(NEW.rooms_bathrooms FROM '^\d+/(\d{1,4})')::SMALLINT;
+    NEW.direction_mask := property_direction_mask(NEW.direction);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS property_normalize_attributes ON property;
+CREATE TRIGGER property_normalize_attributes
+    BEFORE INSERT OR UPDATE OF rooms_bathrooms, direction ON property
+    FOR EACH ROW EXECUTE FUNCTION normalize_property_attributes();
+
+-- 기존 행 백필
+UPDATE property SET
+    room_count = substring(rooms_bathrooms FROM '^(\d{1,4})/')::SMALLINT,
+    bathroom_count = substring(rooms_bathrooms FROM '^\d+/(\d{1,4})')::SMALLINT,
+    direction_mask = property_direction_mask(direction);
+
+-- 자주 쓰는 조건 조합: 거래 / 매물 유형 + 방 개수 → 동별 집계
+CREATE INDEX IF NOT EXISTS idx_property_type_rooms_dong
+    ON property (transaction_type, property_type, room_count, administrative_code);
+
+-- 방 개수만 지정한 요청
+CREATE INDEX IF NOT EXISTS idx_property_rooms_dong
+    ON property (room_count, administrative_code);
+
+-- 방향 조건은 대부분 남향 포함 → 부분 인덱스
+CREATE INDEX IF NOT EXISTS idx_property_south_dong
+    ON property (administrative_code) WHERE (direction_mask & 4) <> 0;
+
+ANALYZE property;
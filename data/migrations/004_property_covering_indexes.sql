@@ -0,0 +1,23 @@
+-- /recommend/area, /recommend/property 주요 쿼리용 인덱스
+-- 적용 후 data/query_latency.py로 전후 지연 시간 비교
+
+-- 시설 매핑 테이블: property_id = ANY(...)로 찾은 뒤 count / avg(distance_meters)를 인덱스에서 바로 계산
+-- (PK (property_id, 시설 id)만으로는 distance_meters를 읽으러 힙을 방문해야 함)
+CREATE INDEX IF NOT EXISTS idx_property_cctv_map_property_distance
+    ON property_cctv_map (property_id) INCLUDE (distance_meters);
+CREATE INDEX IF NOT EXISTS idx_property_rest_food_permit_map_property_distance
+    ON property_rest_food_permit_map (property_id) INCLUDE (distance_meters);
+CREATE INDEX IF NOT EXISTS idx_property_bus_stop_map_property_distance
+    ON property_bus_stop_map (property_id) INCLUDE (distance_meters);
+CREATE INDEX IF NOT EXISTS idx_property_subway_map_property_distance
+    ON property_subway_map (property_id) INCLUDE (distance_meters);
+
+-- 동별 매물 집계: administrative_code IN (...) + 거래 유형 + 월세 / 보증금 범위, id는 array_agg용
+CREATE INDEX IF NOT EXISTS idx_property_dong_budget
+    ON property (administrative_code, transaction_type, monthly_rent_cost, deposit) INCLUDE (id);
+
+ANALYZE property;
+ANALYZE property_cctv_map;
+ANALYZE property_rest_food_permit_map;
+ANALYZE property_bus_stop_map;
+ANALYZE property_subway_map;
@@ -0,0 +1,47 @@
+-- 001의 갱신 대상 표시 트리거 보완: 매핑 행 UPDATE / 매핑 테이블 TRUNCATE도 요약 갱신 대상으로 등록
+-- (build_facility_maps 외의 경로로 매핑을 고치거나 비우고 다시 적재해도 property_facility_summary가 오래된 값으로 남지 않도록)
+
+CREATE OR REPLACE FUNCTION mark_facility_summary_dirty_changed_rows() RETURNS trigger AS $$
+BEGIN
+    -- property_id 자체가 바뀐 경우 이전 / 새 매물 모두
+    INSERT INTO property_facility_summary_dirty (property_id)
+    SELECT property_id FROM old_rows
+    UNION
+    SELECT property_id FROM new_rows
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION mark_facility_summary_dirty_all() RETURNS trigger AS $$
+BEGIN
+    -- TRUNCATE는 지워진 행을 알 수 없으므로 전체 매물을 갱신 대상으로 등록
+    INSERT INTO property_facility_summary_dirty (property_id)
+    SELECT id FROM property
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    map_table TEXT;
+BEGIN
+    FOREACH map_table IN ARRAY ARRAY[
+        'property_cctv_map', 'property_rest_food_permit_map', 'property_bus_stop_map', 'property_subway_map'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', map_table || '_summary_upd', map_table);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION mark_facility_summary_dirty_changed_rows()',
+            map_table || '_summary_upd', map_table
+        );
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', map_table || '_summary_trunc', map_table);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION mark_facility_summary_dirty_all()',
+            map_table || '_summary_trunc', map_table
+        );
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,101 @@
+-- property_number 유일성 (data/db_data_loader.py의 INSERT ... ON CONFLICT (property_number) 대상)
+-- 중복 매물은 가장 먼저 들어간 행(id가 가장 작은 행)을 남김 (기존 적재기의 ON CONFLICT DO NOTHING과 같은 기준)
+-- 지우는 매물을 참조하던 찜 / 태그 / 사진 / 시설 매핑 행은 삭제하지 않고 남기는 매물로 옮김
+--   * 남기는 매물에 이미 같은 행이 있으면(같은 태그 / 사진 / 시설, 찜의 UNIQUE 충돌) 옮기지 않고 중복 행만 정리
+--   * 시설 매핑 이동은 005의 UPDATE 트리거가 요약 갱신 대상으로 등록
+-- 구 단위 파티션(optional/property_partition_by_gu.sql)을 적용한 DB는 이미 (property_number, administrative_code) UNIQUE가
+-- 있고 파티션 키 없는 UNIQUE를 만들 수 없으므로 건너뜀 (적재 시 PROPERTY_CONFLICT_TARGET 설정)
+
+DO $$
+DECLARE
+    map RECORD;
+    fav RECORD;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'property'::regclass) = 'p' THEN
+        RAISE NOTICE 'property가 파티션 테이블이므로 property_number 단독 UNIQUE 인덱스를 만들지 않음';
+        RETURN;
+    END IF;
+
+    -- (지울 id, 남길 id)
+    CREATE TEMP TABLE property_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id,
+                   min(id) OVER (PARTITION BY property_number) AS keep_id,
+                   row_number() OVER (PARTITION BY property_number ORDER BY id) AS rn
+            FROM property
+            WHERE property_number IS NOT NULL
+        ) numbered
+        WHERE rn > 1;
+
+    IF EXISTS (SELECT 1 FROM property_duplicates) THEN
+        RAISE NOTICE '중복 property_number 매물 % 건을 남기는 매물로 병합: %',
+            (SELECT count(*) FROM property_duplicates),
+            (SELECT string_agg(p.property_number || ' (' || d.id || ' → ' || d.keep_id || ')', ', ' ORDER BY d.id)
+             FROM property_duplicates d JOIN property p ON p.id = d.id);
+
+        -- 같은 값이 남기는 매물이나 id가 더 작은 같은 그룹의 중복 매물에 있으면 삭제, 나머지는 이동
+        -- (그룹 id = 남기는 id, 남기는 매물은 property_duplicates에 없으므로 자기 id)
+        -- 태그 / 사진
+        DELETE FROM property_tag t
+        USING property_duplicates d
+        WHERE t.property_id = d.id
+            AND EXISTS (
+                SELECT 1 FROM property_tag k LEFT JOIN property_duplicates kd ON kd.id = k.property_id
+                WHERE coalesce(kd.keep_id, k.property_id) = d.keep_id AND k.property_id < t.property_id
+                    AND k.name = t.name
+            );
+        UPDATE property_tag t SET property_id = d.keep_id
+        FROM property_duplicates d WHERE t.property_id = d.id;
+
+        DELETE FROM property_photo ph
+        USING property_duplicates d
+        WHERE ph.property_id = d.id
+            AND EXISTS (
+                SELECT 1 FROM property_photo k LEFT JOIN property_duplicates kd ON kd.id = k.property_id
+                WHERE coalesce(kd.keep_id, k.property_id) = d.keep_id AND k.property_id < ph.property_id
+                    AND k.image_url = ph.image_url
+            );
+        UPDATE property_photo ph SET property_id = d.keep_id
+        FROM property_duplicates d WHERE ph.property_id = d.id;
+
+        -- 시설 매핑: 옮기면 PK (property_id, 시설 id)가 충돌할 행은 삭제, 나머지는 이동
+        FOR map IN SELECT * FROM (VALUES
+            ('property_cctv_map', 'cctv_id'),
+            ('property_rest_food_permit_map', 'rest_food_permit_id'),
+            ('property_bus_stop_map', 'bus_stop_id'),
+            ('property_subway_map', 'subway_id')
+        ) AS m(table_name, facility_col) LOOP
+            EXECUTE format(
+                'DELETE FROM %1$I m USING property_duplicates d WHERE m.property_id = d.id '
+                'AND EXISTS (SELECT 1 FROM %1$I k LEFT JOIN property_duplicates kd ON kd.id = k.property_id '
+                'WHERE coalesce(kd.keep_id, k.property_id) = d.keep_id AND k.property_id < m.property_id '
+                'AND k.%2$I = m.%2$I)',
+                map.table_name, map.facility_col
+            );
+            EXECUTE format(
+                'UPDATE %I m SET property_id = d.keep_id FROM property_duplicates d WHERE m.property_id = d.id',
+                map.table_name
+            );
+        END LOOP;
+
+        -- 찜: 테이블은 서버(Spring)가 관리하므로 컬럼 구성과 무관하게 한 행씩 이동,
+        -- 같은 사용자가 남기는 매물도 이미 찜해서 UNIQUE 충돌이 나면 중복 찜만 삭제
+        FOR fav IN
+            SELECT f.ctid AS row_ctid, d.keep_id
+            FROM favorite f JOIN property_duplicates d ON d.id = f.property_id
+        LOOP
+            BEGIN
+                UPDATE favorite SET property_id = fav.keep_id WHERE ctid = fav.row_ctid;
+            EXCEPTION WHEN unique_violation THEN
+                DELETE FROM favorite WHERE ctid = fav.row_ctid;
+            END;
+        END LOOP;
+
+        -- 참조가 모두 옮겨졌으므로 중복 property 행만 삭제 (property_facility_summary는 ON DELETE CASCADE)
+        DELETE FROM property_facility_summary_dirty WHERE property_id IN (SELECT id FROM property_duplicates);
+        DELETE FROM property WHERE id IN (SELECT id FROM property_duplicates);
+    END IF;
+
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_property_number_unique ON property (property_number);
+END;
+$$;
@@ -0,0 +1,26 @@
+-- property 테이블 변경 버전 (app/services/recommend_cache.py의 property_table_version)
+-- 추천 캐시(area_cache / property_rank_cache)와 메모리 매물 스토어가 이 값이 바뀌면 무효화됨
+-- pg_stat_user_tables 카운터는 비동기로 갱신되고 pg_stat_reset / 비정상 종료 시 0으로 돌아가므로 버전으로 쓰지 않음
+-- 트리거가 같은 트랜잭션 안에서 값을 올리므로 변경 내용과 새 버전이 동시에 커밋됨 (롤백되면 버전도 그대로)
+-- 문장 단위 트리거라 대량 적재(COPY 묶음 하나)에도 한 번만 증가
+
+CREATE TABLE IF NOT EXISTS property_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+INSERT INTO property_version (id) VALUES (TRUE)
+ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_property_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE property_version SET version = version + 1, updated_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS property_version_bump ON property;
+CREATE TRIGGER property_version_bump
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON property
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_property_version();
@@ -0,0 +1,50 @@
+import argparse
+import asyncio
+import asyncpg
+import glob
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 번호 순서대로 아직 적용되지 않은 SQL 파일만 실행 (파일 하나 = 트랜잭션 하나)
+# optional: optional/ 아래 파일처럼 자동 적용하지 않는 마이그레이션 경로 (MIGRATIONS_DIR 기준)
+async def apply_migrations(migrations_dir=MIGRATIONS_DIR, optional=None):
+    conn = await asyncpg.connect(
+        host=os.getenv("DB_HOST"),
+        database=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+    )
+    try:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                applied_at TIMESTAMP NOT NULL DEFAULT now()
+            );
+        """)
+        applied = {r["version"] for r in await conn.fetch("SELECT version FROM schema_migrations;")}
+
+        paths = sorted(glob.glob(os.path.join(migrations_dir, "*.sql")))
+        if optional:
+            paths = [os.path.join(migrations_dir, optional)]
+        for path in paths:
+            version = os.path.relpath(path, migrations_dir)
+            if version in applied:
+                continue
+            with open(path, encoding="utf-8") as f:
+                sql = f.read()
+            async with conn.transaction():
+                await conn.execute(sql)
+                await conn.execute("INSERT INTO schema_migrations (version) VALUES ($1);", version)
+            print(f"✅ 적용 완료: {version}")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--optional", help="예: optional/property_partition_by_gu.sql")
+    args = parser.parse_args()
+    asyncio.run(apply_migrations(optional=args.optional))
@@ -0,0 +1,88 @@
+-- (선택) property 테이블을 구 단위 LIST 파티션으로 재구성
+-- 자동 적용되지 않음: python -m data.migrations.migrate --optional optional/property_partition_by_gu.sql
+-- 003, 004, 007 적용 후 실행. 실행 중에는 property 쓰기를 멈출 것 (전체 복사)
+--
+-- 추천 캐시 / 매물 스토어는 007의 property_version 행으로 변경을 감지함
+--   * 파티션 후에는 행이 하위 파티션에 들어가 부모 테이블의 pg_stat_user_tables 카운터가 움직이지 않으므로
+--     통계 카운터는 버전으로 쓸 수 없음
+--   * 아래에서 property_version_bump 트리거를 새 부모 테이블에 다시 만듦
+--     (부모 테이블을 거치는 INSERT / UPDATE / DELETE / TRUNCATE만 버전을 올리므로 파티션에 직접 쓰지 말 것)
+--
+-- 파티션 키는 administrative_code (구의 동 코드 목록 = 파티션 하나), 구 코드 = 동 코드 앞 5자리
+-- 파티션 테이블의 PK / UNIQUE 제약은 파티션 키를 포함해야 하므로
+--   * PK: (id, administrative_code), property_number 유일성: (property_number, administrative_code)
+--   * administrative_code는 NOT NULL (NULL 행이 있으면 중단)
+--   * property(id)를 참조하는 외래 키(property_facility_summary)는 제거됨
+--     (매물 삭제 시 요약 행은 property_facility_summary_dirty 갱신 작업에서 정리)
+-- 기존 테이블은 property_unpartitioned로 남김 (확인 후 직접 삭제)
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM property WHERE administrative_code IS NULL) THEN
+        RAISE EXCEPTION 'administrative_code가 NULL인 매물이 있어 파티션 키로 사용할 수 없음';
+    END IF;
+END;
+$$;
+
+CREATE TABLE property_partitioned (LIKE property INCLUDING DEFAULTS)
+    PARTITION BY LIST (administrative_code);
+ALTER TABLE property_partitioned ALTER COLUMN administrative_code SET NOT NULL;
+ALTER TABLE property_partitioned ADD PRIMARY KEY (id, administrative_code);
+ALTER TABLE property_partitioned ADD UNIQUE (property_number, administrative_code);
+
+-- 구마다 파티션 하나 (현재 매물이 있는 동 코드 기준), 그 외 코드는 기본 파티션
+DO $$
+DECLARE
+    gu RECORD;
+BEGIN
+    FOR gu IN
+        SELECT left(administrative_code, 5) AS gu_code, array_agg(DISTINCT administrative_code) AS codes
+        FROM property
+        GROUP BY 1
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF property_partitioned FOR VALUES IN (%s)',
+            'property_gu_' || gu.gu_code,
+            (SELECT string_agg(quote_literal(code), ', ') FROM unnest(gu.codes) AS code)
+        );
+    END LOOP;
+END;
+$$;
+CREATE TABLE property_gu_default PARTITION OF property_partitioned DEFAULT;
+
+INSERT INTO property_partitioned SELECT * FROM property;
+
+ALTER TABLE property_facility_summary DROP CONSTRAINT IF EXISTS property_facility_summary_property_id_fkey;
+ALTER SEQUENCE property_id_seq OWNED BY NONE;
+ALTER TABLE property RENAME TO property_unpartitioned;
+ALTER TABLE property_partitioned RENAME TO property;
+ALTER SEQUENCE property_id_seq OWNED BY property.id;
+
+-- 기존 트리거 / 인덱스 재생성 (001, 003, 004, 007)
+DROP TRIGGER IF EXISTS property_summary_dirty ON property_unpartitioned;
+DROP TRIGGER IF EXISTS property_normalize_attributes ON property_unpartitioned;
+DROP TRIGGER IF EXISTS property_version_bump ON property_unpartitioned;
+CREATE TRIGGER property_summary_dirty
+    AFTER INSERT OR UPDATE OF location ON property
+    FOR EACH ROW EXECUTE FUNCTION mark_facility_summary_dirty_property();
+CREATE TRIGGER property_normalize_attributes
+    BEFORE INSERT OR UPDATE OF rooms_bathrooms, direction ON property
+    FOR EACH ROW EXECUTE FUNCTION normalize_property_attributes();
+CREATE TRIGGER property_version_bump
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON property
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_property_version();
+-- 테이블 교체 자체도 변경으로 취급
+UPDATE property_version SET version = version + 1, updated_at = now();
+
+CREATE INDEX IF NOT EXISTS idx_property_part_type_rooms_dong
+    ON property (transaction_type, property_type, room_count, administrative_code);
+CREATE INDEX IF NOT EXISTS idx_property_part_rooms_dong
+    ON property (room_count, administrative_code);
+CREATE INDEX IF NOT EXISTS idx_property_part_south_dong
+    ON property (administrative_code) WHERE (direction_mask & 4) <> 0;
+CREATE INDEX IF NOT EXISTS idx_property_part_dong_budget
+    ON property (administrative_code, transaction_type, monthly_rent_cost, deposit) INCLUDE (id);
+CREATE INDEX IF NOT EXISTS idx_property_part_location
+    ON property USING GIST (location);
+
+ANALYZE property;
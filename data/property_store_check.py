@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import random
+import time
+
+from app.db.session import async_session
+from app.models.user_input import Budget
+from app.services.property_store import load_property_store
+from app.services.recommender import sql_dong_property_counts
+from app.utils.scoring_loader import read_score_snapshot
+
+# 메모리 매물 스토어와 SQL 집계(build_property_filters)의 동별 결과가 같은지 무작위 예산 조건으로 비교
+# 사용: python -m data.property_store_check --samples 200
+
+RANGE_CHOICES = {
+    "deposit": [0, 5000000, 10000000, 50000000, 100000000, 300000000],
+    "monthly_rent": [0, 300000, 500000, 800000, 1500000],
+    "maintenance_cost": [0, 50000, 100000, 200000],
+    "area": [10, 20, 33, 50, 85],
+}
+LIST_CHOICES = {
+    "transaction_type": ["전세", "월세"],
+    "property_type": ["원룸", "빌라", "오피스텔"],
+    "room_type": ["원룸", "투룸", "쓰리룸"],
+    "floor_type": ["지상", "반지하", "옥탑"],
+    "direction": ["남", "북", "동", "서"],
+}
+
+def random_budget(rng: random.Random):
+    fields = {}
+    for field, choices in RANGE_CHOICES.items():
+        k = rng.choice([0, 0, 1, 2])
+        fields[field] = sorted(rng.sample(choices, k))
+    for field, choices in LIST_CHOICES.items():
+        fields[field] = rng.sample(choices, rng.choice([0, 0, 1, 2]))
+    return Budget(**fields)
+
+async def main(samples, seed):
+    rng = random.Random(seed)
+    dong_codes = read_score_snapshot()["EMD_CD"].tolist()
+
+    async with async_session() as db:
+        started = time.perf_counter()
+        store = await load_property_store(db, version=None)
+        print(f"스토어 적재: {len(store)}건, {time.perf_counter() - started:.2f}초")
+
+        mismatches = 0
+        store_sec = sql_sec = 0.0
+        for i in range(samples):
+            budget = random_budget(rng)
+            codes = rng.sample(dong_codes, rng.randint(1, len(dong_codes)))
+
+            started = time.perf_counter()
+            expected = await sql_dong_property_counts(db, budget, codes)
+            sql_sec += time.perf_counter() - started
+
+            started = time.perf_counter()
+            actual = store.dong_property_counts(budget, codes)
+            store_sec += time.perf_counter() - started
+
+            if actual != expected:
+                mismatches += 1
+                print(f"[불일치 {i}] {budget.model_dump()}")
+
+    print(f"불일치 {mismatches}/{samples}")
+    print(f"평균 SQL {sql_sec / samples * 1000:.2f}ms, 스토어 {store_sec / samples * 1000:.3f}ms")
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    raise SystemExit(1 if asyncio.run(main(args.samples, args.seed)) else 0)
@@ -0,0 +1,156 @@
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import any_, select, text
+
+from app.db.session import async_session
+from app.models.property_db import Property
+from app.models.user_input import UserInput
+from app.services.property_query import build_property_facility_query, build_property_summary_query, property_ids_param
+from app.services.recommender import (
+    PROPERTY_IDS_PER_DONG_LIMIT, area_transport_mode, build_dong_property_count_query, resolve_priority, score_dongs
+)
+from app.utils.scoring_loader import read_score_snapshot
+from data.explain_property_filters import explain, plan_nodes
+
+# recommend_dongs / recommend_properties가 실제로 만드는 SQL 문장의 지연 시간 기록 (인덱스 / 파티션 적용 전후 비교)
+# 사용 (프로젝트 루트에서)
+#   python -m data.query_latency --label before --output before.json
+#   python -m data.migrations.migrate
+#   python -m data.query_latency --label after --output after.json
+#   python -m data.query_latency --compare before.json after.json
+
+# 마이그레이션 003, 004가 만드는 인덱스
+EXPECTED_INDEXES = [
+    "idx_property_type_rooms_dong",
+    "idx_property_rooms_dong",
+    "idx_property_south_dong",
+    "idx_property_dong_budget",
+    "idx_property_cctv_map_property_distance",
+    "idx_property_rest_food_permit_map_property_distance",
+    "idx_property_bus_stop_map_property_distance",
+    "idx_property_subway_map_property_distance",
+]
+
+# 마이그레이션 003이 추가하는 property 컬럼 (before 기준 문장에서는 조회하지 않음)
+NORMALIZED_COLUMNS = ("room_count", "bathroom_count", "direction_mask")
+
+def example_user_input():
+    return UserInput(**UserInput.model_config["json_schema_extra"]["example"])
+
+def legacy_property_columns():
+    # 마이그레이션 전 스키마에도 있는 property 컬럼만 (페이지 행 조회용)
+    return [col for col in Property.__table__.columns if col.name not in NORMALIZED_COLUMNS]
+
+async def schema_features(db):
+    # 적용된 마이그레이션에 따라 추가로 측정할 수 있는 문장 판단
+    result = await db.execute(text("""
+        SELECT
+            EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'property' AND column_name = 'room_count'
+            ) AS normalized,
+            EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'property_facility_summary'
+                    AND column_name = 'score_version'
+            ) AS summary
+    """))
+    return result.one()._asdict()
+
+async def benchmark_statements(db):
+    # /recommend/area 예시 입력 → 동별 집계 문장, 매물이 가장 많은 동 → /recommend/property 문장들
+    # 기준 문장(정규식 조건, 매핑 테이블 집계, 기존 컬럼)은 마이그레이션 전 DB에서도 실행되어 before / after 비교 가능
+    # 정규화 컬럼 / 요약 테이블 문장은 해당 마이그레이션이 적용된 DB에서만 추가
+    features = await schema_features(db)
+    scores = read_score_snapshot()
+    user_input = example_user_input()
+    resolve_priority(user_input)
+    rows, _, _, _ = score_dongs(scores, user_input, area_transport_mode(user_input))
+    dong_codes = scores["EMD_CD"][rows].tolist()
+
+    statements = {
+        "area.dong_property_counts": build_dong_property_count_query(
+            user_input.budget, dong_codes, True, PROPERTY_IDS_PER_DONG_LIMIT, normalized=False
+        ),
+    }
+    if features["normalized"]:
+        statements["area.dong_property_counts_normalized"] = build_dong_property_count_query(
+            user_input.budget, dong_codes, True, PROPERTY_IDS_PER_DONG_LIMIT, normalized=True
+        )
+    result = await db.execute(statements["area.dong_property_counts"])
+    counted = sorted(result.all(), key=lambda row: row.count, reverse=True)
+    if counted:
+        property_ids = list(counted[0].ids)
+        statements["property.facilities_from_maps"] = build_property_facility_query(property_ids)
+        if features["summary"]:
+            statements["property.facilities_summary"] = build_property_summary_query(property_ids)
+        statements["property.page_rows"] = select(*legacy_property_columns()).where(
+            Property.id == any_(property_ids_param(property_ids[:20]))
+        )
+    return statements
+
+async def time_statement(db, stmt, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = await db.execute(stmt)
+        result.all()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "min_ms": round(timings[0], 3),
+    }
+
+async def missing_indexes(db):
+    result = await db.execute(text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"))
+    existing = set(result.scalars().all())
+    return [name for name in EXPECTED_INDEXES if name not in existing]
+
+async def main(label, runs, output):
+    report = {"label": label, "runs": runs, "statements": {}}
+    async with async_session() as db:
+        report["missing_indexes"] = await missing_indexes(db)
+        for name, stmt in (await benchmark_statements(db)).items():
+            await db.execute(stmt)  # 캐시 워밍업
+            timing = await time_statement(db, stmt, runs)
+            plan = await explain(db, stmt)
+            timing["plan"] = plan_nodes(plan["Plan"])
+            report["statements"][name] = timing
+            print(f"{name}: p50 {timing['p50_ms']}ms, p95 {timing['p95_ms']}ms")
+
+    if report["missing_indexes"]:
+        print(f"⚠️ 없는 인덱스: {', '.join(report['missing_indexes'])}")
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 저장: {output}")
+
+def compare(before_path, after_path):
+    with open(before_path, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)
+    print(f"{'문장':<35} {before['label']:>12} {after['label']:>12} {'변화':>8}")
+    for name, timing in after["statements"].items():
+        if name not in before["statements"]:
+            continue
+        old, new = before["statements"][name]["p50_ms"], timing["p50_ms"]
+        change = f"{(new - old) / old * 100:+.0f}%" if old else "-"
+        print(f"{name:<35} {old:>10.2f}ms {new:>10.2f}ms {change:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--label", default="current")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--output")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        asyncio.run(main(args.label, args.runs, args.output))
@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.utils.score_artifacts import feather, write_artifact
+from app.utils.scoring_loader import NUMERIC_COLUMNS, SCORE_CSV_PATH, TEXT_COLUMNS, read_score_snapshot
+
+# 동 점수 표 적재 시간 비교: CSV(pandas 파싱) vs 바이너리 컬럼 산출물(.npy 묶음 / Arrow IPC / Parquet)
+# cold: 페이지 캐시에서 파일을 내린 뒤 새 프로세스에서 첫 적재, warm: 같은 프로세스에서 반복 적재
+# 사용 (프로젝트 루트에서): python -m data.score_loader_benchmark --runs 50 --cold-runs 5
+
+# 새 프로세스에서 한 번 적재하고 (적재 시간, 첫 전체 접근 시간)을 JSON으로 출력
+COLD_SCRIPT = """
+import json, sys, time
+from app.utils.scoring_loader import read_score_snapshot
+started = time.perf_counter()
+snapshot = read_score_snapshot(sys.argv[1])
+loaded = time.perf_counter()
+touched = sum(float(snapshot[col].sum()) for col in sys.argv[2:])
+print(json.dumps({"load_ms": (loaded - started) * 1000, "touch_ms": (time.perf_counter() - loaded) * 1000}))
+"""
+
+def artifact_files(path):
+    if os.path.isdir(path):
+        return [os.path.join(path, name) for name in os.listdir(path)]
+    return [path]
+
+def drop_page_cache(path):
+    # 해당 파일들만 페이지 캐시에서 내림 (root 권한 없이 가능한 범위, 지원하지 않는 OS면 무시)
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for file_path in artifact_files(path):
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+def cold_load(path, runs):
+    timings = []
+    for _ in range(runs):
+        drop_page_cache(path)
+        output = subprocess.run(
+            [sys.executable, "-c", COLD_SCRIPT, path, *NUMERIC_COLUMNS],
+            check=True, capture_output=True, text=True
+        ).stdout
+        timings.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "load_ms": float(np.median([t["load_ms"] for t in timings])),
+        "touch_ms": float(np.median([t["touch_ms"] for t in timings])),
+    }
+
+def warm_load(path, runs):
+    read_score_snapshot(path)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        snapshot = read_score_snapshot(path)
+        for col in NUMERIC_COLUMNS:
+            snapshot[col].sum()
+        timings.append((time.perf_counter() - started) * 1000)
+    return float(np.median(timings))
+
+def build_artifacts(csv_path, directory):
+    # 현재 CSV와 같은 내용으로 형식별 산출물 생성 (pyarrow가 없으면 .npy만)
+    df = pd.read_csv(csv_path, dtype={col: str for col in TEXT_COLUMNS})
+    paths = {"csv": csv_path}
+    formats = [".npy"] + ([".arrow", ".parquet"] if feather is not None else [])
+    for fmt in formats:
+        path = os.path.join(directory, f"emd_with_all_scores{fmt}")
+        write_artifact(df, path)
+        paths[fmt.lstrip(".")] = path
+    return paths
+
+def check_same_snapshot(paths):
+    # 모든 형식이 CSV와 같은 값을 돌려주는지 확인
+    expected = read_score_snapshot(paths["csv"])
+    for name, path in paths.items():
+        actual = read_score_snapshot(path)
+        for col in TEXT_COLUMNS:
+            assert list(map(str, actual[col])) == list(map(str, expected[col])), (name, col)
+        for col in NUMERIC_COLUMNS:
+            assert np.array_equal(actual[col], expected[col], equal_nan=True), (name, col)
+
+def main(csv_path, runs, cold_runs):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = build_artifacts(csv_path, directory)
+        check_same_snapshot(paths)
+        print(f"{'형식':<10} {'cold 적재':>12} {'cold 첫 접근':>14} {'warm 적재':>12} {'크기':>10}")
+        for name, path in paths.items():
+            cold = cold_load(path, cold_runs)
+            warm = warm_load(path, runs)
+            size = sum(os.path.getsize(file_path) for file_path in artifact_files(path))
+            print(
+                f"{name:<10} {cold['load_ms']:>10.2f}ms {cold['touch_ms']:>12.3f}ms "
+                f"{warm:>10.3f}ms {size / 1024:>8.1f}KB"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=SCORE_CSV_PATH)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--cold-runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.csv, args.runs, args.cold_runs)
@@ -0,0 +1,135 @@
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from app.utils.score_artifacts import artifact_path, write_artifact
+
+# 시설 밀도 기반 지수(음식점 인프라 / 보안 / 교통)를 한 번에 계산
+# 동별 시설 수 → 1㎢당 밀도 → log1p → MinMax 정규화를 모든 지수에 대해 EMD_CD 공통 인덱스 위에서 벡터 연산으로 처리
+# 새 시설 분류(공원, 편의점, 병원 등)는 DENSITY_SOURCES / DENSITY_SCORES에 한 줄씩 추가하면 됨
+
+INFRA_DATA_DIR = "data/scoring/infra_data"
+EMD_INFO_CSV = f"{INFRA_DATA_DIR}/emd_info.csv"
+DONG_INFO_JSON = "data/seoul_dong_list_with_code.json"
+DENSITY_SCORE_CSV = "data/scoring/score/dong_density_scores.csv"
+DENSITY_SCORE_ARTIFACT = artifact_path("data/scoring/score/dong_density_scores")
+
+# 시설 소스 이름 → infra_preprocess.py가 만든 *_with_dong.csv
+DENSITY_SOURCES = {
+    "rest_food_permit": f"{INFRA_DATA_DIR}/rest_food_permit_with_dong.csv",
+    "cctv": f"{INFRA_DATA_DIR}/cctv_with_dong.csv",
+    "subway": f"{INFRA_DATA_DIR}/subway_with_dong.csv",
+    "bus_stop": f"{INFRA_DATA_DIR}/bus_stop_with_dong.csv",
+}
+
+# 지수 이름 → 시설 수를 합산할 소스 목록
+DENSITY_SCORES = {
+    "infra": ["rest_food_permit"],
+    "security": ["cctv"],
+    "transport": ["subway", "bus_stop"],
+}
+
+def load_dong_names(dong_info_json: str = DONG_INFO_JSON):
+    dong_info = json.load(open(dong_info_json, encoding="utf-8"))
+    code_to_name = {}
+    for gu_entry in dong_info:
+        gu = gu_entry["gu"]
+        for dong in gu_entry["dong_list"]:
+            code_to_name[dong["dong_code"]] = {
+                "gu": gu,
+                "dong": dong["dong"]
+            }
+    return code_to_name
+
+def read_facility_codes(csv_with_dong: str):
+    return pd.read_csv(csv_with_dong, usecols=["EMD_CD"])["EMD_CD"]
+
+def count_facilities(codes: pd.Series, emd_codes: pd.Index):
+    # 시설별 EMD_CD → 공통 인덱스 순서의 동별 시설 수 배열 (인덱스에 없는 동은 버림)
+    codes = codes.dropna().astype(float).astype(int).astype(str) + "00"
+    counts = codes.value_counts()
+    return counts.reindex(emd_codes, fill_value=0).to_numpy(dtype=np.float64)
+
+def calculate_density_scores(
+    scores: dict = None,
+    sources: dict = None,
+    emd_info_csv: str = EMD_INFO_CSV,
+    dong_info_json: str = DONG_INFO_JSON
+) -> pd.DataFrame:
+    scores = scores or DENSITY_SCORES
+    sources = sources or DENSITY_SOURCES
+
+    # 여러 지수가 같은 소스를 써도 파일은 한 번만 읽음
+    used_sources = sorted({name for source_names in scores.values() for name in source_names})
+    facility_codes = {name: read_facility_codes(sources[name]) for name in used_sources}
+    emd_df = pd.read_csv(emd_info_csv, dtype={"EMD_CD": str})
+    return density_scores(facility_codes, emd_df, load_dong_names(dong_info_json), scores)
+
+def density_scores(facility_codes: dict, emd_df: pd.DataFrame, code_to_name: dict, scores: dict = None) -> pd.DataFrame:
+    # EMD_CD별 {지수}_count, {지수}_density, {지수} 컬럼 표 (시설이 없거나 면적을 모르는 동, 이름 없는 동의 지수는 NaN)
+    scores = scores or DENSITY_SCORES
+    emd_codes = pd.Index(emd_df["EMD_CD"])
+    area_km2 = emd_df["area_m2"].to_numpy(dtype=np.float64) / 1_000_000
+
+    source_counts = {
+        name: count_facilities(codes, emd_codes)
+        for name, codes in facility_codes.items()
+        if any(name in source_names for source_names in scores.values())
+    }
+
+    names = list(scores)
+    counts = np.column_stack([
+        np.sum([source_counts[source] for source in scores[name]], axis=0) for name in names
+    ])
+
+    # 시설이 하나도 없는 동은 정규화 대상에서 제외 (기존 스크립트와 같이 NaN → 결측)
+    density = counts / area_km2[:, None]
+    log_density = np.where(counts > 0, np.log1p(density), np.nan)
+
+    # MinMaxScaler는 NaN을 무시하고 열마다 따로 정규화
+    normalized = MinMaxScaler().fit_transform(log_density).round(4)
+    named = emd_codes.isin(list(code_to_name))
+    normalized[~named] = np.nan
+
+    result = pd.DataFrame({"EMD_CD": emd_codes})
+    for i, name in enumerate(names):
+        result[f"{name}_count"] = counts[:, i].astype(np.int64)
+        result[f"{name}_density"] = density[:, i]
+        result[name] = normalized[:, i]
+    return result
+
+def score_records(density_df: pd.DataFrame, name: str, code_to_name: dict):
+    # 기존 dong_*_score.json 형식 (지수가 있는 동만)
+    rows = density_df.loc[density_df[name].notna(), ["EMD_CD", name]].sort_values("EMD_CD")
+    return [
+        {
+            "dong_code": code,
+            "gu": code_to_name[code]["gu"],
+            "dong": code_to_name[code]["dong"],
+            name: value
+        }
+        for code, value in zip(rows["EMD_CD"].tolist(), rows[name].tolist())
+    ]
+
+def save_density_scores(
+    density_df: pd.DataFrame, output_csv: str = DENSITY_SCORE_CSV, output_artifact: str = DENSITY_SCORE_ARTIFACT
+):
+    # 확인용 CSV + 바이너리 컬럼 산출물 (fetch_score는 산출물을 우선 사용)
+    density_df.to_csv(output_csv, index=False)
+    write_artifact(density_df, output_artifact)
+    print(f"시설 밀도 지수 저장 완료: {output_csv}, {output_artifact}")
+
+# 실행 (프로젝트 루트에서, 이후 python data/scoring/fetch_score.py로 emd_with_all_scores.csv 갱신)
+#   python -m data.scoring.density_score                  → 등록된 모든 지수
+#   python -m data.scoring.density_score --score security → 특정 지수만
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--score", choices=list(DENSITY_SCORES), action="append")
+    parser.add_argument("--output", default=DENSITY_SCORE_CSV)
+    parser.add_argument("--artifact", default=DENSITY_SCORE_ARTIFACT)
+    args = parser.parse_args()
+    selected = {name: DENSITY_SCORES[name] for name in (args.score or DENSITY_SCORES)}
+    save_density_scores(calculate_density_scores(selected), args.output, args.artifact)
@@ -1,61 +1,90 @@
+import os
 import pandas as pd
 import json
 
-# 1. emd_info.csv 불러오기
-emd_info = pd.read_csv("data/scoring/infra_data/emd_info.csv", dtype={"EMD_CD": str})
+from app.utils.score_artifacts import artifact_path, file_version, read_artifact_frame, write_artifact
+from data.scoring.density_score import (
+    DENSITY_SCORE_ARTIFACT, DENSITY_SCORE_CSV, DENSITY_SCORES, DONG_INFO_JSON, EMD_INFO_CSV
+)
+from data.scoring.youth_quiet_score import QUIET_YOUTH_ARTIFACT
 
-# 2. JSON 지수 불러오기 함수
+# 실행 (프로젝트 루트에서): python -m data.scoring.fetch_score
+
+QUIET_YOUTH_JSON = "data/scoring/score/dong_youth_and_quiet_score.json"
+ALL_SCORES_CSV = "data/scoring/score/emd_with_all_scores.csv"
+# API(scoring_loader)가 mmap으로 바로 여는 산출물 (생성물이므로 커밋하지 않음)
+ALL_SCORES_ARTIFACT = artifact_path("data/scoring/score/emd_with_all_scores")
+
+# JSON 지수 불러오기 함수
 def load_score(path, score_key):
     with open(path, encoding="utf-8") as f:
         data = json.load(f)
-    df = pd.DataFrame(data)
-    df.rename(columns={"dong_code": "EMD_CD", score_key: f"{score_key}_score"}, inplace=True)
+    return score_frame(pd.DataFrame(data), score_key)
+
+def score_frame(df, score_key):
+    df = df.rename(columns={"dong_code": "EMD_CD", score_key: f"{score_key}_score"})
     return df[["EMD_CD", f"{score_key}_score"]]
 
-# 3. 각 지수 JSON → DataFrame으로 변환
-infra_df     = load_score("data/scoring/score/dong_food_infra_score.json", "infra")
-security_df  = load_score("data/scoring/score/dong_security_score.json", "security")
-transport_df = load_score("data/scoring/score/dong_transport_score.json", "transport")
-quiet_df     = load_score("data/scoring/score/dong_youth_and_quiet_score.json", "quiet")
-youth_df     = load_score("data/scoring/score/dong_youth_and_quiet_score.json", "youth")
-
-# 4. 모든 지수 merge (EMD_CD 기준)
-merged = emd_info.copy()
-for score_df in [infra_df, security_df, transport_df, quiet_df, youth_df]:
-    merged = pd.merge(merged, score_df, on="EMD_CD", how="left")
-    
-merged.fillna(0, inplace=True)
-
-# 5. dong_code → gu 이름 및 gu_code 매핑
-with open("data/seoul_dong_list_with_code.json", encoding="utf-8") as f:
-    dong_info = json.load(f)
-
-# 6. dong_code 기반 매핑 딕셔너리 생성
-dong_to_gu_name = {}
-dong_to_gu_code = {}
-
-for gu_entry in dong_info:
-    gu_name = gu_entry["gu"]
-    gu_code = gu_entry["gu_code"]
-    gu_prefix = gu_code[:5]
-    
-    for dong in gu_entry["dong_list"]:
-        dong_code = dong["dong_code"]
-        if dong_code[:5] == gu_prefix:
-            dong_to_gu_name[dong_code] = gu_name
-            dong_to_gu_code[dong_code] = gu_code
-
-# 7. merged에 gu, gu_code 컬럼 추가
-merged["gu"] = merged["EMD_CD"].map(lambda code: dong_to_gu_name.get(code, ""))
-merged["gu_code"] = merged["EMD_CD"].map(lambda code: dong_to_gu_code.get(code, ""))
-
-# 8. 컬럼 순서 정리 (선택)
-cols = [
-    "EMD_CD", "gu", "gu_code", "EMD_NM", "area_m2", "centroid_lon", "centroid_lat",
-    "infra_score", "security_score", "transport_score", "quiet_score", "youth_score"
-]
-merged = merged[cols]
-
-
-# 9. 저장
-merged.to_csv("data/scoring/score/emd_with_all_scores.csv", index=False)
+def merge_all_scores(emd_info, density_df, quiet_youth_df, dong_info):
+    # 시설 밀도 지수 표(density_score.py 결과) + 조용함 / 젊음 지수 → emd_info 기준 하나의 표
+    density_names = [name for name in DENSITY_SCORES if name in density_df.columns]
+    density_df = density_df[["EMD_CD"] + density_names].rename(columns={name: f"{name}_score" for name in density_names})
+    quiet_df = score_frame(quiet_youth_df, "quiet")
+    youth_df = score_frame(quiet_youth_df, "youth")
+
+    # 모든 지수 merge (EMD_CD 기준)
+    merged = emd_info.copy()
+    for score_df in [density_df, quiet_df, youth_df]:
+        merged = pd.merge(merged, score_df, on="EMD_CD", how="left")
+
+    merged.fillna(0, inplace=True)
+
+    # dong_code 기반 gu 이름 및 gu_code 매핑 딕셔너리 생성
+    dong_to_gu_name = {}
+    dong_to_gu_code = {}
+
+    for gu_entry in dong_info:
+        gu_name = gu_entry["gu"]
+        gu_code = gu_entry["gu_code"]
+        gu_prefix = gu_code[:5]
+
+        for dong in gu_entry["dong_list"]:
+            dong_code = dong["dong_code"]
+            if dong_code[:5] == gu_prefix:
+                dong_to_gu_name[dong_code] = gu_name
+                dong_to_gu_code[dong_code] = gu_code
+
+    # merged에 gu, gu_code 컬럼 추가
+    merged["gu"] = merged["EMD_CD"].map(lambda code: dong_to_gu_name.get(code, ""))
+    merged["gu_code"] = merged["EMD_CD"].map(lambda code: dong_to_gu_code.get(code, ""))
+
+    # 컬럼 순서 정리 (새로 등록한 밀도 지수는 뒤에 추가)
+    cols = [
+        "EMD_CD", "gu", "gu_code", "EMD_NM", "area_m2", "centroid_lon", "centroid_lat",
+        "infra_score", "security_score", "transport_score", "quiet_score", "youth_score"
+    ]
+    cols += [f"{name}_score" for name in density_names if f"{name}_score" not in cols]
+    return merged[cols]
+
+def save_all_scores(merged, output_csv=ALL_SCORES_CSV, output_artifact=ALL_SCORES_ARTIFACT):
+    # 산출물에 CSV 해시를 기록 → CSV만 고치면 scoring_loader가 산출물 대신 CSV를 사용
+    merged.to_csv(output_csv, index=False)
+    write_artifact(merged, output_artifact, meta={"source_version": file_version(output_csv)})
+
+if __name__ == "__main__":
+    emd_info = pd.read_csv(EMD_INFO_CSV, dtype={"EMD_CD": str})
+    # 바이너리 산출물이 있으면 우선 사용 (없으면 CSV / JSON)
+    if os.path.exists(DENSITY_SCORE_ARTIFACT):
+        density_df = read_artifact_frame(DENSITY_SCORE_ARTIFACT)
+    else:
+        density_df = pd.read_csv(DENSITY_SCORE_CSV, dtype={"EMD_CD": str})
+    if os.path.exists(QUIET_YOUTH_ARTIFACT):
+        quiet_youth_df = read_artifact_frame(QUIET_YOUTH_ARTIFACT)
+    else:
+        with open(QUIET_YOUTH_JSON, encoding="utf-8") as f:
+            quiet_youth_df = pd.DataFrame(json.load(f))
+    with open(DONG_INFO_JSON, encoding="utf-8") as f:
+        dong_info = json.load(f)
+
+    merged = merge_all_scores(emd_info, density_df, quiet_youth_df, dong_info)
+    save_all_scores(merged)
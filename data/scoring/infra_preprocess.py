@@ -1,7 +1,10 @@
 import geopandas as gpd
+import multiprocessing
+import numpy as np
 import pandas as pd
+import shapely
+from concurrent.futures import ProcessPoolExecutor
 from shapely.geometry import Point
-from shapely.wkt import loads as wkt_loads
 from pyproj import CRS
 from tqdm import tqdm
 
@@ -33,8 +36,9 @@ def preprocess_admin_boundaries(shp_path, save_path='data/scoring/infra_data/emd
     # 필요한 열만 추출
     result_df = gdf[['EMD_CD', 'EMD_NM', 'area_m2', 'centroid_lon', 'centroid_lat']].copy()
 
-    # CSV 저장
-    result_df.to_csv(save_path, index=False, encoding='utf-8-sig')
+    # CSV 저장 (save_path가 None이면 저장하지 않음)
+    if save_path:
+        result_df.to_csv(save_path, index=False, encoding='utf-8-sig')
 
     return result_df
 
@@ -56,27 +60,80 @@ def find_admin_dong(lat, lon, admin_gdf):
             'EMD_NM': result['EMD_NM']
         }
 
-def assign_admin_dong(df: pd.DataFrame, admin_gdf: gpd.GeoDataFrame, location_col: str = "location") -> pd.DataFrame:
-    tqdm.pandas()
-    
-    def extract_lat_lon_from_point(wkt_str: str):
-        try:
-            point = wkt_loads(wkt_str)
-            return point.y, point.x  # lat, lon
-        except:
-            return None, None
-
-    def match_dong(wkt_str: str):
-        lat, lon = extract_lat_lon_from_point(wkt_str)
-        if lat is None or lon is None:
-            return {"EMD_CD": None, "EMD_NM": None}
-        result = find_admin_dong(lat, lon, admin_gdf)
-        return result or {"EMD_CD": None, "EMD_NM": None}
-
-    matched = df[location_col].progress_apply(match_dong)
-    df["EMD_CD"] = matched.apply(lambda x: x["EMD_CD"])
-    df["EMD_NM"] = matched.apply(lambda x: x["EMD_NM"])
-    
+# 이 행 수를 넘으면 묶음으로 나눠 프로세스 풀에서 처리
+ASSIGN_CHUNK_SIZE = 200_000
+
+def parse_point_wkt(values):
+    # WKT 문자열 배열 → (lon, lat) 배열, 파싱 실패 / 포인트가 아닌 값은 NaN
+    values = np.asarray(values, dtype=object)
+    wkts = np.array([v if isinstance(v, str) else None for v in values], dtype=object)
+    geoms = shapely.from_wkt(wkts, on_invalid="ignore")
+    is_point = (shapely.get_type_id(geoms) == 0) & ~shapely.is_empty(geoms)
+    lons = np.full(len(values), np.nan)
+    lats = np.full(len(values), np.nan)
+    lons[is_point] = shapely.get_x(geoms[is_point])
+    lats[is_point] = shapely.get_y(geoms[is_point])
+    return lons, lats
+
+def match_admin_dong_positions(lons, lats, admin_gdf):
+    # 각 좌표를 포함하는 행정동의 행 위치 (admin_gdf 순서상 첫 번째), 없으면 -1
+    valid = ~(np.isnan(lons) | np.isnan(lats))
+    positions = np.full(len(lons), -1, dtype=np.int64)
+    if not valid.any():
+        return positions
+
+    # 한 번에 EPSG:5186으로 변환 후 STRtree 공간 인덱스로 포함 관계 조회 (sjoin과 같은 인덱스)
+    points = gpd.GeoSeries(gpd.points_from_xy(lons[valid], lats[valid]), crs="EPSG:4326").to_crs(epsg=5186)
+    point_idx, admin_idx = admin_gdf.sindex.query(points.values, predicate="within")
+
+    # 경계가 겹쳐 여러 동에 포함되면 기존 구현(matched.iloc[0])처럼 앞선 행 선택
+    first = np.full(len(points), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first, point_idx, admin_idx)
+    first[first == np.iinfo(np.int64).max] = -1
+    positions[np.flatnonzero(valid)] = first
+    return positions
+
+def admin_dong_columns(locations, admin_gdf):
+    # WKT 위치 배열 → (EMD_CD, EMD_NM) object 배열, 매칭 실패는 None
+    lons, lats = parse_point_wkt(locations)
+    positions = match_admin_dong_positions(lons, lats, admin_gdf)
+    matched = positions >= 0
+    codes = np.full(len(positions), None, dtype=object)
+    names = np.full(len(positions), None, dtype=object)
+    codes[matched] = admin_gdf["EMD_CD"].to_numpy(dtype=object)[positions[matched]]
+    names[matched] = admin_gdf["EMD_NM"].to_numpy(dtype=object)[positions[matched]]
+    return codes, names
+
+_worker_admin_gdf = None
+
+def _init_assign_worker(admin_gdf):
+    global _worker_admin_gdf
+    _worker_admin_gdf = admin_gdf
+
+def _assign_chunk(locations):
+    return admin_dong_columns(locations, _worker_admin_gdf)
+
+def assign_admin_dong(
+    df: pd.DataFrame, admin_gdf: gpd.GeoDataFrame, location_col: str = "location",
+    chunk_size: int = ASSIGN_CHUNK_SIZE, workers: int = None
+) -> pd.DataFrame:
+    # find_admin_dong을 행마다 호출하던 방식과 같은 EMD_CD / EMD_NM 결과를 한 번에 계산
+    locations = df[location_col].to_numpy(dtype=object)
+    if len(locations) <= chunk_size:
+        codes, names = admin_dong_columns(locations, admin_gdf)
+    else:
+        chunks = [locations[i:i + chunk_size] for i in range(0, len(locations), chunk_size)]
+        # fork 대신 spawn: scoring 파이프라인처럼 여러 스레드가 도는 프로세스에서 호출돼도 교착 위험 없음
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_assign_worker, initargs=(admin_gdf,)
+        ) as pool:
+            results = list(tqdm(pool.map(_assign_chunk, chunks), total=len(chunks), desc="행정동 매칭"))
+        codes = np.concatenate([r[0] for r in results])
+        names = np.concatenate([r[1] for r in results])
+
+    df["EMD_CD"] = codes
+    df["EMD_NM"] = names
     return df
 
 if __name__ == "__main__":
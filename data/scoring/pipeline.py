@@ -0,0 +1,315 @@
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from app.utils import score_artifacts
+from data.scoring import density_score, fetch_score, infra_preprocess, youth_quiet_score
+from data.scoring.density_score import (
+    DENSITY_SCORE_CSV, DENSITY_SOURCES, DONG_INFO_JSON, EMD_INFO_CSV, density_scores, load_dong_names,
+    save_density_scores
+)
+from data.scoring.fetch_score import (
+    ALL_SCORES_ARTIFACT, ALL_SCORES_CSV, QUIET_YOUTH_JSON, merge_all_scores, save_all_scores
+)
+from data.scoring.infra_preprocess import assign_admin_dong, load_admin_boundaries, preprocess_admin_boundaries
+from data.scoring.youth_quiet_score import (
+    QUIET_PROFILE_PATH, QUIET_YOUTH_ARTIFACT, hourly_profile_arrays, quiet_youth_frame, quiet_youth_records
+)
+
+# data/scoring 전처리 → 지수 계산 → emd_with_all_scores.csv 단계를 DAG로 실행
+# 단계마다 입력 파일 내용 해시 + 상위 단계 키 + 코드 해시로 키를 만들고, 키가 같으면 캐시된 결과(Parquet)를 재사용
+# 서로 의존하지 않는 단계는 동시에 실행
+
+SHP_PATH = "data/public_data/서울행정동경계/LSMD_ADM_SECT_UMD_11_202504.shp"
+PUBLIC_FACILITY_CSV = {name: f"data/public_data/{name}.csv" for name in DENSITY_SOURCES}
+POPULATION_CSV = "data/public_data/생활인구.csv"
+ADMIN_TO_LEGAL_CSV = "data/public_data/행정동법정동매핑.csv"
+
+CACHE_DIR = os.getenv("SCORING_CACHE_DIR", "data/scoring/.cache")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+FILE_HASHES_PATH = os.path.join(CACHE_DIR, "file_hashes.json")
+
+# Parquet 엔진이 없으면 pickle로 캐시 (결과는 같고 캐시 파일 형식만 다름)
+PARQUET_AVAILABLE = any(importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet"))
+CACHE_EXT = ".parquet" if PARQUET_AVAILABLE else ".pkl"
+
+
+class Stage:
+    # run(상위 단계 결과 dict) → DataFrame, export(결과, output)는 기존 경로에 CSV/JSON 저장
+    # artifacts: export가 output과 함께 쓰는 생성물 (커밋하지 않으므로 없으면 캐시된 단계도 다시 export)
+    def __init__(self, name, run, inputs=(), deps=(), code=(), output=None, export=None, artifacts=()):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.deps = list(deps)
+        self.code = [module.__file__ for module in code]
+        self.output = output
+        self.export = export
+        self.artifacts = list(artifacts)
+
+
+def shapefile_parts(shp_path):
+    # .shp와 같은 이름의 .dbf / .shx / .prj / .cpg 등
+    return sorted(glob.glob(os.path.splitext(shp_path)[0] + ".*"))
+
+def read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def write_json(path, data, indent=None):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+class FileDigests:
+    # 파일 내용 해시 (mtime / 크기가 그대로면 이전 해시 재사용, 큰 생활인구 CSV를 매번 읽지 않음)
+    def __init__(self, path=FILE_HASHES_PATH):
+        self.path = path
+        self.cache = read_json(path, {})
+
+    def __call__(self, file_path):
+        stat = os.stat(file_path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        cached = self.cache.get(file_path)
+        if cached and cached[:2] == signature:
+            return cached[2]
+        digest = hashlib.sha1()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.cache[file_path] = signature + [digest.hexdigest()]
+        return digest.hexdigest()
+
+    def save(self):
+        write_json(self.path, self.cache)
+
+
+def stage_key(stage, keys, digests):
+    missing = [path for path in stage.inputs if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"[{stage.name}] 입력 파일 없음: {', '.join(missing)}")
+    payload = {
+        "stage": stage.name,
+        "code": [digests(path) for path in stage.code],
+        "inputs": [[path, digests(path)] for path in stage.inputs],
+        "deps": [[dep, keys[dep]] for dep in stage.deps],
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def cache_path(name):
+    return os.path.join(CACHE_DIR, name + CACHE_EXT)
+
+def write_cache(name, df):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if PARQUET_AVAILABLE:
+        df = df.copy()
+        # 한 컬럼에 숫자 / 문자열이 섞인 원본 CSV 컬럼은 문자열로 (CSV로 내보내면 어차피 같은 값)
+        for col in df.columns[df.dtypes == object]:
+            if pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        df.to_parquet(cache_path(name), index=False)
+    else:
+        df.to_pickle(cache_path(name))
+
+def read_cache(name):
+    if PARQUET_AVAILABLE:
+        return pd.read_parquet(cache_path(name))
+    return pd.read_pickle(cache_path(name))
+
+def timed_run(stage, deps):
+    started = time.perf_counter()
+    df = stage.run(deps)
+    return df, time.perf_counter() - started
+
+def run_pipeline(stages, targets=None, force=(), workers=None, dry_run=False):
+    names = list(stages)
+    for i, name in enumerate(names):
+        unknown = [dep for dep in stages[name].deps if dep not in names[:i]]
+        if unknown:
+            raise ValueError(f"[{name}] 앞 단계에 없는 의존 단계: {', '.join(unknown)}")
+
+    # 목표 단계와 그 상위 단계만 대상
+    needed = set()
+    stack = list(targets or names)
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(stages[name].deps)
+
+    # 대상 단계의 키만 계산 (관계없는 단계의 입력 파일이 없어도 실행 가능)
+    digests = FileDigests()
+    keys = {}
+    for name in names:
+        if name in needed:
+            keys[name] = stage_key(stages[name], keys, digests)
+    digests.save()
+
+    # 입력이 바뀌면 키가 바뀌므로 하위 단계도 함께 다시 실행됨
+    manifest = read_json(MANIFEST_PATH, {})
+    stale = {
+        name for name in needed
+        if name in force or manifest.get(name, {}).get("key") != keys[name] or not os.path.exists(cache_path(name))
+    }
+    if dry_run:
+        for name in names:
+            if name in needed:
+                print(f"{name:<28} {'실행' if name in stale else '캐시'}")
+        return {}
+
+    artifacts = {}
+    report = {}
+
+    def load(name):
+        if name not in artifacts:
+            artifacts[name] = read_cache(name)
+        return artifacts[name]
+
+    def export(name):
+        stage = stages[name]
+        if stage.export is not None:
+            stage.export(load(name), stage.output)
+
+    started = time.perf_counter()
+    for name in names:
+        if name in needed and name not in stale:
+            report[name] = {"status": "cached", "rows": manifest[name]["rows"], "seconds": 0.0}
+            outputs = ([stages[name].output] if stages[name].output else []) + stages[name].artifacts
+            if any(not os.path.exists(path) for path in outputs):
+                export(name)
+
+    pending = [name for name in names if name in stale]
+    done = needed - stale
+    failed = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            for name in list(pending):
+                # 상위 단계가 실패 / 건너뜀이면 실행하지 않음 (나머지 단계는 계속 실행)
+                blocked = [dep for dep in stages[name].deps if dep in failed]
+                if blocked:
+                    failed.add(name)
+                    pending.remove(name)
+                    report[name] = {
+                        "status": "skipped", "rows": 0, "seconds": 0.0, "error": f"상위 단계 실패: {', '.join(blocked)}"
+                    }
+                elif all(dep in done for dep in stages[name].deps):
+                    deps = {dep: load(dep) for dep in stages[name].deps}
+                    running[pool.submit(timed_run, stages[name], deps)] = name
+                    pending.remove(name)
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    df, seconds = future.result()
+                    write_cache(name, df)
+                    artifacts[name] = df
+                    manifest[name] = {"key": keys[name], "rows": len(df), "seconds": round(seconds, 3)}
+                    write_json(MANIFEST_PATH, manifest, indent=2)
+                    export(name)
+                except Exception as e:
+                    failed.add(name)
+                    report[name] = {"status": "failed", "rows": 0, "seconds": 0.0, "error": repr(e)}
+                    print(f"❌ {name}: {e!r}")
+                    continue
+                done.add(name)
+                report[name] = {"status": "ran", "rows": len(df), "seconds": seconds}
+                print(f"✅ {name}: {len(df)}행, {seconds:.1f}초")
+
+    print(f"{'단계':<28} {'상태':>7} {'행 수':>10} {'시간':>8}")
+    for name in names:
+        if name in report:
+            row = report[name]
+            print(f"{name:<28} {row['status']:>7} {row['rows']:>10} {row['seconds']:>7.1f}s")
+            if "error" in row:
+                print(f"    {row['error']}")
+    print(f"전체 {time.perf_counter() - started:.1f}초")
+    return report
+
+def export_csv(df, path, encoding="utf-8-sig"):
+    df.to_csv(path, index=False, encoding=encoding)
+
+def export_quiet_youth(df, path):
+    # 지수 JSON / 산출물 + 시간대 프로필 (사용자 시간대 가중치로 조용함 지수 재계산용)
+    records = quiet_youth_records(df)
+    write_json(path, records, indent=2)
+    score_artifacts.write_artifact(pd.DataFrame(records), QUIET_YOUTH_ARTIFACT)
+    score_artifacts.write_arrays(hourly_profile_arrays(df), QUIET_PROFILE_PATH)
+
+def with_dong_stage(name):
+    def run(deps):
+        df = pd.read_csv(PUBLIC_FACILITY_CSV[name])
+        return assign_admin_dong(df, load_admin_boundaries(SHP_PATH), location_col="location")
+    return Stage(
+        f"with_dong.{name}", run,
+        inputs=[PUBLIC_FACILITY_CSV[name]] + shapefile_parts(SHP_PATH),
+        code=[infra_preprocess], output=DENSITY_SOURCES[name], export=export_csv
+    )
+
+def build_stages():
+    stages = [
+        Stage(
+            "emd_info", lambda deps: preprocess_admin_boundaries(SHP_PATH, save_path=None),
+            inputs=shapefile_parts(SHP_PATH), code=[infra_preprocess], output=EMD_INFO_CSV, export=export_csv
+        ),
+        *[with_dong_stage(name) for name in DENSITY_SOURCES],
+        Stage(
+            "density",
+            lambda deps: density_scores(
+                {name: deps[f"with_dong.{name}"]["EMD_CD"] for name in DENSITY_SOURCES},
+                deps["emd_info"], load_dong_names(DONG_INFO_JSON)
+            ),
+            inputs=[DONG_INFO_JSON], deps=["emd_info"] + [f"with_dong.{name}" for name in DENSITY_SOURCES],
+            code=[density_score], output=DENSITY_SCORE_CSV,
+            export=lambda df, path: save_density_scores(df, path)
+        ),
+        Stage(
+            "youth_quiet",
+            lambda deps: quiet_youth_frame(
+                POPULATION_CSV, pd.read_csv(ADMIN_TO_LEGAL_CSV), read_json(DONG_INFO_JSON, []), deps["emd_info"]
+            ),
+            inputs=[POPULATION_CSV, ADMIN_TO_LEGAL_CSV, DONG_INFO_JSON], deps=["emd_info"],
+            code=[youth_quiet_score], output=QUIET_YOUTH_JSON, export=export_quiet_youth
+        ),
+        Stage(
+            "all_scores",
+            lambda deps: merge_all_scores(
+                deps["emd_info"], deps["density"], deps["youth_quiet"], read_json(DONG_INFO_JSON, [])
+            ),
+            inputs=[DONG_INFO_JSON], deps=["emd_info", "density", "youth_quiet"],
+            code=[fetch_score], output=ALL_SCORES_CSV, artifacts=[ALL_SCORES_ARTIFACT],
+            export=lambda df, path: save_all_scores(df, path)
+        ),
+    ]
+    return {stage.name: stage for stage in stages}
+
+# 실행 (프로젝트 루트에서)
+#   python -m data.scoring.pipeline                      → 입력이 바뀐 단계만 다시 실행
+#   python -m data.scoring.pipeline --dry-run            → 실행될 단계만 출력
+#   python -m data.scoring.pipeline --stage density      → 특정 단계(와 상위 단계)까지만
+#   python -m data.scoring.pipeline --force youth_quiet  → 입력이 같아도 다시 실행 (하위 단계는 키가 같으면 캐시)
+if __name__ == "__main__":
+    stages = build_stages()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stage", choices=list(stages), action="append")
+    parser.add_argument("--force", choices=list(stages), action="append", default=[])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    report = run_pipeline(stages, args.stage, set(args.force), args.workers, args.dry_run)
+    # 실패 / 건너뛴 단계가 있으면 0이 아닌 종료 코드
+    raise SystemExit(1 if any(row["status"] in ("failed", "skipped") for row in report.values()) else 0)
@@ -4,6 +4,12 @@ from typing import Dict, List
 from sklearn.preprocessing import MinMaxScaler
 import numpy as np
 
+from app.utils.quiet_profile import HOURS, QUIET_PROFILE_PATH
+from app.utils.score_artifacts import artifact_path, write_arrays, write_artifact
+
+QUIET_YOUTH_ARTIFACT = artifact_path("data/scoring/score/dong_youth_and_quiet_score")
+QUIET_YOUTH_COLUMNS = ["dong_code", "gu", "dong", "quiet", "youth"]
+
 # 시간대 가중치 (중요한 시간대에 더 많은 가중치)
 TIME_WEIGHTS = {
     0: 1.0, 1: 1.0, 2: 1.0, 3: 1.0, 4: 1.0, 5: 1.0,
@@ -13,23 +19,173 @@ TIME_WEIGHTS = {
     22: 1.0, 23: 1.0
 }
 
+MALE_YOUTH_COLS = [
+    "남자0세부터9세생활인구수", "남자10세부터14세생활인구수", "남자15세부터19세생활인구수",
+    "남자20세부터24세생활인구수", "남자25세부터29세생활인구수", "남자30세부터34세생활인구수",
+    "남자35세부터39세생활인구수"
+]
+FEMALE_YOUTH_COLS = [
+    "여자0세부터9세생활인구수", "여자10세부터14세생활인구수", "여자15세부터19세생활인구수",
+    "여자20세부터24세생활인구수", "여자25세부터29세생활인구수", "여자30세부터34세생활인구수",
+    "여자35세부터39세생활인구수"
+]
+TOTAL_POP_COL = "총생활인구수"
+
+# 생활인구 CSV를 나눠 읽는 행 수 (파일 크기와 무관하게 메모리 사용량 일정)
+POPULATION_CHUNK_SIZE = 500_000
+
+# 시간대(0~23) → 가중치 배열, 그 외 값은 0.5
+TIME_WEIGHT_ARRAY = np.array([TIME_WEIGHTS[h] for h in range(24)])
+
+def population_dtypes():
+    dtypes = {"행정동코드": str, "시간대구분": np.float64, TOTAL_POP_COL: np.float64}
+    dtypes.update({col: np.float64 for col in MALE_YOUTH_COLS + FEMALE_YOUTH_COLS})
+    return dtypes
+
+def time_weights(hours):
+    hours = np.asarray(hours, dtype=np.float64)
+    valid = np.isin(hours, np.arange(24))
+    weights = np.full(len(hours), 0.5)
+    weights[valid] = TIME_WEIGHT_ARRAY[hours[valid].astype(int)]
+    return weights
+
+def group_moments(frame: pd.DataFrame, keys: list):
+    # keys별 (가중치 합, 가중 평균, 가중 편차제곱합, 총인구 합, 청년 인구 합)
+    grouped = frame.groupby(keys)
+    stats = grouped[["w", "wx", "x", "youth"]].sum()
+    stats["mean"] = stats["wx"] / stats["w"]
+
+    # 묶음 안의 편차제곱합은 묶음 평균 기준으로 계산 (큰 값끼리 빼는 오차 방지)
+    row_mean = grouped["wx"].transform("sum") / grouped["w"].transform("sum")
+    frame["m2"] = frame["w"] * (frame["x"] - row_mean) ** 2
+    stats["m2"] = frame.groupby(keys)["m2"].sum()
+    return stats[["w", "mean", "m2", "x", "youth"]]
+
+def chunk_population_stats(chunk: pd.DataFrame, mapping_df: pd.DataFrame):
+    # 묶음 하나의 (법정동별 시간 가중 통계, 법정동 × 시간대별 통계)
+    chunk["행정동코드"] = chunk["행정동코드"] + "00"
+    merged = chunk.merge(mapping_df, on="행정동코드", how="inner")
+    if merged.empty:
+        return None, None
+    x = merged[TOTAL_POP_COL].to_numpy()
+    hours = merged["시간대구분"].to_numpy()
+    w = time_weights(hours)
+    frame = pd.DataFrame({
+        "법정동코드": merged["법정동코드"].to_numpy(),
+        "w": w,
+        "wx": w * x,
+        "x": x,
+        "youth": merged[MALE_YOUTH_COLS + FEMALE_YOUTH_COLS].sum(axis=1).to_numpy(),
+    })
+    stats = group_moments(frame, ["법정동코드"])
+
+    # 시간대 프로필은 가중치 없이 (0~23시 외 값은 제외)
+    valid = np.isin(hours, np.arange(HOURS))
+    hourly_frame = frame.loc[valid, ["법정동코드", "x", "youth"]].assign(
+        hour=hours[valid].astype(np.int64), w=1.0, wx=x[valid]
+    )
+    hourly = group_moments(hourly_frame, ["법정동코드", "hour"]) if len(hourly_frame) else None
+    return stats, hourly
+
+def merge_population_stats(acc: pd.DataFrame, part: pd.DataFrame):
+    # 두 집계의 가중 평균 / 편차제곱합 병합 (Chan 병렬 분산 공식)
+    if acc is None:
+        return part
+    acc, part = acc.align(part, join="outer", fill_value=0.0)
+    w = acc["w"] + part["w"]
+    delta = part["mean"] - acc["mean"]
+    safe_w = w.where(w != 0, 1.0)
+    merged = pd.DataFrame({
+        "w": w,
+        "mean": acc["mean"] + delta * part["w"] / safe_w,
+        "m2": acc["m2"] + part["m2"] + delta ** 2 * acc["w"] * part["w"] / safe_w,
+        "x": acc["x"] + part["x"],
+        "youth": acc["youth"] + part["youth"],
+    })
+    return merged
+
+def aggregate_population(population_csv: str, mapping_df: pd.DataFrame, chunksize: int = POPULATION_CHUNK_SIZE):
+    # 생활인구 CSV를 필요한 컬럼만 묶음 단위로 읽어 법정동별 가중 평균 / 표준편차, 총인구, 청년 인구 누적
+    # 반환: (법정동별 통계, 법정동 × 시간대별 (관측 수, 평균, 편차제곱합))
+    dtypes = population_dtypes()
+    acc = hourly_acc = None
+    for chunk in pd.read_csv(population_csv, usecols=list(dtypes), dtype=dtypes, chunksize=chunksize):
+        part, hourly = chunk_population_stats(chunk, mapping_df)
+        if part is not None:
+            acc = merge_population_stats(acc, part)
+        if hourly is not None:
+            hourly_acc = merge_population_stats(hourly_acc, hourly)
+    if hourly_acc is None:
+        hourly_acc = pd.DataFrame(
+            columns=["w", "mean", "m2"], index=pd.MultiIndex.from_tuples([], names=["법정동코드", "hour"])
+        )
+    if acc is None:
+        return pd.DataFrame(columns=["weighted_mean", "weighted_std", "total_population", "youth_population"]), hourly_acc
+    return pd.DataFrame({
+        "weighted_mean": acc["mean"],
+        "weighted_std": np.sqrt(np.maximum(acc["m2"] / acc["w"], 0.0)),
+        "total_population": acc["x"],
+        "youth_population": acc["youth"],
+        "weight_sum": acc["w"],
+    }).sort_index(), hourly_acc
+
+def hourly_columns(hourly: pd.DataFrame, codes: pd.Index):
+    # 법정동 × 시간대 통계 → count_h00 ~ m2_h23 컬럼 (관측이 없는 시간대는 0)
+    columns = {}
+    for stat, name in (("w", "count"), ("mean", "mean"), ("m2", "m2")):
+        table = hourly[stat].unstack("hour").reindex(index=codes, columns=range(HOURS)).fillna(0.0)
+        for hour in range(HOURS):
+            columns[f"{name}_h{hour:02d}"] = table[hour].to_numpy(dtype=np.float64)
+    return columns
+
+def hourly_profile_arrays(frame: pd.DataFrame):
+    # quiet_youth_frame 결과 → app/utils/quiet_profile.py가 읽는 float32 행렬 묶음
+    arrays = {"EMD_CD": frame["dong_code"].astype(str).to_numpy(dtype=str)}
+    for name in ("count", "mean", "m2"):
+        arrays[name] = frame[[f"{name}_h{hour:02d}" for hour in range(HOURS)]].to_numpy(dtype=np.float32)
+    arrays["area_m2"] = frame["area_m2"].to_numpy(dtype=np.float64)
+    arrays["hour_weights"] = TIME_WEIGHT_ARRAY
+    return arrays
+
+def quiet_youth_records(frame: pd.DataFrame) -> List[Dict[str, object]]:
+    return frame[QUIET_YOUTH_COLUMNS].to_dict("records")
+
 def calculate_quiet_youth_score(
     population_csv: str,
     admin_to_legal_csv: str,
     legal_dong_json: str,
-    emd_info_csv: str
+    emd_info_csv: str,
+    chunksize: int = POPULATION_CHUNK_SIZE
 ) -> List[Dict[str, object]]:
-    pop_df = pd.read_csv(population_csv)
     mapping_df = pd.read_csv(admin_to_legal_csv)
     legal_dong_info = json.load(open(legal_dong_json, encoding="utf-8"))
     emd_info_df = pd.read_csv(emd_info_csv, dtype={"EMD_CD": str})
+    return quiet_youth_scores(population_csv, mapping_df, legal_dong_info, emd_info_df, chunksize)
+
+def quiet_youth_scores(
+    population_csv: str,
+    mapping_df: pd.DataFrame,
+    legal_dong_info: list,
+    emd_info_df: pd.DataFrame,
+    chunksize: int = POPULATION_CHUNK_SIZE
+) -> List[Dict[str, object]]:
+    return quiet_youth_records(quiet_youth_frame(population_csv, mapping_df, legal_dong_info, emd_info_df, chunksize))
+
+def quiet_youth_frame(
+    population_csv: str,
+    mapping_df: pd.DataFrame,
+    legal_dong_info: list,
+    emd_info_df: pd.DataFrame,
+    chunksize: int = POPULATION_CHUNK_SIZE
+) -> pd.DataFrame:
+    # 이미 읽어 둔 매핑 / 동 목록 / 면적 표로 계산 (scoring 파이프라인에서 사용)
+    # 결과: dong_code, gu, dong, quiet, youth + 시간대 프로필 컬럼 (area_m2, count_hXX, mean_hXX, m2_hXX)
     emd_info_map = emd_info_df.set_index("EMD_CD")[["area_m2"]].to_dict()["area_m2"]
 
-    pop_df["행정동코드"] = pop_df["행정동코드"].astype(str) + "00"
+    mapping_df = mapping_df.copy()
     mapping_df["행정동코드"] = mapping_df["행정동코드"].astype(str)
-    merged_df = pd.merge(pop_df, mapping_df[["행정동코드", "법정동코드"]], on="행정동코드", how="inner")
-    merged_df["법정동코드"] = merged_df["법정동코드"].astype(str)
-    merged_df["시간가중치"] = merged_df["시간대구분"].map(TIME_WEIGHTS)
+    mapping_df["법정동코드"] = mapping_df["법정동코드"].astype(str)
+    mapping_df = mapping_df[["행정동코드", "법정동코드"]]
 
     code_to_name = {}
     for gu_entry in legal_dong_info:
@@ -40,64 +196,29 @@ def calculate_quiet_youth_score(
                 "dong": dong["dong"]
             }
 
-    male_youth_cols = [
-        "남자0세부터9세생활인구수", "남자10세부터14세생활인구수", "남자15세부터19세생활인구수",
-        "남자20세부터24세생활인구수", "남자25세부터29세생활인구수", "남자30세부터34세생활인구수",
-        "남자35세부터39세생활인구수"
-    ]
-    female_youth_cols = [
-        "여자0세부터9세생활인구수", "여자10세부터14세생활인구수", "여자15세부터19세생활인구수",
-        "여자20세부터24세생활인구수", "여자25세부터29세생활인구수", "여자30세부터34세생활인구수",
-        "여자35세부터39세생활인구수"
-    ]
-    total_pop_col = "총생활인구수"
-
-    quiet_data = []
-    grouped = merged_df.groupby("법정동코드")
-
-    for dong_code, group in grouped:
-        if dong_code not in code_to_name or dong_code not in emd_info_map:
-            continue
-
-        weights = group["시간가중치"].fillna(0.5)
-        if weights.sum() == 0:
-            continue
+    stats, hourly = aggregate_population(population_csv, mapping_df, chunksize)
 
-        try:
-            weighted_mean = np.average(group[total_pop_col], weights=weights)
-            weighted_var = np.average((group[total_pop_col] - weighted_mean) ** 2, weights=weights)
-            weighted_std = np.sqrt(weighted_var)
-        except:
-            continue
-
-        total_population = group[total_pop_col].sum()
-        youth_population = group[male_youth_cols + female_youth_cols].sum().sum()
-        if total_population == 0:
-            continue
-
-        area_m2 = emd_info_map[dong_code]
-
-        area_km2 = area_m2 / 1_000_000
+    # 이름 / 면적 정보가 있고 가중치, 총인구가 0이 아닌 동만
+    stats = stats[
+        stats.index.isin(list(code_to_name)) & stats.index.isin(list(emd_info_map)) &
+        (stats["weight_sum"] != 0) & (stats["total_population"] != 0)
+    ]
+    area_m2 = stats.index.map(emd_info_map).to_numpy(dtype=np.float64)
+    area_km2 = area_m2 / 1_000_000
 
+    quiet_data = pd.DataFrame({
+        "dong_code": stats.index,
         # 조용함 지표
-        pop_density_mean = weighted_mean / area_m2
-        pop_density_std  = weighted_std  / area_m2
-        
+        "std_density": stats["weighted_std"].to_numpy() / area_m2,
+        "mean_density": stats["weighted_mean"].to_numpy() / area_m2,
+        "weighted_std": stats["weighted_std"].to_numpy(),
+        "weighted_mean": stats["weighted_mean"].to_numpy(),
         # 청년용 지표
-        youth_density = youth_population / area_km2
-        youth_ratio = youth_population / total_population
-
-        quiet_data.append({
-            "dong_code": dong_code,
-            "std_density": pop_density_std,
-            "mean_density": pop_density_mean,
-            "weighted_std": weighted_std,
-            "weighted_mean": weighted_mean,
-            "youth_density": youth_density,
-            "youth_ratio": youth_ratio
-        })
-
-    quiet_df = pd.DataFrame(quiet_data)
+        "youth_density": stats["youth_population"].to_numpy() / area_km2,
+        "youth_ratio": (stats["youth_population"] / stats["total_population"]).to_numpy(),
+    })
+
+    quiet_df = quiet_data.reset_index(drop=True)
     scaler = MinMaxScaler()
 
     # [조용함 지수 보정] 밀도와 원시값 혼합
@@ -125,32 +246,30 @@ def calculate_quiet_youth_score(
         0.4 * quiet_df["norm_youth_density"]
     ).round(4)
 
-    # 최종 결과
-    result = []
-    for _, row in quiet_df.iterrows():
-        dong_code = row["dong_code"]
-        if dong_code not in code_to_name:
-            continue
-        name_info = code_to_name[dong_code]
-        result.append({
-            "dong_code": dong_code,
-            "gu": name_info["gu"],
-            "dong": name_info["dong"],
-            "quiet": row["quiet"],
-            "youth": row["youth"]
-        })
-
+    # 최종 결과 (dong_code 순, 이름 정보가 있는 동만)
+    quiet_df = quiet_df[quiet_df["dong_code"].isin(list(code_to_name))]
+    result = pd.DataFrame({
+        "dong_code": quiet_df["dong_code"].to_numpy(),
+        "gu": [code_to_name[code]["gu"] for code in quiet_df["dong_code"]],
+        "dong": [code_to_name[code]["dong"] for code in quiet_df["dong_code"]],
+        "quiet": quiet_df["quiet"].to_numpy(),
+        "youth": quiet_df["youth"].to_numpy(),
+        "area_m2": area_m2[quiet_df.index.to_numpy()],
+        **hourly_columns(hourly, pd.Index(quiet_df["dong_code"])),
+    })
     return result
 
+# 실행 (프로젝트 루트에서): python -m data.scoring.youth_quiet_score
 if __name__ == "__main__":
-    res = calculate_quiet_youth_score(
-        "data/public_data/생활인구.csv",
-        "data/public_data/행정동법정동매핑.csv",
-        "data/seoul_dong_list_with_code.json",
-        "data/scoring/infra_data/emd_info.csv"
-    )
-    # JSON 저장
+    mapping_df = pd.read_csv("data/public_data/행정동법정동매핑.csv")
+    legal_dong_info = json.load(open("data/seoul_dong_list_with_code.json", encoding="utf-8"))
+    emd_info_df = pd.read_csv("data/scoring/infra_data/emd_info.csv", dtype={"EMD_CD": str})
+    frame = quiet_youth_frame("data/public_data/생활인구.csv", mapping_df, legal_dong_info, emd_info_df)
+
+    # JSON 저장 (확인용) + 바이너리 컬럼 산출물 + 시간대 프로필
     with open("data/scoring/score/dong_youth_and_quiet_score.json", "w", encoding="utf-8") as f:
-        json.dump(res, f, ensure_ascii=False, indent=2)
+        json.dump(quiet_youth_records(frame), f, ensure_ascii=False, indent=2)
+    write_artifact(frame[QUIET_YOUTH_COLUMNS], QUIET_YOUTH_ARTIFACT)
+    write_arrays(hourly_profile_arrays(frame), QUIET_PROFILE_PATH)
 
-    print("저장 완료: data/scoring/score/dong_youth_and_quiet_score.json")
\ No newline at end of file
+    print(f"저장 완료: data/scoring/score/dong_youth_and_quiet_score.json, {QUIET_YOUTH_ARTIFACT}, {QUIET_PROFILE_PATH}")
@@ -0,0 +1,188 @@
+import random
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.user_input import Budget
+from app.services import property_store
+from app.services.property_store import PropertyStore, build_store_arrays, CATEGORY_COLUMNS
+from app.utils.listing_attributes import room_count
+
+# 메모리 매물 스토어(컬럼 배열 + 비트맵 인덱스)의 필터 결과가 build_property_filters의 SQL 조건과 같은지 확인
+# DB 없이 행 목록으로 스토어를 만들고, 같은 조건을 파이썬으로 옮긴 sql_match와 비교
+
+DONGS = ["1111051500", "1111053000", "1168064000", "1168065000"]
+
+# 방 개수 분류 경계값 (10개 이상은 '쓰리룸 이상'에 포함되지 않음)
+ROOMS_BATHROOMS = [None, "1/1개", "1/-개", "2/1개", "3/2개", "9/3개", "10/2개", "12/4개", "-/1개", "", "방1/1개"]
+DIRECTIONS = [None, "", "남향", "남동향", "북서향", "동향", "서향"]
+
+RANGE_CHOICES = {
+    "deposit": [0, 5000000, 10000000, 50000000, 100000000],
+    "monthly_rent": [0, 300000, 500000, 800000],
+    "maintenance_cost": [0, 50000, 100000],
+    "area": [10, 20, 33, 50],
+}
+LIST_CHOICES = {
+    "transaction_type": ["전세", "월세"],
+    "property_type": ["원룸", "빌라", "오피스텔"],
+    "room_type": ["원룸", "투룸", "쓰리룸"],
+    "floor_type": ["지상", "반지하", "옥탑"],
+    "direction": ["남", "북", "동", "서"],
+}
+
+def random_row(rng, pid):
+    def maybe(value):
+        return None if rng.random() < 0.1 else value
+    return SimpleNamespace(
+        id=pid,
+        administrative_code=rng.choice(DONGS + [None]),
+        transaction_type=maybe(rng.choice(LIST_CHOICES["transaction_type"])),
+        property_type=maybe(rng.choice(LIST_CHOICES["property_type"])),
+        room_type=maybe(rng.choice(LIST_CHOICES["floor_type"])),
+        deposit=maybe(rng.choice([0, 3000000, 5000000, 20000000, 50000000, 100000000, 200000000])),
+        monthly_rent_cost=maybe(rng.choice([0, 300000, 450000, 500000, 900000])),
+        maintenance_cost=maybe(rng.choice([0, 50000, 70000, 100000, 150000])),
+        area=maybe(rng.choice([9.5, 10.0, 19.8, 20.0, 33.0, 49.9, 84.0])),
+        direction=rng.choice(DIRECTIONS),
+        rooms_bathrooms=rng.choice(ROOMS_BATHROOMS),
+        updated_at=None,
+    )
+
+def random_budget(rng):
+    fields = {}
+    for field, choices in RANGE_CHOICES.items():
+        fields[field] = sorted(rng.sample(choices, rng.choice([0, 0, 1, 2])))
+    for field, choices in LIST_CHOICES.items():
+        fields[field] = rng.sample(choices, rng.choice([0, 0, 1, 2]))
+    return Budget(**fields)
+
+def in_range(value, bounds):
+    # SQL의 BETWEEN / <= (NULL은 항상 제외), 길이가 0이나 3 이상이면 조건 없음
+    if len(bounds) not in (1, 2):
+        return True
+    if value is None:
+        return False
+    if len(bounds) == 2:
+        return bounds[0] <= value <= bounds[1]
+    return value <= bounds[0]
+
+def room_match(rooms_bathrooms, room_types, normalized):
+    # build_property_filters의 방 유형 조건 (정규화 컬럼 / 정규식 두 경로)
+    for rt in room_types:
+        if rt == "원룸":
+            matched = room_count(rooms_bathrooms) == 1 if normalized else bool(re.match(r"1/", rooms_bathrooms or "-"))
+        elif rt == "투룸":
+            matched = room_count(rooms_bathrooms) == 2 if normalized else bool(re.match(r"2/", rooms_bathrooms or "-"))
+        elif normalized:
+            count = room_count(rooms_bathrooms)
+            matched = rooms_bathrooms is None or (count is not None and 3 <= count <= 9)
+        else:
+            matched = rooms_bathrooms is None or bool(re.match(r"[3-9]/", rooms_bathrooms))
+        if matched:
+            return True
+    return False
+
+def sql_match(row, budget: Budget, normalized):
+    if budget.transaction_type and row.transaction_type not in budget.transaction_type:
+        return False
+    if budget.property_type and row.property_type not in budget.property_type:
+        return False
+    if budget.deposit and not in_range(row.deposit, budget.deposit):
+        return False
+    if budget.monthly_rent and not in_range(row.monthly_rent_cost, budget.monthly_rent):
+        return False
+    if budget.maintenance_cost and not in_range(row.maintenance_cost, budget.maintenance_cost):
+        return False
+    if budget.area and not in_range(row.area, budget.area):
+        return False
+    if budget.direction and not any(d in (row.direction or "") for d in budget.direction):
+        return False
+    if budget.room_type and not room_match(row.rooms_bathrooms, budget.room_type, normalized):
+        return False
+    if budget.floor_type and row.room_type not in budget.floor_type:
+        return False
+    return True
+
+def expected_counts(rows, budget, dong_codes, normalized, id_limit=None):
+    count_map, ids_by_dong = {}, {}
+    for row in rows:
+        if row.administrative_code in dong_codes and sql_match(row, budget, normalized):
+            count_map[row.administrative_code] = count_map.get(row.administrative_code, 0) + 1
+            ids_by_dong.setdefault(row.administrative_code, []).append(row.id)
+    for code, ids in ids_by_dong.items():
+        ids.sort(reverse=True)
+        ids_by_dong[code] = ids[:id_limit] if id_limit else ids
+    return count_map, ids_by_dong
+
+def make_store(rows):
+    categories = {col: [] for col in CATEGORY_COLUMNS}
+    return PropertyStore(build_store_arrays(rows, categories), categories, version=None, watermark=None)
+
+@pytest.fixture(params=[False, True], ids=["regex", "normalized"])
+def normalized(request, monkeypatch):
+    monkeypatch.setattr(property_store, "USE_NORMALIZED_ATTRIBUTES", request.param)
+    return request.param
+
+@pytest.fixture
+def rows():
+    rng = random.Random(0)
+    return [random_row(rng, pid) for pid in range(1, 601)]
+
+def test_room_class_buckets(normalized):
+    assert property_store.room_class(None) == property_store.ROOM_NULL
+    assert property_store.room_class("1/-개") == property_store.ROOM_ONE
+    assert property_store.room_class("2/1개") == property_store.ROOM_TWO
+    assert property_store.room_class("3/2개") == property_store.ROOM_THREE_UP
+    assert property_store.room_class("9/3개") == property_store.ROOM_THREE_UP
+    # 10개 이상은 SQL의 '^[3-9]/' / room_count BETWEEN 3 AND 9 모두 제외
+    assert property_store.room_class("10/2개") == property_store.ROOM_OTHER
+    assert property_store.room_class("-/1개") == property_store.ROOM_OTHER
+
+def test_three_room_bucket_excludes_ten_or_more(normalized):
+    rows = [
+        SimpleNamespace(
+            id=pid, administrative_code=DONGS[0], transaction_type="월세", property_type="빌라", room_type="지상",
+            deposit=0, monthly_rent_cost=0, maintenance_cost=0, area=20.0, direction="남향",
+            rooms_bathrooms=rooms_bathrooms, updated_at=None,
+        )
+        for pid, rooms_bathrooms in enumerate(["3/1개", "9/2개", "10/2개", "12/3개", None, "2/1개"], start=1)
+    ]
+    budget = Budget(direction=[], room_type=["쓰리룸"])
+    count_map, ids = make_store(rows).dong_property_counts(budget, [DONGS[0]])
+    assert count_map == {DONGS[0]: 3}
+    assert ids == {DONGS[0]: [5, 2, 1]}
+
+def test_budget_filters_match_sql(rows, normalized):
+    store = make_store(rows)
+    rng = random.Random(1)
+    for _ in range(300):
+        budget = random_budget(rng)
+        dong_codes = rng.sample(DONGS, rng.randint(1, len(DONGS)))
+        assert store.dong_property_counts(budget, dong_codes) == expected_counts(rows, budget, dong_codes, normalized)
+
+def test_id_limit_keeps_newest_ids(rows, normalized):
+    store = make_store(rows)
+    budget = Budget(direction=["남"], room_type=["투룸", "쓰리룸"])
+    expected = expected_counts(rows, budget, DONGS, normalized, id_limit=5)
+    assert store.dong_property_counts(budget, DONGS, id_limit=5) == expected
+
+def test_upsert_and_delete_match_rebuilt_store(rows, normalized):
+    rng = random.Random(2)
+    store = make_store(rows[:400])
+
+    # 기존 행 수정 + 새 행 추가 (refresh_property_store의 증분 갱신) 후 일부 삭제
+    changed = [random_row(rng, row.id) for row in rng.sample(rows[:400], 50)] + rows[400:]
+    categories = {col: list(values) for col, values in store.categories.items()}
+    store.upsert(build_store_arrays(changed, categories), categories)
+    deleted = {row.id for row in rng.sample(rows, 40)}
+    store.delete(deleted)
+
+    current = {row.id: row for row in rows[:400]}
+    current.update({row.id: row for row in changed})
+    live_rows = [row for pid, row in sorted(current.items()) if pid not in deleted]
+    assert len(store) == len(live_rows)
+    for _ in range(100):
+        budget = random_budget(rng)
+        assert store.dong_property_counts(budget, DONGS) == expected_counts(live_rows, budget, DONGS, normalized)